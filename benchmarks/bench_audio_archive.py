@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Compare archive formats for saved recordings.
+
+Synthetic speech-like audio is streamed to WAV, FLAC and Opus in recorder
+sized blocks. For every format the file size, compression ratio versus
+16-bit PCM, encode CPU time and streaming decode time are reported. Pass
+--input to use a real 16 kHz recording instead.
+
+Usage:
+    python benchmarks/bench_audio_archive.py [--seconds 60] [--input recording.wav]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.audio_archive import ArchiveWriter, ArchiveReader
+
+SAMPLE_RATE = 16000
+BLOCK_SIZE = 512
+
+def synthetic_speech(seconds):
+    """Harmonic bursts with pauses and low-level noise"""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = 140 + 30 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+    gate = (np.sin(2 * np.pi * 0.8 * t) > -0.2).astype(np.float32)
+    audio = 0.2 * voiced * gate + 0.005 * rng.standard_normal(len(t))
+    return audio.astype(np.float32)
+
+def bench_wav(audio, directory):
+    """Baseline: the recorder's uncompressed int16 WAV output"""
+    from scipy.io import wavfile
+    path = os.path.join(directory, "recording.wav")
+    started = time.process_time()
+    wavfile.write(path, SAMPLE_RATE, (audio * 32767).astype(np.int16))
+    encode = time.process_time() - started
+    return os.path.getsize(path), encode
+
+def bench_format(audio, directory, format):
+    """Stream audio into an archive file and read it back block by block"""
+    path = os.path.join(directory, f"recording.{format}")
+    writer = ArchiveWriter(path, SAMPLE_RATE, 1, format)
+    for start in range(0, len(audio), BLOCK_SIZE):
+        writer.write(audio[start:start + BLOCK_SIZE])
+    stats = writer.close()
+
+    started = time.perf_counter()
+    frames = sum(len(block) for block in ArchiveReader(path))
+    decode = time.perf_counter() - started
+    return stats, frames, decode
+
+def run(audio):
+    seconds = len(audio) / SAMPLE_RATE
+    minutes = seconds / 60
+    with tempfile.TemporaryDirectory() as directory:
+        wav_bytes, wav_encode = bench_wav(audio, directory)
+        print(f"Audio length: {seconds:.1f} s\n")
+        print(f"{'format':<8}{'MB/min':>10}{'ratio':>10}{'encode ms/s':>14}{'decode ms/s':>14}")
+        print(f"{'wav':<8}{wav_bytes / 1e6 / minutes:>10.3f}{1.0:>10.2f}"
+              f"{wav_encode / seconds * 1000:>14.3f}{'-':>14}")
+        for format in ("flac", "opus"):
+            stats, frames, decode = bench_format(audio, directory, format)
+            print(f"{format:<8}{stats['compressed_bytes'] / 1e6 / minutes:>10.3f}"
+                  f"{stats['compression_ratio']:>10.2f}"
+                  f"{stats['encode_cpu_per_second'] * 1000:>14.3f}"
+                  f"{decode / seconds * 1000:>14.3f}")
+            if abs(frames - len(audio)) > SAMPLE_RATE // 10:
+                print(f"  warning: decoded {frames} frames, expected {len(audio)}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60.0, help="Synthetic audio length")
+    parser.add_argument("--input", help="16 kHz mono WAV file to use instead")
+    args = parser.parse_args()
+
+    if args.input:
+        from scipy.io import wavfile
+        rate, data = wavfile.read(args.input)
+        if rate != SAMPLE_RATE:
+            sys.exit(f"Expected {SAMPLE_RATE} Hz audio, got {rate} Hz")
+        if data.dtype == np.int16:
+            data = data.astype(np.float32) / 32768
+        run(data.reshape(len(data), -1)[:, 0])
+    else:
+        run(synthetic_speech(args.seconds))
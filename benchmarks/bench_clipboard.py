@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Clipboard copies: synchronous writes against the background writer queue.
+
+A synchronous copy blocks the caller (the UI thread) for the whole
+clipboard tool invocation. A queued copy only blocks for submit(); the
+write itself happens on the writer thread. The report shows how long the
+caller is blocked per copy, the end-to-end latency of a queued copy, and
+what happens in a burst of copies, where the queue coalesces writes that
+were superseded before they started.
+
+Without --real the clipboard tool is simulated by piping the text through
+`cat` (plus --delay seconds of start-up time, roughly what wl-copy and
+xclip take), so the benchmark runs without a display.
+
+Usage:
+    python benchmarks/bench_clipboard.py [--copies 20] [--burst 10] [--delay 0.02] [--real]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import threading
+import subprocess
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.clipboard_manager import ClipboardManager
+from src.clipboard_history import ClipboardHistory, BackgroundWriter
+
+def simulated_copy(delay):
+    """Copy function that pipes the text through a subprocess"""
+    def copy(text):
+        subprocess.run(["sh", "-c", f"sleep {delay}; cat > /dev/null"], input=text.encode("utf-8"), check=True)
+        return True
+    return copy
+
+def percentiles(values):
+    values = np.array(values) * 1000
+    return np.median(values), np.percentile(values, 95)
+
+def run(args):
+    copy = ClipboardManager.copy_to_clipboard if args.real else simulated_copy(args.delay)
+    text = "Ez egy átlagos hosszúságú diktált bekezdés a vágólapra. " * 20
+    history = ClipboardHistory(os.path.join(tempfile.mkdtemp(prefix="s2c-history-"), "history.json"))
+    for number in range(history.capacity):
+        history.add(f"{number}. {text}")
+
+    # Synchronous: the caller waits for the tool and the history file
+    sync = []
+    for number in range(args.copies):
+        started = time.perf_counter()
+        copy(f"{number} {text}")
+        history.add(f"{number} {text}")
+        history.save()
+        sync.append(time.perf_counter() - started)
+
+    # Queued: the caller only submits; latency is measured until the write ran
+    writer = BackgroundWriter()
+    blocked, latency = [], []
+    for number in range(args.copies):
+        done = threading.Event()
+        started = time.perf_counter()
+        def job(number=number, started=started, done=done):
+            copy(f"{number} {text}")
+            latency.append(time.perf_counter() - started)
+            done.set()
+        writer.submit("clipboard", job)
+        if history.add(f"{number} {text}"):
+            writer.submit("history", history.save)
+        blocked.append(time.perf_counter() - started)
+        done.wait()
+    writer.flush()
+
+    print(f"{'mode':<10}{'blocked median ms':>19}{'p95 ms':>9}{'latency median ms':>19}{'p95 ms':>9}")
+    median, p95 = percentiles(sync)
+    print(f"{'sync':<10}{median:>19.3f}{p95:>9.3f}{median:>19.3f}{p95:>9.3f}")
+    median, p95 = percentiles(blocked)
+    latency_median, latency_p95 = percentiles(latency)
+    print(f"{'queued':<10}{median:>19.3f}{p95:>9.3f}{latency_median:>19.3f}{latency_p95:>9.3f}")
+
+    # Burst: copies arriving faster than the tool can write them
+    writes = []
+    started = time.perf_counter()
+    for number in range(args.burst):
+        writer.submit("clipboard", lambda number=number: writes.append(copy(f"{number} {text}")))
+    submitted = time.perf_counter() - started
+    writer.flush()
+    finished = time.perf_counter() - started
+    writer.close()
+
+    started = time.perf_counter()
+    for number in range(args.burst):
+        copy(f"{number} {text}")
+    sync_burst = time.perf_counter() - started
+
+    print(f"\nBurst of {args.burst} copies:")
+    print(f"{'mode':<10}{'blocked ms':>12}{'done ms':>10}{'writes':>8}")
+    print(f"{'sync':<10}{sync_burst * 1000:>12.1f}{sync_burst * 1000:>10.1f}{args.burst:>8}")
+    print(f"{'queued':<10}{submitted * 1000:>12.3f}{finished * 1000:>10.1f}{len(writes):>8}")
+    print(f"\nClipboard: {'ClipboardManager' if args.real else f'simulated, {args.delay * 1000:.0f} ms start-up'}"
+          f", history of {history.capacity} entries")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--copies", type=int, default=20, help="Copies timed per mode")
+    parser.add_argument("--burst", type=int, default=10, help="Copies in the burst test")
+    parser.add_argument("--delay", type=float, default=0.02, help="Simulated clipboard tool start-up in seconds")
+    parser.add_argument("--real", action="store_true", help="Use ClipboardManager (needs wl-copy, xclip or xsel)")
+    run(parser.parse_args())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Per-bucket speedup of compiled inference over eager PyTorch.
+
+For every length bucket, inputs with lengths spread evenly between the
+previous bucket and this one are run through the eager model and through
+the CompiledEngine. The report shows compile time, mean latency of both
+paths, the speedup and the padding waste (share of computed samples that
+were padding).
+
+With --manifest, the eager and compiled recognizers also transcribe a test
+set (see src/evaluation.py), so a speedup can be checked against any change
+in word error rate.
+
+Usage:
+    python benchmarks/bench_compiled_inference.py [--model ID] [--backend trace|compile]
+                                                  [--buckets 2,4,8,16,32] [--samples 4] [--cache-dir DIR]
+                                                  [--manifest test.jsonl] [--report-dir DIR]
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.speech_recognition import SpeechRecognizer
+from src.compiled_inference import CompiledEngine, DEFAULT_BUCKETS
+
+SAMPLE_RATE = 16000
+
+def run(args):
+    import torch
+
+    options = {"model_name": args.model} if args.model else {}
+    recognizer = SpeechRecognizer(**options)
+    buckets = [float(value) for value in args.buckets.split(",")] if args.buckets else DEFAULT_BUCKETS
+    engine = CompiledEngine(
+        recognizer.model, recognizer.model_name, device=recognizer.device,
+        sampling_rate=SAMPLE_RATE, backend=args.backend, buckets=buckets,
+        cache_dir=args.cache_dir
+    )
+
+    rng = np.random.default_rng(0)
+    print(f"Backend: {args.backend}, device: {recognizer.device}\n")
+    print(f"{'bucket':>8}{'compile s':>11}{'eager ms':>11}{'compiled ms':>13}{'speedup':>9}{'padding':>9}")
+
+    previous = 0
+    for bucket in engine.buckets:
+        started = time.perf_counter()
+        engine.warmup([bucket])
+        compile_seconds = time.perf_counter() - started
+
+        # Shortest input: just over the previous bucket (at least 0.25 s)
+        lengths = np.linspace(max(previous, SAMPLE_RATE // 4) + 1, bucket, args.samples).astype(int)
+        eager_times, compiled_times = [], []
+        for length in lengths:
+            audio = (0.1 * rng.standard_normal(length)).astype(np.float32)
+            input_values = recognizer.processor(
+                audio, sampling_rate=SAMPLE_RATE, return_tensors="pt"
+            ).input_values.to(recognizer.device)
+
+            with torch.no_grad():
+                recognizer.model(input_values)  # warm caches for this shape
+                started = time.perf_counter()
+                recognizer.model(input_values)
+                eager_times.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            logits = engine.logits(input_values)
+            compiled_times.append(time.perf_counter() - started)
+            if logits is None:
+                print(f"{bucket / SAMPLE_RATE:>7g}s  compilation unavailable, eager fallback")
+                break
+        else:
+            eager_ms = np.mean(eager_times) * 1000
+            compiled_ms = np.mean(compiled_times) * 1000
+            padding = np.mean((bucket - lengths) / bucket)
+            print(f"{bucket / SAMPLE_RATE:>7g}s{compile_seconds:>11.2f}{eager_ms:>11.1f}"
+                  f"{compiled_ms:>13.1f}{eager_ms / compiled_ms:>8.2f}x{padding * 100:>8.1f}%")
+        previous = bucket
+
+    if args.manifest:
+        measure_accuracy(args, options)
+
+def measure_accuracy(args, options):
+    """Word error rate and speed of eager and compiled inference on a test set"""
+    from src.evaluation import load_manifest, evaluate, format_comparison, write_report
+
+    entries = load_manifest(args.manifest)
+    reports = []
+    for backend in (None, args.backend):
+        recognizer = SpeechRecognizer(
+            compile_backend=backend, compile_cache_dir=args.cache_dir, compile_warmup=backend is not None, **options
+        )
+        report = evaluate(entries, recognizer.transcribe, jobs=1)
+        report["config"] = {"model": recognizer.model_name, "executor": "thread", "compile_backend": backend}
+        name = backend or "eager"
+        reports.append((name, report))
+        if args.report_dir:
+            write_report(report, os.path.join(args.report_dir, f"compiled-{name}.json"))
+    print()
+    print(format_comparison(reports))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", help="Model ID or local path (default: the app's model)")
+    parser.add_argument("--backend", choices=("trace", "compile"), default="trace")
+    parser.add_argument("--buckets", help="Comma-separated bucket lengths in seconds")
+    parser.add_argument("--samples", type=int, default=4, help="Input lengths measured per bucket")
+    parser.add_argument("--cache-dir", help="torch.compile kernel cache (default: torch's own)")
+    parser.add_argument("--manifest", help="Test set for comparing word error rates")
+    parser.add_argument("--report-dir", help="Save the evaluation reports (see speech2clipboard-eval --compare)")
+    run(parser.parse_args())
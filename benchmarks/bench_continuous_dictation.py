@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Continuous dictation: idle CPU while listening and end-of-speech latency.
+
+Idle CPU is measured by streaming background noise through the listening
+pipeline (level meter, endpoint detector and, with --wake-word, the
+keyword spotter) in recorder-sized blocks; the target is well under 5%
+of one core. Latency is measured on a fixture with known speech
+boundaries: the endpoint delay is the audio time between the true end of
+an utterance and its detection, the transcription time is the wall-clock
+time of the recognizer plus the text post-processing. Without --model
+only the endpoint delay is reported.
+
+The fixture is synthetic voiced speech with pauses in room noise, so the
+benchmark runs without recordings; --audio streams a 16 kHz recording
+instead (for CPU and detected utterances only, it has no ground truth).
+
+Usage:
+    python benchmarks/bench_continuous_dictation.py [--idle-seconds 300] [--utterances 10] [--model path] [--wake-word] [--audio file.wav]
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.level_meter import LevelMeter
+from src.continuous_dictation import ContinuousDictation, EndpointDetector, KeywordSpotter
+
+SAMPLE_RATE = 16000
+BLOCK = 1024
+
+KEYWORD = [(180, 700, 0.2), (220, 1200, 0.15), (160, 500, 0.25)]
+
+def syllable(pitch, formant, seconds):
+    """Voiced, vowel-like burst"""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    phase = 2 * np.pi * np.cumsum(pitch * (1 + 0.05 * np.sin(2 * np.pi * 3 * t))) / SAMPLE_RATE
+    signal = sum(np.sin(k * phase) * np.exp(-((k * pitch - formant) / 400) ** 2) for k in range(1, 30))
+    envelope = np.sin(np.pi * np.arange(len(t)) / len(t)) ** 0.5
+    return 0.2 * signal * envelope / np.abs(signal).max()
+
+def sentence(rng):
+    """1-5 seconds of syllables with short gaps between words"""
+    parts = []
+    for _ in range(rng.integers(2, 8)):
+        for _ in range(rng.integers(1, 4)):
+            parts.append(syllable(rng.uniform(120, 260), rng.uniform(400, 2500), rng.uniform(0.1, 0.3)))
+        parts.append(np.zeros(int(rng.uniform(0.05, 0.2) * SAMPLE_RATE)))
+    return np.concatenate(parts)
+
+def fixture(utterances, rng, noise=0.005):
+    """Sentences separated by 1-4 s pauses; returns the audio and the speech end samples"""
+    parts, ends, position = [], [], 0
+    for _ in range(utterances):
+        pause = np.zeros(int(rng.uniform(1.0, 4.0) * SAMPLE_RATE))
+        speech = sentence(rng)
+        # The sentence ends after its last word, not after the trailing gap
+        voiced = np.nonzero(np.abs(speech) > 1e-4)[0][-1] + 1
+        parts.extend([pause, speech])
+        position += len(pause)
+        ends.append(position + voiced)
+        position += len(speech)
+    parts.append(np.zeros(3 * SAMPLE_RATE))
+    audio = np.concatenate(parts)
+    return (audio + noise * rng.standard_normal(len(audio))).astype(np.float32), ends
+
+def listening_cpu(audio, spotter=None):
+    """Percent of one core used to listen to the audio, and the utterances found"""
+    found = []
+    meter = LevelMeter(sample_rate=SAMPLE_RATE)
+    dictation = ContinuousDictation(found.append, EndpointDetector(), spotter=spotter)
+    blocks = [audio[start:start + BLOCK].reshape(-1, 1) for start in range(0, len(audio), BLOCK)]
+    started = time.process_time()
+    for block in blocks:
+        meter.push(block)
+        dictation.push_block(block)
+    dictation.flush()
+    cpu = time.process_time() - started
+    return cpu / (len(audio) / SAMPLE_RATE) * 100, found, dictation.rejected
+
+def run(args):
+    rng = np.random.default_rng(0)
+    spotter = None
+    if args.wake_word:
+        keyword = np.concatenate([syllable(pitch, formant, seconds) for pitch, formant, seconds in KEYWORD])
+        spotter = KeywordSpotter([keyword + 0.005 * rng.standard_normal(len(keyword)) for _ in range(3)])
+
+    # Idle: only background noise
+    noise = (0.005 * rng.standard_normal(int(args.idle_seconds * SAMPLE_RATE))).astype(np.float32)
+    print(f"{'stream':<28}{'audio s':>9}{'CPU % of core':>15}{'utterances':>12}")
+    percent, found, _ = listening_cpu(noise, spotter)
+    print(f"{'background noise':<28}{args.idle_seconds:>9.0f}{percent:>15.3f}{len(found):>12}")
+
+    if args.audio:
+        from src.audio_archive import load_audio
+        audio = load_audio(args.audio, SAMPLE_RATE)
+        if audio.ndim > 1:
+            audio = audio.mean(axis=1)
+        ends = None
+    else:
+        audio, ends = fixture(args.utterances, rng)
+    percent, _, rejected = listening_cpu(audio, spotter)
+    name = os.path.basename(args.audio) if args.audio else "fixture with speech"
+    print(f"{name:<28}{len(audio) / SAMPLE_RATE:>9.0f}{percent:>15.3f}{len(ends or []) or '-':>12}")
+    if spotter is not None:
+        print(f"(wake word on: {rejected} utterances rejected by the keyword spotter)")
+
+    # Latency: stream again and time every detected utterance
+    detected = []
+    detector = EndpointDetector()
+    for start in range(0, len(audio), BLOCK):
+        for utterance in detector.push(audio[start:start + BLOCK]):
+            detected.append((utterance, detector.position))
+
+    executor = postprocessors = None
+    if args.model:
+        from src.speech_recognition import SpeechRecognizer
+        from src.inference_executor import ThreadExecutor
+        from src.text_normalization import TextNormalizer
+        from src.vocabulary import Vocabulary
+        executor = ThreadExecutor(SpeechRecognizer(model_name=args.model))
+        postprocessors = [Vocabulary(), TextNormalizer()]
+        executor.transcribe(detected[0][0])  # warm-up
+
+    print(f"\n{'utterance':>9}{'length s':>10}{'endpoint ms':>13}{'transcribe ms':>15}{'total ms':>10}")
+    totals = []
+    for number, (utterance, detected_at) in enumerate(detected, 1):
+        endpoint = None
+        if ends:
+            # The nearest true end before the detection
+            end = max((end for end in ends if end <= detected_at), default=None)
+            endpoint = (detected_at - end) / SAMPLE_RATE * 1000 if end is not None else None
+        transcribe = None
+        if executor is not None:
+            started = time.perf_counter()
+            text = executor.transcribe(utterance)
+            for postprocessor in postprocessors:
+                text = postprocessor.process(text)
+            transcribe = (time.perf_counter() - started) * 1000
+        total = (endpoint or 0) + (transcribe or 0)
+        totals.append(total)
+        print(f"{number:>9}{len(utterance) / SAMPLE_RATE:>10.2f}"
+              f"{'-' if endpoint is None else f'{endpoint:.0f}':>13}"
+              f"{'-' if transcribe is None else f'{transcribe:.0f}':>15}{total:>10.0f}")
+    if totals:
+        print(f"\nEnd of speech to text: median {np.median(totals):.0f} ms, max {max(totals):.0f} ms"
+              f" (endpoint silence {EndpointDetector().end_frames * 20} ms,"
+              f" recorder hand-over adds up to 50 ms)")
+    if executor is not None:
+        executor.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--idle-seconds", type=float, default=300, help="Seconds of background noise streamed")
+    parser.add_argument("--utterances", type=int, default=10, help="Utterances in the synthetic fixture")
+    parser.add_argument("--model", help="Speech model ID or path for the transcription latency")
+    parser.add_argument("--wake-word", action="store_true", help="Listen with a keyword spotter")
+    parser.add_argument("--audio", help="16 kHz recording streamed instead of the synthetic fixture")
+    run(parser.parse_args())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Import-time profile and startup budget for the package.
+
+Each scenario runs in a fresh interpreter under `python -X importtime`. The
+report lists the total import time and the slowest top-level imports, and
+the run fails (exit code 1) when a scenario imports a forbidden module or
+exceeds its time budget.
+
+Scenarios:
+    help   `speech2clipboard --help`
+    cli    headless CLI up to the point where the model is created
+    gui    application start until the main window has been painted
+
+Usage:
+    python benchmarks/bench_import_time.py [--top 10] [--json report.json]
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Modules that must never be imported before the model is actually needed
+HEAVY = ("torch", "transformers", "librosa")
+
+GUI_SNIPPET = """
+import os, sys
+from src.main import SpeechToClipboardApp
+SpeechToClipboardApp.load_model = lambda self: None  # measure startup only
+app = SpeechToClipboardApp()
+def painted():
+    sys.stdout.flush()
+    os._exit(0)
+app.window.first_paint_signal.connect(painted)
+app.run()
+"""
+
+CLI_SNIPPET = """
+import src.cli
+args = src.cli.build_parser().parse_args(["--transcribe", "recording.wav"])
+import src.audio_archive, src.speech_recognition
+"""
+
+# name: (interpreter arguments, forbidden modules, budget in ms)
+SCENARIOS = {
+    "help": (["-m", "src.cli", "--help"], HEAVY + ("numpy", "PyQt5", "scipy"), 100),
+    "cli": (["-c", CLI_SNIPPET], HEAVY + ("PyQt5", "scipy"), 400),
+    "gui": (["-c", GUI_SNIPPET], HEAVY + ("scipy",), 1000),
+}
+
+def parse_importtime(stderr):
+    """
+    Parse `-X importtime` output.
+
+    Returns:
+        list: (module, self_us, cumulative_us, depth) in import order
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3:
+            continue
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((name.strip(), int(fields[0]), int(fields[1]), depth))
+    return imports
+
+def run_scenario(name, arguments):
+    """Run one scenario in a fresh interpreter and parse its import profile"""
+    env = dict(os.environ)
+    env["QT_QPA_PLATFORM"] = "offscreen"
+    env["PYTHONPATH"] = ROOT
+    # No crash-recovery dialog during the measurement
+    env["SPOOL_DIR"] = tempfile.mkdtemp(prefix="s2c-bench-")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime"] + arguments,
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120
+    )
+    if result.returncode != 0:
+        print(f"[{name}] exited with {result.returncode}:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr), result.returncode
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports to list")
+    parser.add_argument("--json", help="Write the results to this file")
+    args = parser.parse_args()
+
+    report = {}
+    failed = False
+    for name, (arguments, forbidden, budget_ms) in SCENARIOS.items():
+        imports, returncode = run_scenario(name, arguments)
+        total_ms = sum(entry[1] for entry in imports) / 1000
+        modules = {entry[0] for entry in imports}
+        violations = sorted(
+            module for module in modules
+            if module.split(".")[0] in forbidden
+        )
+        top_level = sorted((entry for entry in imports if entry[3] == 0), key=lambda e: -e[2])
+
+        ok = returncode == 0 and not violations and total_ms <= budget_ms
+        failed = failed or not ok
+        report[name] = {
+            "total_ms": round(total_ms, 1),
+            "budget_ms": budget_ms,
+            "modules": len(modules),
+            "forbidden_imported": violations,
+            "slowest": [(entry[0], round(entry[2] / 1000, 1)) for entry in top_level[:args.top]],
+            "ok": ok,
+        }
+
+        status = "OK" if ok else "FAIL"
+        print(f"[{name}] {status}: {total_ms:.1f} ms of imports (budget {budget_ms} ms), {len(modules)} modules")
+        if violations:
+            roots = sorted({module.split('.')[0] for module in violations})
+            print(f"  forbidden modules imported: {', '.join(roots)}")
+        for module, cumulative_ms in report[name]["slowest"]:
+            print(f"  {cumulative_ms:>8.1f} ms  {module}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Latency and event-loop stalls of the thread, process and remote executors.
+
+Each executor transcribes the same recordings from a background thread,
+like SpeechProcessThread does, while the main thread runs a 5 ms tick
+loop standing in for the Qt event loop. The report shows the mean
+transcription latency, the mean and worst lateness of the ticks (GIL and
+CPU contention felt by the GUI) and, for the remote executor, the bytes
+sent per second of audio. The remote worker is started on localhost in a
+separate process.
+
+Usage:
+    python benchmarks/bench_inference_executor.py [--model ID] [--seconds 5] [--runs 3]
+                                                  [--executors thread,process,remote]
+"""
+
+import os
+import sys
+import time
+import socket
+import argparse
+import threading
+import subprocess
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from src.inference_executor import ThreadExecutor, ProcessExecutor, RemoteExecutor
+from src.inference_server import encode_audio
+
+SAMPLE_RATE = 16000
+TICK = 0.005
+
+def free_port():
+    """Find a free TCP port on localhost"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_worker(model, port):
+    """Start an inference worker process and wait until it accepts connections"""
+    command = [sys.executable, "-m", "src.inference_server", "--host", "127.0.0.1", "--port", str(port)]
+    if model:
+        command += ["--model", model]
+    process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    executor = RemoteExecutor([("127.0.0.1", port)], health_interval=0)
+    while process.poll() is None:
+        executor.check_health()
+        if executor.nodes[0].healthy:
+            return process
+        time.sleep(0.5)
+    raise RuntimeError("Inference worker did not start")
+
+def create_executor(name, model, port):
+    """Create an executor and make sure its model is loaded"""
+    options = {"model_name": model} if model else {}
+    if name == "thread":
+        from src.speech_recognition import SpeechRecognizer
+        executor = ThreadExecutor(SpeechRecognizer(**options))
+    elif name == "process":
+        executor = ProcessExecutor(options=options)
+    else:
+        executor = RemoteExecutor([("127.0.0.1", port)], health_interval=0)
+    executor.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32))  # load and warm up
+    return executor
+
+def measure(executor, audio, runs):
+    """Transcribe in a background thread while ticking in this one"""
+    latencies = []
+    lateness = []
+
+    def work():
+        for _ in range(runs):
+            started = time.perf_counter()
+            executor.transcribe(audio)
+            latencies.append(time.perf_counter() - started)
+
+    worker = threading.Thread(target=work)
+    worker.start()
+    while worker.is_alive():
+        started = time.perf_counter()
+        time.sleep(TICK)
+        lateness.append(time.perf_counter() - started - TICK)
+    worker.join()
+    return np.mean(latencies), np.mean(lateness), np.max(lateness)
+
+def run(args):
+    audio = (0.1 * np.random.default_rng(0).standard_normal(int(args.seconds * SAMPLE_RATE))).astype(np.float32)
+    names = args.executors.split(",")
+
+    worker = None
+    port = free_port()
+    if "remote" in names:
+        worker = start_worker(args.model, port)
+
+    print(f"{'executor':<10}{'latency ms':>12}{'tick late ms':>14}{'worst ms':>10}")
+    try:
+        for name in names:
+            executor = create_executor(name, args.model, port)
+            try:
+                latency, late, worst = measure(executor, audio, args.runs)
+            finally:
+                executor.close()
+            print(f"{name:<10}{latency * 1000:>12.1f}{late * 1000:>14.2f}{worst * 1000:>10.1f}")
+    finally:
+        if worker is not None:
+            worker.terminate()
+            worker.wait()
+
+    payload = len(encode_audio(audio, SAMPLE_RATE))
+    print(f"\nRemote payload: {payload / args.seconds / 1024:.1f} KiB per second of audio "
+          f"(float32 would be {4 * SAMPLE_RATE / 1024:.1f})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", help="Model ID or local path (default: the app's model)")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Length of each recording")
+    parser.add_argument("--runs", type=int, default=3, help="Transcriptions per executor")
+    parser.add_argument("--executors", default="thread,process,remote", help="Comma-separated executors to compare")
+    run(parser.parse_args())
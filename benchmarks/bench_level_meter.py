@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Measure UI-thread cost of the waveform/level display during a long recording.
+
+A feeder pushes synthetic microphone blocks into a LevelMeter while the
+waveform widget is refreshed and repainted at the capped frame rate. The
+thread CPU time of every frame is recorded so the cost at the start and end
+of the recording can be compared.
+
+Usage:
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_level_meter.py [--minutes 10] [--realtime]
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+from src.level_meter import LevelMeter
+from src.ui.main_window import MainWindow
+from src.ui.waveform_widget import WaveformWidget
+
+SAMPLE_RATE = 16000
+BLOCK_SIZE = 512
+
+def synthetic_block(rng, t0):
+    """Speech-like test signal: amplitude-modulated tone plus noise"""
+    t = (np.arange(BLOCK_SIZE) + t0) / SAMPLE_RATE
+    envelope = 0.5 * (1 + np.sin(2 * np.pi * 0.7 * t))
+    signal = envelope * 0.4 * np.sin(2 * np.pi * 220 * t)
+    return (signal + 0.02 * rng.standard_normal(BLOCK_SIZE)).astype(np.float32).reshape(-1, 1)
+
+def feed(meter, seconds, realtime, stop_event):
+    """Push blocks into the meter as the audio callback would"""
+    rng = np.random.default_rng(0)
+    blocks = int(seconds * SAMPLE_RATE / BLOCK_SIZE)
+    started = time.perf_counter()
+    for i in range(blocks):
+        if stop_event.is_set():
+            break
+        meter.push(synthetic_block(rng, i * BLOCK_SIZE))
+        if realtime:
+            due = started + (i + 1) * BLOCK_SIZE / SAMPLE_RATE
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+def run(minutes, realtime):
+    app = QApplication.instance() or QApplication(sys.argv)
+    widget = WaveformWidget()
+    widget.resize(600, 60)
+    widget.show()
+
+    meter = LevelMeter(sample_rate=SAMPLE_RATE)
+    widget.set_level_meter(meter)
+    widget.set_active(True)
+
+    seconds = minutes * 60
+    fps = MainWindow.LEVEL_FPS
+    frames = int(seconds * fps)
+    samples_per_frame = SAMPLE_RATE / fps
+
+    stop_event = threading.Event()
+    frame_times = []
+
+    if realtime:
+        feeder = threading.Thread(target=feed, args=(meter, seconds, True, stop_event), daemon=True)
+        feeder.start()
+        started = time.perf_counter()
+        for i in range(frames):
+            t0 = time.thread_time()
+            widget.refresh()
+            widget.repaint()
+            app.processEvents()
+            frame_times.append(time.thread_time() - t0)
+            due = started + (i + 1) / fps
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        stop_event.set()
+        feeder.join()
+    else:
+        # Accelerated: interleave feeding and frames on one thread, timing frames only
+        rng = np.random.default_rng(0)
+        pushed = 0
+        for i in range(frames):
+            while pushed < (i + 1) * samples_per_frame:
+                meter.push(synthetic_block(rng, pushed))
+                pushed += BLOCK_SIZE
+            t0 = time.thread_time()
+            widget.refresh()
+            widget.repaint()
+            app.processEvents()
+            frame_times.append(time.thread_time() - t0)
+
+    frame_times = np.array(frame_times) * 1000
+    minute_frames = int(60 * fps)
+    first = frame_times[:minute_frames]
+    last = frame_times[-minute_frames:]
+
+    print(f"Recording length:      {minutes:.1f} min ({frames} frames at {fps} fps)")
+    print(f"Frame time first min:  mean {first.mean():.3f} ms, p99 {np.percentile(first, 99):.3f} ms")
+    print(f"Frame time last min:   mean {last.mean():.3f} ms, p99 {np.percentile(last, 99):.3f} ms")
+    print(f"UI-thread CPU usage:   {frame_times.mean() * fps / 10:.2f} % of one core")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=10.0, help="Simulated recording length")
+    parser.add_argument("--realtime", action="store_true", help="Feed audio at real-time speed")
+    args = parser.parse_args()
+    run(args.minutes, args.realtime)
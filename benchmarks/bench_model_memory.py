@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Resident memory over time and reload latency of idle model unloading.
+
+The recognizer goes through a dictation session: load, transcribe, sit idle
+until the idle timeout unloads the model, then a new recording starts. The
+model is prefetched when the recording starts, so the report shows both the
+full reload time and how much of it was still left once the simulated
+recording ended (the delay the user actually notices). Resident memory is
+sampled in the background throughout.
+
+Usage:
+    python benchmarks/bench_model_memory.py [--model ID] [--idle 2] [--record 3]
+                                            [--rounds 3] [--csv rss.csv]
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.speech_recognition import SpeechRecognizer
+from src.resource_monitor import rss_bytes
+
+SAMPLE_RATE = 16000
+
+class RssSampler:
+    """Samples resident memory in a background thread"""
+
+    def __init__(self, interval=0.1):
+        self.interval = interval
+        self.samples = []
+        self.phase = "start"
+        self._started = time.perf_counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.samples.append((time.perf_counter() - self._started, self.phase, rss_bytes()))
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+def run(args):
+    sampler = RssSampler()
+    sampler.start()
+
+    sampler.phase = "load"
+    options = {"model_name": args.model} if args.model else {}
+    recognizer = SpeechRecognizer(idle_timeout=args.idle, **options)
+    audio = (0.1 * np.random.default_rng(0).standard_normal(int(args.record * SAMPLE_RATE))).astype(np.float32)
+
+    waits = []
+    for _ in range(args.rounds):
+        sampler.phase = "transcribe"
+        recognizer.transcribe(audio)
+
+        sampler.phase = "idle"
+        while recognizer.release_if_idle() is None:
+            time.sleep(0.1)
+        sampler.phase = "unloaded"
+        time.sleep(args.idle)
+
+        # A new recording: prefetch, "record" for a while, then transcribe
+        sampler.phase = "recording"
+        recognizer.prefetch()
+        time.sleep(args.record)
+        sampler.phase = "transcribe"
+        started = time.perf_counter()
+        recognizer.ensure_loaded()
+        waits.append(time.perf_counter() - started)
+
+    sampler.stop()
+
+    print(f"{'phase':<12}{'min MB':>9}{'max MB':>9}")
+    for phase in ("load", "transcribe", "idle", "unloaded", "recording"):
+        values = [rss for _, name, rss in sampler.samples if name == phase]
+        if values:
+            print(f"{phase:<12}{min(values) / 2**20:>9.0f}{max(values) / 2**20:>9.0f}")
+
+    loads = recognizer.load_times
+    print(f"\nInitial load:      {loads[0]:.2f} s")
+    print(f"Reload (mean):     {np.mean(loads[1:]):.2f} s over {len(loads) - 1} reloads")
+    print(f"Wait after record: {np.mean(waits) * 1000:.0f} ms "
+          f"(reload overlapped with {args.record:g} s of recording)")
+
+    if args.csv:
+        with open(args.csv, "w", encoding="utf-8") as f:
+            f.write("seconds,phase,rss_mb\n")
+            for seconds, phase, rss in sampler.samples:
+                f.write(f"{seconds:.2f},{phase},{rss / 2**20:.1f}\n")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", help="Model ID or local path (default: the app's model)")
+    parser.add_argument("--idle", type=float, default=2.0, help="Idle timeout in seconds")
+    parser.add_argument("--record", type=float, default=3.0, help="Simulated recording length in seconds")
+    parser.add_argument("--rounds", type=int, default=3, help="Unload/reload cycles")
+    parser.add_argument("--csv", help="Write every RSS sample to this file")
+    run(parser.parse_args())
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Compare batched and sequential decoding of multi-channel recordings.
+
+Every channel is decoded once per channel (sequential) and once in a
+single padded forward pass (batched). Throughput is reported as seconds of
+audio per second of wall time, counting all channels.
+
+Usage:
+    python benchmarks/bench_multichannel.py [--model ID] [--input interview.wav] [--channels 2] [--seconds 20] [--repeat 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.speech_recognition import SpeechRecognizer
+
+SAMPLE_RATE = 16000
+
+def load_audio(path, channels, seconds):
+    """Read a multi-channel WAV file or generate noise for every channel"""
+    if path:
+        from scipy.io import wavfile
+        rate, audio = wavfile.read(path)
+        if rate != SAMPLE_RATE:
+            sys.exit(f"Expected {SAMPLE_RATE} Hz audio, got {rate} Hz")
+        if audio.dtype == np.int16:
+            audio = audio.astype(np.float32) / 32768
+        return audio.reshape(len(audio), -1)
+
+    rng = np.random.default_rng(0)
+    return (0.1 * rng.standard_normal((int(seconds * SAMPLE_RATE), channels))).astype(np.float32)
+
+def timed(function, repeat):
+    """Best wall time of several runs, after one warm-up run"""
+    function()
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def run(audio, repeat, model_name):
+    recognizer = SpeechRecognizer(model_name) if model_name else SpeechRecognizer()
+    channels = [audio[:, channel] for channel in range(audio.shape[1])]
+    audio_seconds = audio.shape[0] * audio.shape[1] / SAMPLE_RATE
+
+    sequential = timed(lambda: [recognizer.transcribe_batch([channel]) for channel in channels], repeat)
+    batched = timed(lambda: recognizer.transcribe_batch(channels), repeat)
+
+    print(f"Device:       {recognizer.device}")
+    print(f"Input:        {audio.shape[1]} channels x {audio.shape[0] / SAMPLE_RATE:.1f} s")
+    print(f"Sequential:   {sequential:.3f} s ({audio_seconds / sequential:.1f} audio s/s)")
+    print(f"Batched:      {batched:.3f} s ({audio_seconds / batched:.1f} audio s/s)")
+    print(f"Speedup:      {sequential / batched:.2f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", help="Model ID or local path (default: the app's model)")
+    parser.add_argument("--input", help="Multi-channel 16 kHz WAV file")
+    parser.add_argument("--channels", type=int, default=2, help="Channels of the synthetic input")
+    parser.add_argument("--seconds", type=float, default=20.0, help="Length of the synthetic input")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per mode")
+    args = parser.parse_args()
+
+    run(load_audio(args.input, args.channels, args.seconds), args.repeat, args.model)
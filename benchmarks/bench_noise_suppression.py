@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Measure the cost and accuracy effect of the spectral noise gate.
+
+The CPU cost is measured by streaming synthetic noisy audio through the gate
+block by block, exactly as the recorder does. When a manifest is given, every
+file is also transcribed with and without the gate and the word error rates
+are compared.
+
+The manifest is a JSON lines file with one {"audio": ..., "text": ...} object
+per line; audio paths are relative to the manifest (see src/evaluation.py).
+
+Usage:
+    python benchmarks/bench_noise_suppression.py [--seconds 60] [--block 512] [--manifest noisy.jsonl] [--report-dir DIR]
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.noise_suppression import SpectralGate
+
+SAMPLE_RATE = 16000
+
+def measure_cpu(seconds, block_size):
+    """CPU seconds spent in the gate per second of audio"""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    speech = 0.3 * np.sin(2 * np.pi * 180 * t) * (np.sin(2 * np.pi * 0.5 * t) > 0)
+    audio = (speech + 0.05 * rng.standard_normal(len(t))).astype(np.float32).reshape(-1, 1)
+
+    gate = SpectralGate(sample_rate=SAMPLE_RATE)
+    gate.reset_stream()
+    block_times = []
+    started = time.process_time()
+    for start in range(0, len(audio), block_size):
+        t0 = time.perf_counter()
+        gate.process_block(audio[start:start + block_size])
+        block_times.append(time.perf_counter() - t0)
+    gate.flush()
+    cpu = time.process_time() - started
+
+    block_times = np.array(block_times) * 1000
+    print(f"Audio streamed:        {seconds:.0f} s in blocks of {block_size} samples")
+    print(f"CPU per audio second:  {cpu / seconds * 1000:.2f} ms ({cpu / seconds * 100:.2f} % of one core)")
+    print(f"Per block:             mean {block_times.mean():.3f} ms, p99 {np.percentile(block_times, 99):.3f} ms")
+
+def measure_wer(manifest, report_dir=None):
+    """Compare word error rates with and without the gate"""
+    from src.speech_recognition import SpeechRecognizer
+    from src.evaluation import load_manifest, evaluate, format_comparison, write_report
+
+    recognizer = SpeechRecognizer()
+    entries = load_manifest(manifest)
+    if not entries:
+        print("No usable manifest entries")
+        return
+
+    gate = SpectralGate(sample_rate=SAMPLE_RATE)
+
+    def gated(audio):
+        return recognizer.transcribe(gate.process(audio))
+
+    reports = []
+    for name, transcribe in (("without gate", recognizer.transcribe), ("with gate", gated)):
+        report = evaluate(entries, transcribe, jobs=1)
+        report["config"] = {"model": recognizer.model_name, "executor": "thread", "noise_suppression": name == "with gate"}
+        reports.append((name, report))
+        if report_dir:
+            write_report(report, os.path.join(report_dir, f"noise-{name.replace(' ', '-')}.json"))
+
+    print(f"\nFiles:                 {len(entries)} ({reports[0][1]['summary']['words']['count']} reference words)")
+    print(format_comparison(reports))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60.0, help="Synthetic audio length")
+    parser.add_argument("--block", type=int, default=512, help="Block size in samples")
+    parser.add_argument("--manifest", help="Noisy test set for the WER comparison")
+    parser.add_argument("--report-dir", help="Save the evaluation reports (see speech2clipboard-eval --compare)")
+    args = parser.parse_args()
+
+    measure_cpu(args.seconds, args.block)
+    if args.manifest:
+        measure_wer(args.manifest, args.report_dir)
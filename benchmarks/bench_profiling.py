@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Cost of the record -> transcribe -> copy profiling hooks.
+
+The application calls the hooks on every recording; while profiling is
+off they go to NULL_CYCLE and do nothing. The benchmark times one
+disabled hook, what that adds to a cycle, and, for comparison, the same
+cycle with profiling on (cProfile on every stage, the torch profiler on
+the transcription, and the bundle saved to a temporary directory).
+
+The cycle's stages mirror the application: the transcription is the
+recognizer with --model, or text normalization of a transcript standing
+in for it, followed by the vocabulary and normalization post-processing
+and a copy that does nothing.
+
+Usage:
+    python benchmarks/bench_profiling.py [--cycles 20] [--model path] [--seconds 5]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.profiling import CycleProfiler, HOOKS_PER_CYCLE, measure_disabled_overhead
+from src.text_normalization import TextNormalizer
+from src.vocabulary import Vocabulary
+
+SAMPLE_RATE = 16000
+
+TRANSCRIPT = ("holnap reggel kilenc órakor találkozunk az irodában és megbeszéljük "
+              "a projekt határidejét ami kétezer huszonnégy március tizenötödike ") * 20
+
+def make_transcribe(args):
+    """The transcription stage: the recognizer, or text work standing in for it"""
+    if args.model:
+        from src.speech_recognition import SpeechRecognizer
+        recognizer = SpeechRecognizer(model_name=args.model)
+        return recognizer.transcribe
+    normalizer = TextNormalizer()
+    return lambda audio: normalizer.process(TRANSCRIPT)
+
+def run_cycle(profiler, transcribe, postprocessors, audio):
+    """One cycle with the hooks placed as in the application"""
+    cycle = profiler.begin_cycle()
+    with cycle.stage("record"):
+        pass
+    if cycle.active:
+        cycle.describe(record_callbacks=0)
+    with cycle.stage("stop recording"):
+        audio = audio.copy()
+    if cycle.active:
+        cycle.describe(input_samples=len(audio))
+    with cycle.stage("transcribe", torch_trace=True):
+        text = transcribe(audio)
+    with cycle.stage("postprocess"):
+        for postprocessor in postprocessors:
+            text = postprocessor.process(text)
+    with cycle.stage("copy"):
+        pass
+    if cycle.active:
+        cycle.finish(text_length=len(text))
+
+def time_cycles(profiler, transcribe, postprocessors, audio, cycles):
+    """Median wall-clock seconds per cycle"""
+    times = []
+    for _ in range(cycles):
+        started = time.perf_counter()
+        run_cycle(profiler, transcribe, postprocessors, audio)
+        times.append(time.perf_counter() - started)
+    return float(np.median(times))
+
+def run(args):
+    transcribe = make_transcribe(args)
+    postprocessors = [Vocabulary(), TextNormalizer()]
+    audio = (0.05 * np.random.default_rng(0).standard_normal(int(args.seconds * SAMPLE_RATE))).astype(np.float32)
+
+    hook = np.median([measure_disabled_overhead() for _ in range(5)])
+    print(f"Disabled hook: {hook * 1e9:.0f} ns, {HOOKS_PER_CYCLE} per cycle = {hook * HOOKS_PER_CYCLE * 1e6:.2f} us\n")
+
+    with tempfile.TemporaryDirectory() as directory:
+        profilers = [("off", CycleProfiler(directory)), ("on", CycleProfiler(directory, enabled=True))]
+        # Warm-up: model, word caches and the torch profiler's first start
+        for _, profiler in profilers:
+            run_cycle(profiler, transcribe, postprocessors, audio)
+
+        baseline = None
+        print(f"{'profiling':<12}{'cycle ms':>10}{'overhead ms':>13}{'overhead %':>12}")
+        for name, profiler in profilers:
+            seconds = time_cycles(profiler, transcribe, postprocessors, audio, args.cycles)
+            if baseline is None:
+                # Profiling off: the only overhead is the disabled hooks
+                baseline = seconds
+                overhead = hook * HOOKS_PER_CYCLE
+            else:
+                overhead = seconds - baseline
+            print(f"{name:<12}{seconds * 1000:>10.2f}{overhead * 1000:>13.4f}{overhead / baseline * 100:>12.4f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=20, help="Timed cycles per mode")
+    parser.add_argument("--model", help="Speech model ID or path for a real transcription stage")
+    parser.add_argument("--seconds", type=float, default=5, help="Seconds of audio per cycle")
+    run(parser.parse_args())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Throughput of the text normalization stage.
+
+Synthetic transcripts are built from everyday words mixed with spoken
+numbers, dates and units, in the lowercase, unpunctuated form the
+recognizer produces. The report shows the time per transcript and words
+per second for the rule-based normalizer with a cold and a warm word
+cache and, with --punctuation-model, for the full pipeline.
+
+Usage:
+    python benchmarks/bench_text_normalization.py [--words 10000] [--repeat 20]
+                                                  [--punctuation-model DIR]
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.text_normalization import HungarianNumberNormalizer, TextNormalizer
+
+WORDS = (
+    "a az és hogy nem is meg de egy ez azt már csak még van volt lesz kell "
+    "holnap reggel találkozó projekt határidő ügyfél ajánlat szerződés iroda "
+    "hat hét alma levél kérem köszönöm rendben szerintem talán"
+).split()
+
+PHRASES = [
+    "huszonöt", "kétezer huszonnégy március tizenötödikén", "tizenöt százalékkal",
+    "három egész öt tized", "százezer forintot", "tizenegyedik", "ötven kilométer",
+    "május elsején", "ezerkilencszáznyolcvannégy", "hatvan kilométer per óra",
+]
+
+def transcript(words, rng):
+    """Random transcript of about the given number of words"""
+    parts = []
+    count = 0
+    while count < words:
+        if rng.random() < 0.05:
+            phrase = PHRASES[rng.integers(len(PHRASES))]
+        else:
+            phrase = WORDS[rng.integers(len(WORDS))]
+        parts.append(phrase)
+        count += phrase.count(" ") + 1
+    return " ".join(parts)
+
+def timed(function, text, repeat):
+    """Median seconds of repeated calls"""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(text)
+        times.append(time.perf_counter() - started)
+    return float(np.median(times))
+
+def run(args):
+    rng = np.random.default_rng(0)
+    texts = [transcript(args.words, rng) for _ in range(args.repeat)]
+    words = len(texts[0].split())
+
+    # Cold: a new normalizer (empty word cache) for every transcript
+    cold = []
+    for text in texts:
+        normalizer = HungarianNumberNormalizer()
+        started = time.perf_counter()
+        normalizer.normalize(text)
+        cold.append(time.perf_counter() - started)
+    cold = float(np.median(cold))
+    warm = timed(HungarianNumberNormalizer().normalize, texts[0], args.repeat)
+    rules = timed(TextNormalizer().process, texts[0], args.repeat)
+
+    print(f"Transcript: {words} words\n")
+    print(f"{'stage':<28}{'ms':>10}{'words/s':>14}")
+    rows = [("numbers (cold cache)", cold), ("numbers (warm cache)", warm), ("rules + casing", rules)]
+    if args.punctuation_model:
+        normalizer = TextNormalizer(args.punctuation_model)
+        normalizer.process("bemelegítés")
+        rows.append(("punctuation model + rules", timed(normalizer.process, texts[0], max(1, args.repeat // 4))))
+    for name, seconds in rows:
+        print(f"{name:<28}{seconds * 1000:>10.2f}{words / seconds:>14,.0f}")
+
+    print(f"\nExample: {TextNormalizer().process(' '.join(PHRASES[:4]))}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=10000, help="Words per transcript")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per stage")
+    parser.add_argument("--punctuation-model", help="Local punctuation model directory")
+    run(parser.parse_args())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Transcript view: UI-thread time per update as the document grows.
+
+A transcript is built up to 50k words and, at each size, the benchmark
+times the GUI-thread work of one update: a live partial result being
+patched three times and then committed, applied through TranscriptView,
+and the same text shown by the old approach of calling setText() with
+the whole transcript. The time includes the re-layout and repaint of the
+widget, so the benchmark runs on the offscreen Qt platform and needs no
+display.
+
+Usage:
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_transcript_view.py [--sizes 1000 10000 50000] [--updates 20]
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication, QTextEdit
+
+from src.ui.transcript_view import TranscriptView
+
+WORDS = "a magyar nyelv szép és gazdag, sok szóval és hosszú mondatokkal".split()
+
+def utterance(rng, words=12):
+    """A sentence of random words"""
+    text = " ".join(rng.choice(WORDS, words))
+    return text[0].upper() + text[1:] + "."
+
+def partials(text):
+    """Growing partial results ending with the final text"""
+    words = text.split()
+    return [" ".join(words[:len(words) * step // 4]) for step in (1, 2, 3)] + [text]
+
+def settle(app, widget):
+    """Let Qt lay out and paint the widget"""
+    widget.repaint()
+    app.processEvents()
+
+def grow(app, widget, words, rng, transcript):
+    """Fill a widget to the given number of words without timing"""
+    added = []
+    while len(transcript) + len(added) < words:
+        added.extend(utterance(rng).split())
+    text = " ".join(added)
+    if isinstance(widget, TranscriptView):
+        widget.append_text(text)
+        widget.flush()
+    else:
+        widget.setPlainText(widget.toPlainText() + "\n" + text if transcript else text)
+    transcript.extend(added)
+    settle(app, widget)
+
+def time_updates(app, widget, updates, rng):
+    """Milliseconds of UI-thread time per committed utterance"""
+    times = []
+    for _ in range(updates):
+        text = utterance(rng)
+        started = time.perf_counter()
+        if isinstance(widget, TranscriptView):
+            for partial in partials(text):
+                widget.set_live_text(partial)
+                widget.flush()
+                settle(app, widget)
+            widget.commit()
+            widget.flush()
+        else:
+            done = widget.toPlainText()
+            for partial in partials(text):
+                widget.setText(done + "\n" + partial)
+                settle(app, widget)
+        times.append((time.perf_counter() - started) * 1000)
+    return np.median(times), max(times)
+
+def run(args):
+    app = QApplication.instance() or QApplication([])
+    views = {"TranscriptView": TranscriptView(), "setText": QTextEdit()}
+    transcripts = {name: [] for name in views}
+    for view in views.values():
+        view.resize(700, 400)
+        view.show()
+    settle(app, views["setText"])
+
+    print(f"{'words':>8}{'widget':>16}{'median ms':>12}{'max ms':>10}")
+    for words in args.sizes:
+        for name, view in views.items():
+            rng = np.random.default_rng(words)
+            grow(app, view, words, rng, transcripts[name])
+            # Qt finishes laying out the bulk-added text lazily; not an update cost
+            time_updates(app, view, 3, rng)
+            median, worst = time_updates(app, view, args.updates, rng)
+            print(f"{words:>8}{name:>16}{median:>12.2f}{worst:>10.2f}")
+    print("\n(one update: three partial results and the final text of a 12-word utterance)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000], help="Transcript sizes in words")
+    parser.add_argument("--updates", type=int, default=20, help="Timed updates per size")
+    run(parser.parse_args())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Vocabulary matching: Aho-Corasick trie against a naive regex loop.
+
+A synthetic dictionary of multi-word phrases is applied to a synthetic
+transcript in which some of the phrases occur. The naive approach runs
+one precompiled regex substitution per entry; the trie scans the words
+once. The report also compares applying a small edit of the dictionary
+file (hot reload) with building the matcher from scratch.
+
+Usage:
+    python benchmarks/bench_vocabulary.py [--entries 1000,5000] [--words 10000]
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.vocabulary import Vocabulary
+
+SYLLABLES = "ka ro mi te szu la ne vo bi ta ge zo fe hu pa di".split()
+
+def random_phrase(rng):
+    """Made-up product name of 1-3 spoken words"""
+    return " ".join(
+        "".join(rng.choice(SYLLABLES, size=rng.integers(2, 4)))
+        for _ in range(rng.integers(1, 4))
+    )
+
+def dictionary(count, rng):
+    """Random entries: spoken phrase -> written form"""
+    entries = {}
+    while len(entries) < count:
+        phrase = random_phrase(rng)
+        entries[phrase] = phrase.title().replace(" ", "")
+    return entries
+
+def transcript(entries, words, rng):
+    """Random words with a phrase from the dictionary every ~20 words"""
+    phrases = list(entries)
+    parts = []
+    while len(parts) < words:
+        if rng.random() < 0.05:
+            parts.append(phrases[rng.integers(len(phrases))])
+        else:
+            parts.append(random_phrase(rng).split()[0])
+    return " ".join(parts)
+
+def write_dictionary(path, entries):
+    with open(path, "w", encoding="utf-8") as f:
+        for spoken, written in entries.items():
+            f.write(f"{spoken} = {written}\n")
+
+def timed(function, repeat=5):
+    """Median seconds of repeated calls"""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+    return float(np.median(times))
+
+def run(args):
+    rng = np.random.default_rng(0)
+    directory = tempfile.mkdtemp(prefix="s2c-vocabulary-")
+    path = os.path.join(directory, "vocabulary.txt")
+
+    print(f"{'entries':>8}{'trie ms':>10}{'regex ms':>11}{'speedup':>9}{'build ms':>10}{'reload ms':>11}")
+    for count in (int(value) for value in args.entries.split(",")):
+        entries = dictionary(count, rng)
+        text = transcript(entries, args.words, rng)
+        write_dictionary(path, entries)
+
+        started = time.perf_counter()
+        vocabulary = Vocabulary(path, commands=False)
+        build = time.perf_counter() - started
+        trie = timed(lambda: vocabulary.apply(text))
+
+        # Longest phrases first, so the loop also prefers longer matches
+        patterns = [
+            (re.compile(r"(?<!\S)" + re.escape(spoken) + r"(?!\S)"), written)
+            for spoken, written in sorted(entries.items(), key=lambda item: -len(item[0]))
+        ]
+        def naive():
+            result = text
+            for pattern, written in patterns:
+                result = pattern.sub(written, result)
+            return result
+        regex = timed(naive, repeat=3)
+
+        # Edit 1% of the entries and reload
+        edited = dict(entries)
+        for spoken in list(edited)[:max(1, count // 100)]:
+            edited[spoken] = edited[spoken].upper()
+        write_dictionary(path, edited)
+        os.utime(path, ns=(0, time.time_ns() + 10 ** 9))
+        started = time.perf_counter()
+        vocabulary.reload_if_changed(force=True)
+        reload = time.perf_counter() - started
+
+        print(f"{count:>8}{trie * 1000:>10.2f}{regex * 1000:>11.1f}{regex / trie:>8.0f}x"
+              f"{build * 1000:>10.1f}{reload * 1000:>11.1f}")
+    print(f"\nTranscript: {args.words} words")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", default="1000,5000", help="Comma-separated dictionary sizes")
+    parser.add_argument("--words", type=int, default=10000, help="Words in the transcript")
+    run(parser.parse_args())
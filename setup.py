@@ -26,14 +26,16 @@ setup(
         "numpy>=1.22.0",
         "pyperclip>=1.8.2",
         "PyQt5>=5.15.7",
-        "librosa>=0.9.2",
         "python-dotenv>=0.21.0",
         "scipy>=1.9.0",
+        "soundfile>=0.12.0",
         "accelerate>=0.20.0",
     ],
     entry_points={
         "console_scripts": [
-            "speech2clipboard=src.main:main",
+            "speech2clipboard=src.cli:main",
+            "speech2clipboard-worker=src.inference_server:main",
+            "speech2clipboard-eval=src.evaluation:main",
         ],
     },
 ) 
\ No newline at end of file
@@ -0,0 +1,296 @@
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+
+
+# Container/subtype used by libsndfile for every archive format
+ARCHIVE_FORMATS = {
+    "flac": ("FLAC", "PCM_16", ".flac"),
+    "opus": ("OGG", "OPUS", ".opus"),
+}
+
+
+def _soundfile():
+    """Import soundfile on first use, with a helpful error when it is missing"""
+    try:
+        import soundfile
+    except ImportError:
+        raise RuntimeError("Audio archiving requires the 'soundfile' package (pip install soundfile)")
+    return soundfile
+
+
+def format_for_path(path):
+    """
+    Guess the archive format from a file name.
+
+    Returns:
+        str: "flac" or "opus", or None if the extension is not an archive format
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".flac":
+        return "flac"
+    if extension in (".opus", ".ogg"):
+        return "opus"
+    return None
+
+
+class ArchiveWriter:
+    """
+    Streams audio blocks into a compressed file while recording.
+    """
+
+    def __init__(self, path, sample_rate, channels=1, format="flac"):
+        """
+        Open a new archive file.
+
+        Args:
+            path: File to create
+            sample_rate: Sampling rate in Hz
+            channels: Number of channels
+            format: "flac" (lossless) or "opus" (lossy, much smaller)
+        """
+        sf = _soundfile()
+        if format not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unknown archive format: {format}")
+
+        container, subtype, _ = ARCHIVE_FORMATS[format]
+        self.path = path
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.format = format
+        self.frames = 0
+        self.encode_seconds = 0.0
+        self._file = sf.SoundFile(
+            path, mode="w", samplerate=sample_rate, channels=channels,
+            format=container, subtype=subtype
+        )
+
+    def write(self, block):
+        """
+        Encode and append a block of float samples in the range [-1, 1].
+
+        Args:
+            block: Numpy array of shape (frames,) or (frames, channels)
+        """
+        block = np.asarray(block, dtype=np.float32)
+        if block.ndim == 1:
+            block = block.reshape(-1, 1)
+        started = time.process_time()
+        self._file.write(np.clip(block, -1.0, 1.0))
+        self.encode_seconds += time.process_time() - started
+        self.frames += len(block)
+
+    def close(self):
+        """
+        Finish the file.
+
+        Returns:
+            dict: Compression statistics (see stats())
+        """
+        if not self._file.closed:
+            started = time.process_time()
+            self._file.close()
+            self.encode_seconds += time.process_time() - started
+        return self.stats()
+
+    def stats(self):
+        """
+        Compression ratio and encode cost of the file written so far.
+
+        Returns:
+            dict: duration, raw (int16 PCM) and compressed byte counts,
+            compression ratio and encode CPU time per audio second
+        """
+        duration = self.frames / self.sample_rate
+        raw_bytes = self.frames * self.channels * 2
+        compressed_bytes = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        return {
+            "path": self.path,
+            "format": self.format,
+            "duration": duration,
+            "raw_bytes": raw_bytes,
+            "compressed_bytes": compressed_bytes,
+            "compression_ratio": raw_bytes / compressed_bytes if compressed_bytes else 0.0,
+            "encode_seconds": self.encode_seconds,
+            "encode_cpu_per_second": self.encode_seconds / duration if duration else 0.0,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ArchiveReader:
+    """
+    Reads an archived recording block by block for batch processing and replay.
+    """
+
+    def __init__(self, path, block_size=16000):
+        """
+        Open an archive file.
+
+        Args:
+            path: File to read
+            block_size: Number of frames per yielded block
+        """
+        self._sf = _soundfile()
+        self.path = path
+        self.block_size = block_size
+        info = self._sf.info(path)
+        self.sample_rate = info.samplerate
+        self.channels = info.channels
+        self.frames = info.frames
+
+    @property
+    def duration(self):
+        """Length of the recording in seconds"""
+        return self.frames / self.sample_rate
+
+    def __iter__(self):
+        """Yield float32 blocks of shape (frames, channels)"""
+        return self._sf.blocks(self.path, blocksize=self.block_size, dtype="float32", always_2d=True)
+
+    def read_all(self):
+        """
+        Decode the whole recording.
+
+        Returns:
+            numpy.ndarray: float32 samples of shape (frames,) for mono files,
+            (frames, channels) otherwise
+        """
+        audio, _ = self._sf.read(self.path, dtype="float32", always_2d=True)
+        return audio[:, 0] if self.channels == 1 else audio
+
+
+class AudioArchive:
+    """
+    Directory of archived recordings with retention and size limits.
+    """
+
+    def __init__(self, directory, format="flac", max_age_days=None,
+                 max_total_mb=None, max_files=None):
+        """
+        Initialize the archive.
+
+        Args:
+            directory: Where recordings are stored (created if missing)
+            format: "flac" or "opus"
+            max_age_days: Delete recordings older than this (None = keep)
+            max_total_mb: Keep the total archive size under this many MB
+            max_files: Keep at most this many recordings
+        """
+        if format not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unknown archive format: {format}")
+
+        self.directory = directory
+        self.format = format
+        self.max_age_days = max_age_days
+        self.max_total_mb = max_total_mb
+        self.max_files = max_files
+        os.makedirs(directory, exist_ok=True)
+
+    def new_writer(self, sample_rate, channels=1):
+        """
+        Create a writer for a new recording named after the current time.
+
+        Returns:
+            ArchiveWriter: Open writer
+        """
+        extension = ARCHIVE_FORMATS[self.format][2]
+        name = datetime.now().strftime("recording-%Y%m%d-%H%M%S-%f") + extension
+        return ArchiveWriter(
+            os.path.join(self.directory, name), sample_rate, channels, self.format
+        )
+
+    def recordings(self):
+        """
+        List archived recordings, oldest first.
+
+        Returns:
+            list: File paths
+        """
+        paths = [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.startswith("recording-") and format_for_path(name) is not None
+        ]
+        return sorted(paths, key=os.path.getmtime)
+
+    def enforce_retention(self):
+        """
+        Delete the oldest recordings until all limits are met.
+
+        Returns:
+            list: Paths of deleted files
+        """
+        recordings = self.recordings()
+        deleted = []
+
+        if self.max_age_days is not None:
+            cutoff = time.time() - self.max_age_days * 86400
+            while recordings and os.path.getmtime(recordings[0]) < cutoff:
+                deleted.append(recordings.pop(0))
+
+        if self.max_files is not None:
+            while len(recordings) > self.max_files:
+                deleted.append(recordings.pop(0))
+
+        if self.max_total_mb is not None:
+            limit = self.max_total_mb * 1024 * 1024
+            sizes = [os.path.getsize(path) for path in recordings]
+            total = sum(sizes)
+            # Never delete the newest recording to satisfy the size cap
+            while total > limit and len(recordings) > 1:
+                total -= sizes.pop(0)
+                deleted.append(recordings.pop(0))
+
+        for path in deleted:
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"Error removing archived recording {path}: {e}")
+        return deleted
+
+
+def load_audio(path, sample_rate=16000):
+    """
+    Read a recording for transcription: WAV, FLAC/Opus archive or spool file.
+
+    Args:
+        path: Audio file
+        sample_rate: Sampling rate the audio is converted to
+
+    Returns:
+        numpy.ndarray: float32 samples of shape (frames,) for mono files,
+        (frames, channels) otherwise
+    """
+    if path.endswith(".spool"):
+        from src.audio_spool import read_spool
+        audio, info = read_spool(path)
+        rate = info["sample_rate"]
+    elif format_for_path(path) is not None:
+        reader = ArchiveReader(path)
+        audio, rate = reader.read_all(), reader.sample_rate
+    else:
+        from scipy.io import wavfile
+        rate, audio = wavfile.read(path)
+        if audio.dtype == np.int16:
+            audio = audio.astype(np.float32) / 32768
+        elif audio.dtype == np.int32:
+            audio = audio.astype(np.float32) / 2147483648
+        elif audio.dtype == np.uint8:
+            audio = (audio.astype(np.float32) - 128) / 128
+
+    audio = np.asarray(audio, dtype=np.float32)
+    if audio.ndim > 1 and audio.shape[1] == 1:
+        audio = audio[:, 0]
+    if rate != sample_rate:
+        from math import gcd
+        from scipy.signal import resample_poly
+        divisor = gcd(rate, sample_rate)
+        audio = resample_poly(audio, sample_rate // divisor, rate // divisor, axis=0).astype(np.float32)
+    return audio
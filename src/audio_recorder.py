@@ -1,31 +1,112 @@
-import sounddevice as sd
 import numpy as np
 import threading
 import time
-from scipy.io import wavfile
+from collections import deque
+
+from src.level_meter import LevelMeter
+from src.audio_archive import ArchiveWriter, format_for_path
+from src.audio_spool import AudioSpool, read_spool, remove_spool
+from src.profiling import NULL_CYCLE
 
 class AudioRecorder:
-    def __init__(self, sample_rate=16000, channels=1):
+    # Seconds between hand-overs to the stream consumer in streaming mode;
+    # bounds how late the end of an utterance is noticed
+    STREAM_POLL_INTERVAL = 0.05
+    
+    def __init__(self, sample_rate=16000, channels=1, noise_suppressor=None, archive=None,
+                 spool_dir=None, memory_window=30.0, device=None):
         """
         Initialize the audio recorder.
         
         Args:
             sample_rate: Sampling rate in Hz (default 16000)
-            channels: Number of channels (1 for mono, 2 for stereo)
+            channels: Number of channels (1 for mono, 2 for stereo); each
+                channel is kept as a separate column of the returned array
+            noise_suppressor: Optional SpectralGate applied block by block
+            archive: Optional AudioArchive that every recording is streamed to
+            spool_dir: Directory for crash-safe spool files; when set, the
+                recording lives on disk and only the last `memory_window`
+                seconds are kept in audio_data
+            memory_window: Seconds of audio kept in memory while spooling
+            device: Input device index or name (None for the system default)
         """
         self.sample_rate = sample_rate
         self.channels = channels
+        self.device = device
+        self.noise_suppressor = noise_suppressor
+        self.archive = archive
+        self.archive_writer = None
+        self.last_archive_stats = None
+        self.spool_dir = spool_dir
+        self.memory_window = memory_window
+        self.spool = None
+        self.last_spool_path = None
+        # Set when the last recording could not be read back from its
+        # spool; the file is kept so it can be recovered at the next start
+        self.spool_error = False
         self.recording = False
+        self.calibrating = False
+        self.stream_to = None
+        self.profile_cycle = NULL_CYCLE
         self.audio_data = []
         self.record_thread = None
         
-    def start_recording(self):
-        """Start recording audio from the microphone"""
+        # Blocks waiting to be written by the recording thread
+        self._pending = deque()
+        
+        # Spool that failed while recording, and the number of frames
+        # dropped from the start of audio_data by the memory window
+        self._failed_spool = None
+        self._trimmed_frames = 0
+        
+        # Decimated level envelope for the UI meter and waveform
+        self.level_meter = LevelMeter(sample_rate=sample_rate)
+        
+    def start_recording(self, calibrate=False, stream_to=None, profile_cycle=NULL_CYCLE):
+        """
+        Start recording audio from the microphone.
+        
+        Args:
+            calibrate: Record background noise for the noise suppressor
+                instead of speech; the audio bypasses the suppressor and
+                is used as its noise profile when recording stops
+            stream_to: Streaming mode for continuous listening: every block
+                is passed to this callable on the recording thread instead
+                of being kept, archived or spooled
+            profile_cycle: ProfiledCycle the recording is part of; its
+                "record" stage covers the recording thread from start to
+                stop, and the audio callback time is added to its report
+        """
         if self.recording:
             return
         
         self.recording = True
+        self.calibrating = calibrate and self.noise_suppressor is not None
+        self.stream_to = None if self.calibrating else stream_to
+        self.profile_cycle = profile_cycle
         self.audio_data = []
+        self.level_meter.reset()
+        if self.noise_suppressor is not None and not self.calibrating:
+            self.noise_suppressor.reset_stream(self.channels)
+        
+        self._pending.clear()
+        self.archive_writer = None
+        if self.archive is not None and not self.calibrating and self.stream_to is None:
+            try:
+                self.archive_writer = self.archive.new_writer(self.sample_rate, self.channels)
+            except Exception as e:
+                print(f"Error opening audio archive: {e}")
+        
+        self.spool = None
+        self.last_spool_path = None
+        self.spool_error = False
+        self._failed_spool = None
+        self._trimmed_frames = 0
+        if self.spool_dir and not self.calibrating and self.stream_to is None:
+            try:
+                self.spool = AudioSpool.create(self.spool_dir, self.sample_rate, self.channels)
+            except Exception as e:
+                print(f"Error creating recording spool: {e}")
         
         # Start recording in a separate thread
         self.record_thread = threading.Thread(target=self._record)
@@ -42,6 +123,40 @@ class AudioRecorder:
         # Wait for the recording thread to finish
         if self.record_thread:
             self.record_thread.join()
+        
+        if self.calibrating:
+            self.calibrating = False
+            if len(self.audio_data) > 0:
+                noise = np.concatenate(self.audio_data)
+                try:
+                    self.noise_suppressor.calibrate(noise)
+                except ValueError as e:
+                    print(f"Noise calibration failed: {e}")
+                return noise
+            return np.array([])
+        
+        # Collect the samples still buffered in the noise suppressor
+        if self.noise_suppressor is not None:
+            tail = self.noise_suppressor.flush()
+            if len(tail) > 0:
+                if self.stream_to is None:
+                    self.audio_data.append(tail)
+                if self._has_sinks():
+                    self._pending.append(tail)
+        
+        self._drain_pending()
+        if self.stream_to is not None:
+            # Everything went to the stream consumer
+            self.stream_to = None
+            return np.array([])
+        
+        self._finish_archive()
+        
+        # A spooled recording is returned as a read-only view of the file
+        if self.spool is not None:
+            return self._finish_spool()
+        if self._failed_spool is not None:
+            return self._finish_failed_spool()
             
         # Combine all audio chunks
         if len(self.audio_data) > 0:
@@ -55,30 +170,182 @@ class AudioRecorder:
     
     def _record(self):
         """Internal method to record audio"""
+        # Imported here so the recorder can be created without PortAudio
+        import sounddevice as sd
+        
         def callback(indata, frames, time, status):
             if status:
                 print(f"Status: {status}")
             # Add the audio data to our list
-            self.audio_data.append(indata.copy())
+            block = indata.copy()
+            self.level_meter.push(block)
+            if self.noise_suppressor is not None and not self.calibrating:
+                block = self.noise_suppressor.process_block(block)
+                if len(block) == 0:
+                    return
+            if self.stream_to is None:
+                self.audio_data.append(block)
+            if self._has_sinks():
+                self._pending.append(block)
+        
+        cycle, self.profile_cycle = self.profile_cycle, NULL_CYCLE
+        profiled = cycle.active
+        if profiled:
+            # The callback runs on the audio driver's thread, where
+            # cProfile does not reach: time it instead
+            callback_times = []
+            untimed = callback
+            
+            def callback(indata, frames, time_info, status):
+                started = time.perf_counter()
+                untimed(indata, frames, time_info, status)
+                callback_times.append(time.perf_counter() - started)
         
         # Start the recording stream
-        with sd.InputStream(
+        with cycle.stage("record"), sd.InputStream(
             samplerate=self.sample_rate,
             channels=self.channels,
+            device=self.device,
             callback=callback
         ):
-            # Keep the stream open until recording is stopped
+            # Keep the stream open until recording is stopped, moving
+            # blocks to disk or the stream consumer outside of the audio
+            # callback
+            interval = self.STREAM_POLL_INTERVAL if self.stream_to is not None else 0.1
             while self.recording:
-                time.sleep(0.1)
+                time.sleep(interval)
+                self._drain_pending()
+        
+        if profiled:
+            cycle.describe(
+                record_callbacks=len(callback_times),
+                record_callback_seconds=sum(callback_times),
+                record_callback_max_ms=max(callback_times, default=0.0) * 1000
+            )
+    
+    def _has_sinks(self):
+        """Check if blocks have to be handed to the recording thread"""
+        return self.archive_writer is not None or self.spool is not None or self.stream_to is not None
+    
+    def _drain_pending(self):
+        """Write blocks queued by the audio callback to the archive and spool"""
+        drained = False
+        while self._pending:
+            block = self._pending.popleft()
+            drained = True
+            if self.stream_to is not None:
+                try:
+                    self.stream_to(block)
+                except Exception as e:
+                    print(f"Error in audio stream consumer: {e}")
+            if self.spool is not None:
+                try:
+                    self.spool.append(block)
+                except Exception as e:
+                    # Keep the rest of the recording in memory; the start
+                    # is only in the spool, so it is kept for stop_recording
+                    print(f"Error writing recording spool: {e}")
+                    self._failed_spool = self.spool
+                    self.spool = None
+            if self.archive_writer is not None:
+                try:
+                    self.archive_writer.write(block)
+                except Exception as e:
+                    print(f"Error writing audio archive: {e}")
+                    self.archive_writer = None
+        
+        if drained and self.spool is not None:
+            self._trim_memory_window()
+    
+    def _trim_memory_window(self):
+        """Drop spooled blocks that are older than the memory window"""
+        limit = int(self.memory_window * self.sample_rate)
+        kept = sum(len(block) for block in self.audio_data)
+        while len(self.audio_data) > 1 and kept - len(self.audio_data[0]) >= limit:
+            dropped = len(self.audio_data.pop(0))
+            kept -= dropped
+            self._trimmed_frames += dropped
+    
+    def _finish_spool(self):
+        """Close the spool and map its samples for the recognizer"""
+        spool = self.spool
+        self.spool = None
+        try:
+            spool.finish()
+            self.last_spool_path = spool.path
+            return spool.as_array()
+        except Exception as e:
+            # Only the tail of the recording is in memory: rather than
+            # returning it as the whole recording, keep the spool file
+            print(f"Error finishing recording spool: {e}")
+            return self._keep_spool(spool)
+    
+    def _finish_failed_spool(self):
+        """Join the frames of a spool that failed with the blocks kept since"""
+        spool = self._failed_spool
+        self._failed_spool = None
+        try:
+            spool.close()
+            head = np.array(read_spool(spool.path)[0])
+        except Exception as e:
+            print(f"Error reading recording spool: {e}")
+            return self._keep_spool(spool)
+        
+        # audio_data starts _trimmed_frames into the recording; the blocks
+        # before the spool's committed frames are already in head
+        tail = np.concatenate(self.audio_data) if len(self.audio_data) > 0 else head[:0]
+        tail = tail.reshape(len(tail), -1)[max(len(head) - self._trimmed_frames, 0):]
+        remove_spool(spool.path)
+        return np.concatenate((head, tail))
+    
+    def _keep_spool(self, spool):
+        """Leave a spool that could not be read back on disk for recovery"""
+        print(f"Recording kept for recovery at the next start: {spool.path}")
+        self.last_spool_path = spool.path
+        self.spool_error = True
+        return np.array([])
+    
+    def discard_spool(self, path=None):
+        """
+        Delete the spool of a recording once it has been transcribed.
+        
+        Args:
+            path: Spool file (default: the last recording's spool)
+        """
+        path = path or self.last_spool_path
+        if path:
+            remove_spool(path)
+        if path == self.last_spool_path:
+            self.last_spool_path = None
+    
+    def _finish_archive(self):
+        """Flush and close the archive file of the last recording"""
+        self._drain_pending()
+        if self.archive_writer is None:
+            return
+        
+        try:
+            self.last_archive_stats = self.archive_writer.close()
+            self.archive.enforce_retention()
+        except Exception as e:
+            print(f"Error closing audio archive: {e}")
+        self.archive_writer = None
     
     def save_to_file(self, filename, audio_data=None):
         """
-        Save the recorded audio to a WAV file.
+        Save the recorded audio to a file.
+        
+        Files ending in .flac, .opus or .ogg are written compressed,
+        anything else as a 16-bit WAV file.
         
         Args:
             filename: Name of the file to save to
             audio_data: Audio data to save (if None, use the last recorded data)
         """
+        if audio_data is None and self.last_spool_path:
+            # Only the tail of a spooled recording is kept in memory
+            audio_data = read_spool(self.last_spool_path)[0]
+        
         if audio_data is None:
             if len(self.audio_data) == 0:
                 print("No audio data to save")
@@ -91,6 +358,14 @@ class AudioRecorder:
             if audio_data.ndim > 1 and self.channels == 1:
                 audio_data = audio_data.flatten()
             
+            archive_format = format_for_path(filename)
+            if archive_format is not None:
+                with ArchiveWriter(filename, self.sample_rate, self.channels, archive_format) as writer:
+                    writer.write(audio_data)
+                return True
+            
+            from scipy.io import wavfile
+            
             # Scale to int16 range
             audio_data = (audio_data * 32767).astype(np.int16)
             
@@ -99,4 +374,4 @@ class AudioRecorder:
             return True
         except Exception as e:
             print(f"Error saving audio: {e}")
-            return False 
\ No newline at end of file
+            return False
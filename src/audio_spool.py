@@ -0,0 +1,219 @@
+import os
+import mmap
+import struct
+import time
+from datetime import datetime
+
+import numpy as np
+
+
+# Header layout: magic, version, sample rate, channels, committed frames,
+# capture-finished flag, creation time. Audio follows as float32 frames.
+HEADER_FORMAT = "<8sIIIQIxxxxd"
+HEADER_SIZE = 64
+MAGIC = b"S2CSPOOL"
+VERSION = 1
+SPOOL_EXTENSION = ".spool"
+
+# Offsets of the fields rewritten while recording
+_COMMITTED_OFFSET = struct.calcsize("<8sIII")
+_FINISHED_OFFSET = _COMMITTED_OFFSET + 8
+
+
+class AudioSpool:
+    """
+    Append-only, memory-mapped spool file for an in-progress recording.
+
+    Blocks are copied into the mapping as they arrive, and the committed
+    frame count in the header is only advanced after the samples are in
+    place. If the process dies, everything up to the last committed frame
+    can be recovered from the file. A spool is deleted once its recording
+    has been transcribed, so any spool file found at startup belongs to a
+    recording that was never delivered.
+    """
+
+    GROW_BYTES = 4 * 1024 * 1024  # File is extended in steps of this size
+
+    def __init__(self, path, sample_rate, channels):
+        """
+        Create a new spool file. Use AudioSpool.create() to get a unique name.
+
+        Args:
+            path: File to create
+            sample_rate: Sampling rate in Hz
+            channels: Number of channels
+        """
+        self.path = path
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frames = 0
+        self.finished = False
+        self._frame_bytes = 4 * channels
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o600)
+        self._capacity = HEADER_SIZE + self.GROW_BYTES
+        os.ftruncate(self._fd, self._capacity)
+        self._map = mmap.mmap(self._fd, self._capacity)
+        header = struct.pack(HEADER_FORMAT, MAGIC, VERSION, sample_rate, channels, 0, 0, time.time())
+        self._map[:len(header)] = header
+
+    @classmethod
+    def create(cls, directory, sample_rate, channels=1):
+        """
+        Create a spool for a new recording in a directory.
+
+        Returns:
+            AudioSpool: Open spool
+        """
+        os.makedirs(directory, exist_ok=True)
+        name = datetime.now().strftime("recording-%Y%m%d-%H%M%S-%f") + SPOOL_EXTENSION
+        return cls(os.path.join(directory, name), sample_rate, channels)
+
+    def append(self, block):
+        """
+        Append a block of samples and commit it.
+
+        Args:
+            block: Numpy array of shape (frames,) or (frames, channels)
+        """
+        data = np.ascontiguousarray(block, dtype=np.float32)
+        size = data.size * 4
+        if size == 0:
+            return
+
+        start = HEADER_SIZE + self.frames * self._frame_bytes
+        if start + size > self._capacity:
+            self._grow(start + size)
+
+        self._map[start:start + size] = data.tobytes()
+        self.frames += data.size // self.channels
+        # Commit only after the samples are in place
+        struct.pack_into("<Q", self._map, _COMMITTED_OFFSET, self.frames)
+
+    def sync(self):
+        """Ask the OS to write dirty pages to disk"""
+        self._map.flush()
+
+    def finish(self):
+        """Mark the capture as complete and trim the file to its contents"""
+        struct.pack_into("<I", self._map, _FINISHED_OFFSET, 1)
+        self.finished = True
+        self.close()
+
+    def close(self):
+        """Release the mapping, keeping the file on disk"""
+        if self._map is None:
+            return
+        self._map.flush()
+        self._map.close()
+        self._map = None
+        os.ftruncate(self._fd, HEADER_SIZE + self.frames * self._frame_bytes)
+        os.close(self._fd)
+
+    def as_array(self):
+        """
+        Map the committed samples read-only without copying them.
+
+        Returns:
+            numpy.memmap: float32 array of shape (frames, channels)
+        """
+        return read_spool(self.path)[0]
+
+    def discard(self):
+        """Close the spool and delete its file"""
+        self.close()
+        remove_spool(self.path)
+
+    def _grow(self, needed):
+        """Extend the file and remap it"""
+        capacity = self._capacity
+        while capacity < needed:
+            capacity += self.GROW_BYTES
+        self._map.flush()
+        self._map.close()
+        os.ftruncate(self._fd, capacity)
+        self._map = mmap.mmap(self._fd, capacity)
+        self._capacity = capacity
+
+
+def read_spool(path):
+    """
+    Open a spool file read-only.
+
+    Args:
+        path: Spool file
+
+    Returns:
+        tuple: (numpy.memmap of shape (frames, channels), info dict with
+        sample_rate, channels, frames, duration, finished and created)
+    """
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE:
+        raise ValueError(f"Truncated spool header: {path}")
+
+    magic, version, sample_rate, channels, frames, finished, created = struct.unpack_from(
+        HEADER_FORMAT, header
+    )
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a recording spool: {path}")
+
+    # Never trust the count beyond what actually reached the file
+    available = (os.path.getsize(path) - HEADER_SIZE) // (4 * channels)
+    frames = min(frames, available)
+
+    info = {
+        "path": path,
+        "sample_rate": sample_rate,
+        "channels": channels,
+        "frames": frames,
+        "duration": frames / sample_rate if sample_rate else 0.0,
+        "finished": bool(finished),
+        "created": created,
+    }
+    if frames == 0:
+        return np.zeros((0, channels), dtype=np.float32), info
+    audio = np.memmap(path, dtype=np.float32, mode="r", offset=HEADER_SIZE, shape=(frames, channels))
+    return audio, info
+
+
+def find_unfinished(directory):
+    """
+    List spools left behind by recordings that were never transcribed.
+
+    Args:
+        directory: Spool directory
+
+    Returns:
+        list: Info dicts (see read_spool), oldest first; unreadable or empty
+        spools are removed
+    """
+    if not directory or not os.path.isdir(directory):
+        return []
+
+    spools = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(SPOOL_EXTENSION):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            _, info = read_spool(path)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Removing unreadable spool {path}: {e}")
+            remove_spool(path)
+            continue
+        if info["frames"] == 0:
+            remove_spool(path)
+            continue
+        spools.append(info)
+    return spools
+
+
+def remove_spool(path):
+    """Delete a spool file, ignoring files that are already gone"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"Error removing spool {path}: {e}")
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Command line entry point for Hungarian Speech to Clipboard"""
+
+import os
+import sys
+import argparse
+
+from src import __version__
+
+# Only the standard library is imported at module level: `--help` and
+# argument errors must return without loading Qt, torch or the model.
+
+def build_parser():
+    """Create the command line parser"""
+    parser = argparse.ArgumentParser(
+        prog="speech2clipboard",
+        description="Record Hungarian speech, transcribe it and copy the text to the clipboard. "
+                    "Without arguments the application window is opened."
+    )
+    parser.add_argument(
+        "--version", action="version", version=f"%(prog)s {__version__}"
+    )
+    parser.add_argument(
+        "-t", "--transcribe", nargs="+", metavar="FILE",
+        help="transcribe audio files without opening the window "
+             "(WAV, FLAC, Opus or recording spool files)"
+    )
+    parser.add_argument(
+        "--copy", action="store_true",
+        help="also copy the transcription to the clipboard (with --transcribe)"
+    )
+    parser.add_argument(
+        "--raw", action="store_true",
+        help="print the recognizer output as is, without vocabulary, punctuation and number formatting"
+    )
+    parser.add_argument(
+        "--model", default=os.environ.get("SPEECH_MODEL"),
+        help="speech model ID or local path (default: $SPEECH_MODEL or the built-in Hungarian model)"
+    )
+    return parser
+
+def run_headless(args):
+    """
+    Transcribe files and print the results, one per line.
+
+    Returns:
+        int: Process exit code
+    """
+    from src.audio_archive import load_audio
+    from src.speech_recognition import SpeechRecognizer
+
+    recognizer = SpeechRecognizer(args.model) if args.model else SpeechRecognizer()
+    postprocessors = []
+    if not args.raw:
+        from src.text_normalization import TextNormalizer
+        from src.vocabulary import Vocabulary, DEFAULT_VOCABULARY_FILE
+        vocabulary_file = os.environ.get("VOCABULARY_FILE", DEFAULT_VOCABULARY_FILE)
+        postprocessors.append(Vocabulary(
+            os.path.expanduser(vocabulary_file) if vocabulary_file else None,
+            commands=os.environ.get("VOCABULARY_COMMANDS", "true").lower() == "true"
+        ))
+        punctuation_model = os.environ.get("PUNCTUATION_MODEL")
+        postprocessors.append(TextNormalizer(os.path.expanduser(punctuation_model) if punctuation_model else None))
+
+    transcriptions = []
+    failed = False
+    for path in args.transcribe:
+        try:
+            audio = load_audio(path, recognizer.sampling_rate)
+        except Exception as e:
+            print(f"Error reading {path}: {e}", file=sys.stderr)
+            failed = True
+            continue
+
+        text = recognizer.transcribe(audio)
+        for postprocessor in postprocessors:
+            text = postprocessor.process(text)
+        transcriptions.append(text)
+        if len(args.transcribe) > 1:
+            print(f"{path}: {text}")
+        else:
+            print(text)
+
+    if args.copy and transcriptions:
+        from src.clipboard_manager import ClipboardManager
+        if not ClipboardManager.copy_to_clipboard("\n".join(transcriptions)):
+            print("Failed to copy to clipboard", file=sys.stderr)
+            failed = True
+
+    return 1 if failed else 0
+
+def main(argv=None):
+    """Entry point for the application"""
+    args = build_parser().parse_args(argv)
+
+    if args.transcribe:
+        return run_headless(args)
+
+    # Qt is only imported when the window is actually needed
+    from src.main import SpeechToClipboardApp
+    app = SpeechToClipboardApp(model_name=args.model)
+    return app.run()
+
+if __name__ == "__main__":
+    sys.exit(main())
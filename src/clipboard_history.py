@@ -0,0 +1,207 @@
+import os
+import json
+import time
+import queue
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+# Where the history is kept between runs unless CLIPBOARD_HISTORY_FILE says otherwise
+DEFAULT_HISTORY_FILE = "~/.local/share/speech2clipboard/history.json"
+
+
+class ClipboardHistory:
+    """
+    Bounded history of copied texts, most recent last.
+
+    Entries are keyed by a hash of their text: copying a text that is
+    already in the history moves it to the front instead of adding a
+    duplicate. When the history is full the oldest entry is dropped.
+    """
+
+    def __init__(self, path=None, capacity=50):
+        """
+        Initialize the history and load the saved entries.
+
+        Args:
+            path: JSON file the history is persisted to (None = memory only)
+            capacity: Maximum number of entries
+        """
+        self.path = path
+        self.capacity = capacity
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if path:
+            self.load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(text):
+        """Deduplication key of a text"""
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def add(self, text):
+        """
+        Add a copied text.
+
+        Args:
+            text: The copied text (empty texts are ignored)
+
+        Returns:
+            bool: Whether the history changed
+        """
+        if not text:
+            return False
+        key = self.key(text)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                entry = {"text": text, "copies": 0}
+            entry["copies"] += 1
+            entry["time"] = time.time()
+            self._entries[key] = entry
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+        return True
+
+    def entries(self):
+        """
+        The history, most recent first.
+
+        Returns:
+            list: Dicts with "text", "time" (epoch seconds) and "copies"
+        """
+        with self._lock:
+            return [dict(entry) for entry in reversed(self._entries.values())]
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def load(self):
+        """Load the saved history; a missing or unreadable file leaves it empty"""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable clipboard history {self.path}: {e}")
+            return
+        # Valid JSON of another shape is just as unreadable
+        if not isinstance(saved, dict) or not isinstance(saved.get("entries", []), list):
+            print(f"Ignoring unreadable clipboard history {self.path}: unexpected format")
+            return
+
+        with self._lock:
+            self._entries.clear()
+            # Saved most recent first
+            for entry in reversed(saved.get("entries", [])[:self.capacity]):
+                if isinstance(entry, dict) and isinstance(entry.get("text"), str) and entry["text"]:
+                    self._entries[self.key(entry["text"])] = {
+                        "text": entry["text"],
+                        "time": entry.get("time", 0.0),
+                        "copies": entry.get("copies", 1),
+                    }
+
+    def save(self):
+        """
+        Write the history to its file.
+
+        The file is replaced atomically (write to a temporary file, then
+        rename), so a crash never leaves a truncated history behind.
+        """
+        if not self.path:
+            return
+        data = {"version": 1, "entries": self.entries()}
+        directory = os.path.dirname(self.path) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, temporary = tempfile.mkstemp(prefix=".history-", dir=directory)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temporary, self.path)
+            except BaseException:
+                os.unlink(temporary)
+                raise
+        except OSError as e:
+            print(f"Error saving clipboard history: {e}")
+
+
+class BackgroundWriter:
+    """
+    Runs slow writes (clipboard tools, history file) on a worker thread.
+
+    Jobs are submitted under a key. A job that has not started yet is
+    replaced when a newer one with the same key arrives: only the latest
+    clipboard content and the latest history state need to be written.
+    """
+
+    def __init__(self, name="clipboard-writer"):
+        """
+        Start the worker thread.
+
+        Args:
+            name: Name of the worker thread
+        """
+        self._queue = queue.Queue()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, key, job):
+        """
+        Queue a job.
+
+        Args:
+            key: Jobs with the same key replace each other while queued
+            job: Callable run on the worker thread
+        """
+        with self._lock:
+            replaced = key in self._pending
+            self._pending[key] = job
+        if not replaced:
+            self._queue.put(key)
+
+    def flush(self, timeout=None):
+        """
+        Wait until every queued job has run.
+
+        Returns:
+            bool: False if the timeout expired first
+        """
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Run the queued jobs and stop the worker"""
+        self.flush(timeout)
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        """Worker loop"""
+        while True:
+            key = self._queue.get()
+            if key is None:
+                return
+            if isinstance(key, threading.Event):
+                key.set()
+                continue
+            with self._lock:
+                job = self._pending.pop(key, None)
+            if job is None:
+                continue
+            try:
+                job()
+            except Exception as e:
+                print(f"Error in background write ({key}): {e}")
@@ -0,0 +1,248 @@
+import os
+import time
+
+# torch is imported inside the methods, like in speech_recognition.py
+
+# Bucket lengths in seconds; inputs are zero-padded up to the next bucket
+DEFAULT_BUCKETS = (2, 4, 8, 16, 32)
+
+BACKENDS = ("trace", "compile")
+
+
+class CompiledEngine:
+    """
+    Runs a Wav2Vec2ForCTC model through ahead-of-time compiled graphs.
+
+    Every input is padded up to one of a few fixed lengths (buckets), so each
+    bucket is traced or compiled exactly once. Compilation happens on first
+    use of a bucket or in warmup(). The compiled graphs share the model's
+    parameters, so a bucket costs no extra copy of the weights; for the
+    same reason TorchScript traces are not saved to disk and are rebuilt
+    in every run. torch.compile keeps its inductor cache in the cache
+    directory.
+
+    The padding is masked out, which only works for models that take an
+    attention mask (feat_extract_norm == "layer"). Group norm models
+    normalize over the padding too, so they are refused with a ValueError.
+
+    logits() returns None whenever the compiled path cannot be used (input
+    longer than the largest bucket, or compilation failed), and the caller
+    falls back to the eager model.
+    """
+
+    def __init__(self, model, model_name, device="cpu", sampling_rate=16000,
+                 backend="trace", buckets=DEFAULT_BUCKETS, cache_dir=None):
+        """
+        Initialize the engine.
+
+        Args:
+            model: Loaded Wav2Vec2ForCTC model (in eval mode)
+            model_name: Model ID or path
+            device: Device the model runs on
+            sampling_rate: Sampling rate of the input in Hz
+            backend: "trace" (TorchScript) or "compile" (torch.compile)
+            buckets: Bucket lengths in seconds
+            cache_dir: Directory for the torch.compile cache (None = default)
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown compile backend: {backend}")
+        norm = getattr(model.config, "feat_extract_norm", "layer")
+        if norm != "layer":
+            raise ValueError(f"feat_extract_norm={norm!r} models cannot be padded to a bucket")
+
+        self.model = model
+        self.model_name = model_name
+        self.device = device
+        self.sampling_rate = sampling_rate
+        self.backend = backend
+        self.buckets = sorted(int(seconds * sampling_rate) for seconds in buckets)
+        self.cache_dir = cache_dir
+
+        self._compiled = {}
+        self._failed = set()
+        self._compiled_module = None
+        self.stats = {
+            bucket: {"calls": 0, "samples": 0, "padded": 0, "seconds": 0.0, "compile_seconds": 0.0}
+            for bucket in self.buckets
+        }
+
+        if cache_dir and backend == "compile":
+            os.makedirs(cache_dir, exist_ok=True)
+            os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", os.path.join(cache_dir, "inductor"))
+
+    def bucket_for(self, length):
+        """
+        Smallest bucket that fits an input.
+
+        Returns:
+            int: Bucket length in samples, or None if the input is too long
+        """
+        for bucket in self.buckets:
+            if length <= bucket:
+                return bucket
+        return None
+
+    def warmup(self, buckets=None):
+        """
+        Compile buckets ahead of time.
+
+        Args:
+            buckets: Bucket lengths in samples (default: all buckets)
+        """
+        for bucket in buckets or self.buckets:
+            self._get_compiled(bucket)
+
+    def logits(self, input_values):
+        """
+        Compute logits through the compiled graph of the matching bucket.
+
+        Args:
+            input_values: Tensor of shape (1, samples) on the engine's device
+
+        Returns:
+            torch.Tensor: Logits for the unpadded input, or None when the
+            caller has to run the eager model instead
+        """
+        import torch
+
+        length = input_values.shape[-1]
+        bucket = self.bucket_for(length)
+        if bucket is None or input_values.shape[0] != 1:
+            return None
+
+        compiled = self._get_compiled(bucket)
+        if compiled is None:
+            return None
+
+        padded = torch.zeros((1, bucket), dtype=input_values.dtype, device=input_values.device)
+        padded[:, :length] = input_values
+        mask = torch.zeros((1, bucket), dtype=torch.long, device=input_values.device)
+        mask[:, :length] = 1
+
+        started = time.perf_counter()
+        try:
+            with torch.no_grad():
+                logits = compiled(padded, mask)
+        except Exception as e:
+            print(f"Compiled inference failed for bucket {bucket}, using eager mode: {e}")
+            self._failed.add(bucket)
+            self._compiled.pop(bucket, None)
+            return None
+
+        frames = int(self.model._get_feat_extract_output_lengths(torch.tensor(length)))
+        stats = self.stats[bucket]
+        stats["calls"] += 1
+        stats["samples"] += length
+        stats["padded"] += bucket - length
+        stats["seconds"] += time.perf_counter() - started
+        return logits[:, :frames]
+
+    def report(self):
+        """
+        Per-bucket usage statistics.
+
+        Returns:
+            list: Dicts with the bucket length, call count, padding waste
+            (share of computed samples that were padding) and mean latency
+        """
+        rows = []
+        for bucket in self.buckets:
+            stats = self.stats[bucket]
+            computed = stats["samples"] + stats["padded"]
+            rows.append({
+                "bucket_seconds": bucket / self.sampling_rate,
+                "calls": stats["calls"],
+                "padding_waste": stats["padded"] / computed if computed else 0.0,
+                "mean_seconds": stats["seconds"] / stats["calls"] if stats["calls"] else 0.0,
+                "compile_seconds": stats["compile_seconds"],
+                "compiled": bucket in self._compiled,
+            })
+        return rows
+
+    def _get_compiled(self, bucket):
+        """Return the compiled callable for a bucket, building it if needed"""
+        if bucket in self._compiled:
+            return self._compiled[bucket]
+        if bucket in self._failed:
+            return None
+
+        started = time.perf_counter()
+        try:
+            if self.backend == "trace":
+                compiled = self._trace(bucket)
+            else:
+                compiled = self._compile(bucket)
+        except Exception as e:
+            print(f"Could not compile bucket {bucket / self.sampling_rate:g}s ({self.backend}), "
+                  f"using eager mode: {e}")
+            self._failed.add(bucket)
+            return None
+
+        self.stats[bucket]["compile_seconds"] += time.perf_counter() - started
+        self._compiled[bucket] = compiled
+        return compiled
+
+    def _example_inputs(self, bucket):
+        """Inputs with the shape and dtype of a bucket"""
+        import torch
+        dtype = next(self.model.parameters()).dtype
+        return (
+            torch.zeros((1, bucket), dtype=dtype, device=self.device),
+            torch.ones((1, bucket), dtype=torch.long, device=self.device),
+        )
+
+    def _trace(self, bucket):
+        """Trace the model for a bucket with TorchScript"""
+        import torch
+
+        # Not frozen or saved: both would copy the weights into every bucket
+        with torch.no_grad():
+            traced = torch.jit.trace(
+                _logits_module(self.model), self._example_inputs(bucket),
+                check_trace=False, strict=False
+            )
+
+        # The TorchScript executor specializes the graph over its first runs
+        with torch.no_grad():
+            for _ in range(2):
+                traced(*self._example_inputs(bucket))
+        return traced
+
+    def _compile(self, bucket):
+        """Compile the model with torch.compile and run it once for a bucket"""
+        import torch
+
+        if self._compiled_module is None:
+            # One static graph per bucket
+            torch._dynamo.config.cache_size_limit = max(
+                torch._dynamo.config.cache_size_limit, len(self.buckets) + 1
+            )
+            self._compiled_module = torch.compile(
+                _logits_module(self.model), dynamic=False
+            )
+
+        with torch.no_grad():
+            self._compiled_module(*self._example_inputs(bucket))
+        return self._compiled_module
+
+
+def _logits_module_class():
+    """Define the wrapper module lazily so importing this file stays cheap"""
+    import torch
+
+    class LogitsModule(torch.nn.Module):
+        """Wraps Wav2Vec2ForCTC so the graph returns a plain logits tensor"""
+
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, input_values, attention_mask):
+            return self.model(input_values, attention_mask=attention_mask).logits
+
+    return LogitsModule
+
+
+def _logits_module(model):
+    """Create the logits wrapper for a model"""
+    return _logits_module_class()(model).eval()
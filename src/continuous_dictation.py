@@ -0,0 +1,462 @@
+import os
+import numpy as np
+from collections import deque
+from functools import lru_cache
+
+
+class EndpointDetector:
+    """
+    Energy-based speech endpoint detector for a continuous audio stream.
+
+    The stream is cut into short frames whose energy is compared with an
+    adaptive noise floor: the floor follows quieter frames quickly and
+    louder frames slowly, so it settles on the background level of the
+    room. A frame is speech when it is `margin_db` above the floor. An
+    utterance starts after `start_ms` of speech and ends after `end_ms` of
+    silence; `preroll_ms` of audio before the start is included so word
+    onsets are not cut off.
+
+    Costs one mean of squares per frame, which keeps listening cheap.
+    """
+
+    def __init__(self, sample_rate=16000, frame_ms=20, margin_db=10.0, min_level_db=-60.0,
+                 start_ms=100, end_ms=700, preroll_ms=300, min_speech_ms=300, max_utterance_s=30.0,
+                 floor_rise=0.01, floor_fall=0.2, floor_track=0.001):
+        """
+        Initialize the endpoint detector.
+
+        Args:
+            sample_rate: Sampling rate of the pushed audio in Hz
+            frame_ms: Analysis frame length
+            margin_db: How far above the noise floor speech has to be
+            min_level_db: Frames quieter than this are never speech
+            start_ms: Speech needed before an utterance starts
+            end_ms: Silence that ends an utterance
+            preroll_ms: Audio kept before the detected start
+            min_speech_ms: Shorter utterances (clicks, coughs) are dropped
+            max_utterance_s: Utterances are cut at this length
+            floor_rise: Adaptation rate of the floor towards louder frames
+            floor_fall: Adaptation rate of the floor towards quieter frames
+            floor_track: Adaptation rate towards louder frames counted as
+                speech, so a lasting change of the background noise ends
+                up in the floor instead of being treated as endless speech
+        """
+        self.sample_rate = sample_rate
+        self.frame = int(sample_rate * frame_ms / 1000)
+        self.margin_db = margin_db
+        self.min_level_db = min_level_db
+        self.start_frames = max(1, int(start_ms / frame_ms))
+        self.end_frames = max(1, int(end_ms / frame_ms))
+        self.preroll_frames = int(preroll_ms / frame_ms)
+        self.min_speech_frames = int(min_speech_ms / frame_ms)
+        self.max_frames = int(max_utterance_s * 1000 / frame_ms)
+        self.floor_rise = floor_rise
+        self.floor_fall = floor_fall
+        self.floor_track = floor_track
+        self.reset()
+
+    def reset(self):
+        """Forget the stream state and the noise floor"""
+        self.floor_db = None
+        self.position = 0  # samples pushed so far
+        self.in_speech = False
+        self.last_speech_end = None
+        self._carry = None
+        self._preroll = deque(maxlen=self.preroll_frames + self.start_frames)
+        self._frames = []
+        self._speech_run = 0
+        self._silence_run = 0
+        self._speech_frames = 0
+
+    def push(self, block):
+        """
+        Add a block of audio.
+
+        Args:
+            block: Numpy array of shape (samples,) or (samples, channels)
+
+        Returns:
+            list: Finished utterances, each a float32 array shaped like the
+            input blocks
+        """
+        block = np.asarray(block, dtype=np.float32)
+        if self._carry is not None and len(self._carry):
+            block = np.concatenate([self._carry, block])
+        count = len(block) // self.frame
+        self._carry = block[count * self.frame:]
+        if count == 0:
+            return []
+
+        frames = block[:count * self.frame]
+        power = frames.reshape(count, self.frame, -1) ** 2
+        levels = 10 * np.log10(power.mean(axis=(1, 2)) + 1e-10)
+
+        utterances = []
+        for index in range(count):
+            utterance = self._step(frames[index * self.frame:(index + 1) * self.frame], levels[index])
+            if utterance is not None:
+                utterances.append(utterance)
+        return utterances
+
+    def flush(self):
+        """
+        End the stream.
+
+        Returns:
+            numpy.ndarray or None: The utterance in progress, if long enough
+        """
+        utterance = self._finish(trailing=self._silence_run) if self.in_speech else None
+        self.reset_stream()
+        return utterance
+
+    def reset_stream(self):
+        """Drop the audio in progress but keep the learned noise floor"""
+        floor = self.floor_db
+        self.reset()
+        self.floor_db = floor
+
+    def _step(self, frame, level):
+        """Advance the state machine by one frame"""
+        self.position += len(frame)
+        if self.floor_db is None:
+            self.floor_db = level
+        speech = level > max(self.floor_db + self.margin_db, self.min_level_db)
+
+        # Speech frames raise the floor only slowly, so an utterance barely
+        # moves it but a lasting louder background does
+        if level < self.floor_db:
+            self.floor_db += self.floor_fall * (level - self.floor_db)
+        else:
+            self.floor_db += (self.floor_track if speech else self.floor_rise) * (level - self.floor_db)
+
+        if not self.in_speech:
+            self._preroll.append(frame)
+            self._speech_run = self._speech_run + 1 if speech else 0
+            if self._speech_run >= self.start_frames:
+                self.in_speech = True
+                self._frames = list(self._preroll)
+                self._preroll.clear()
+                self._speech_frames = self._speech_run
+                self._silence_run = 0
+            return None
+
+        self._frames.append(frame)
+        if speech:
+            self._speech_frames += 1
+            self._silence_run = 0
+        else:
+            self._silence_run += 1
+
+        if self._silence_run >= self.end_frames:
+            return self._finish(trailing=self._silence_run)
+        if len(self._frames) >= self.max_frames:
+            # The speaker is still talking: the next part starts right away
+            utterance = self._finish(trailing=0)
+            self.in_speech = True
+            return utterance
+        return None
+
+    def _finish(self, trailing):
+        """Close the utterance in progress"""
+        # Keep a little of the trailing silence as a natural word ending
+        keep = len(self._frames) - max(0, trailing - self.start_frames)
+        frames = self._frames[:keep]
+        speech_frames = self._speech_frames
+        self.last_speech_end = self.position - trailing * self.frame
+        self.in_speech = False
+        self._frames = []
+        self._speech_run = 0
+        self._silence_run = 0
+        self._speech_frames = 0
+        if speech_frames < self.min_speech_frames or not frames:
+            return None
+        return np.concatenate(frames)
+
+
+@lru_cache(maxsize=8)
+def mel_filterbank(sample_rate, fft_size, bands):
+    """
+    Triangular mel filters.
+
+    Returns:
+        numpy.ndarray: Matrix of shape (fft_size // 2 + 1, bands)
+    """
+    def to_mel(hz):
+        return 2595 * np.log10(1 + hz / 700)
+
+    def to_hz(mel):
+        return 700 * (10 ** (mel / 2595) - 1)
+
+    edges = to_hz(np.linspace(to_mel(60.0), to_mel(sample_rate / 2), bands + 2))
+    bins = np.fft.rfftfreq(fft_size, 1 / sample_rate)
+    filters = np.zeros((len(bins), bands), dtype=np.float32)
+    for band in range(bands):
+        low, center, high = edges[band:band + 3]
+        rising = (bins - low) / (center - low)
+        falling = (high - bins) / (high - center)
+        filters[:, band] = np.clip(np.minimum(rising, falling), 0, None)
+    return filters
+
+
+def log_mel(audio, sample_rate=16000, bands=32, frame_ms=25, hop_ms=10):
+    """
+    Mean-normalized log-mel features.
+
+    Args:
+        audio: Samples of shape (samples,) or (samples, channels); channels
+            are averaged
+        sample_rate: Sampling rate in Hz
+
+    Returns:
+        numpy.ndarray: Features of shape (frames, bands)
+    """
+    audio = np.asarray(audio, dtype=np.float32)
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    frame = int(sample_rate * frame_ms / 1000)
+    hop = int(sample_rate * hop_ms / 1000)
+    if len(audio) < frame:
+        audio = np.pad(audio, (0, frame - len(audio)))
+    fft_size = 1 << (frame - 1).bit_length()
+
+    count = 1 + (len(audio) - frame) // hop
+    indices = np.arange(frame)[None, :] + hop * np.arange(count)[:, None]
+    frames = audio[indices] * np.hanning(frame).astype(np.float32)
+    power = np.abs(np.fft.rfft(frames, n=fft_size, axis=1)) ** 2
+    mel = power @ mel_filterbank(sample_rate, fft_size, bands)
+    # Limit the dynamic range so faint background noise does not dominate
+    features = np.log(mel + 1e-4 * mel.max() + 1e-10)
+    return features - features.mean(axis=0)
+
+
+def prefix_dtw(template, features):
+    """
+    Align a template with the beginning of a feature sequence.
+
+    The alignment starts at the first frame of both sequences and may end
+    anywhere in `features`, so the keyword can be followed by more speech.
+
+    Args:
+        template: Features of shape (m, bands)
+        features: Features of shape (n, bands)
+
+    Returns:
+        tuple: (cost, end) with the path-length normalized cosine distance
+        and the number of feature frames covered by the best alignment
+    """
+    a = template / (np.linalg.norm(template, axis=1, keepdims=True) + 1e-9)
+    b = features / (np.linalg.norm(features, axis=1, keepdims=True) + 1e-9)
+    distance = 1.0 - a @ b.T
+    rows, columns = distance.shape
+
+    # Accumulated cost and path length, one template row at a time
+    cost = np.cumsum(distance[0])
+    length = np.arange(1, columns + 1)
+    positions = np.arange(columns)
+    for row in range(1, rows):
+        # Enter the row diagonally or vertically...
+        diagonal = np.concatenate([[np.inf], cost[:-1]])
+        diagonal_length = np.concatenate([[0], length[:-1]])
+        take_diagonal = diagonal <= cost
+        entry = np.where(take_diagonal, diagonal, cost) + distance[row]
+        entry_length = np.where(take_diagonal, diagonal_length, length) + 1
+
+        # ...then move horizontally: cost[c] = S[c] + min over k <= c of
+        # (entry[k] - S[k]) with S the running sum of the row's distances
+        running = np.cumsum(distance[row])
+        offsets = entry - running
+        best = np.minimum.accumulate(offsets)
+        start = np.maximum.accumulate(np.where(offsets == best, positions, 0))
+        cost = running + best
+        length = entry_length[start] + positions - start
+
+    normalized = cost / length
+    end = int(np.argmin(normalized))
+    return float(normalized[end]), end + 1
+
+
+class KeywordSpotter:
+    """
+    Small template-matching keyword (wake word) spotter.
+
+    The user records a few examples of the keyword. Each detected utterance
+    is compared with them by dynamic time warping over log-mel features;
+    the keyword has to be at the start of the utterance. Runs only on
+    utterances the EndpointDetector found, never on the raw stream.
+    """
+
+    def __init__(self, templates, sample_rate=16000, threshold=0.3, slack=1.6):
+        """
+        Initialize the keyword spotter.
+
+        Args:
+            templates: Recorded examples of the keyword (sample arrays)
+            sample_rate: Sampling rate in Hz
+            threshold: Largest normalized DTW distance counted as a match
+            slack: How much longer than a template the keyword may be spoken
+        """
+        if not templates:
+            raise ValueError("at least one keyword template is needed")
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        self.slack = slack
+        self.templates = [log_mel(_trim_silence(template), sample_rate) for template in templates]
+        self.last_distance = None
+
+    @classmethod
+    def from_directory(cls, path, sample_rate=16000, **options):
+        """
+        Load the keyword templates from the audio files in a directory.
+
+        Args:
+            path: Directory with one recording of the keyword per file
+            sample_rate: Sampling rate the recordings are converted to
+            **options: Passed on to KeywordSpotter
+        """
+        from src.audio_archive import load_audio
+
+        templates = []
+        for name in sorted(os.listdir(path)):
+            if name.lower().endswith((".wav", ".flac", ".ogg", ".opus")):
+                templates.append(load_audio(os.path.join(path, name), sample_rate))
+        return cls(templates, sample_rate=sample_rate, **options)
+
+    def match(self, audio):
+        """
+        Check whether an utterance starts with the keyword.
+
+        Args:
+            audio: The utterance
+
+        Returns:
+            int or None: Sample where the keyword ends, None if it was not
+            spoken
+        """
+        hop = int(self.sample_rate * 0.010)
+        trimmed = _trim_silence(audio)
+        offset = _leading_silence(audio)
+        longest = max(len(template) for template in self.templates)
+        head = trimmed[:int(longest * self.slack * hop + 0.015 * self.sample_rate)]
+        features = log_mel(head, self.sample_rate)
+
+        best, end = np.inf, 0
+        for template in self.templates:
+            distance, frames = prefix_dtw(template, features)
+            if distance < best:
+                best, end = distance, frames
+        self.last_distance = best
+        if best > self.threshold:
+            return None
+        return offset + end * hop
+
+
+def _leading_silence(audio, frame=320, margin_db=20.0):
+    """Samples before the first frame within margin_db of the loudest one"""
+    audio = np.asarray(audio, dtype=np.float32)
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    count = len(audio) // frame
+    if count == 0:
+        return 0
+    levels = 10 * np.log10((audio[:count * frame].reshape(count, frame) ** 2).mean(axis=1) + 1e-10)
+    loud = np.nonzero(levels > levels.max() - margin_db)[0]
+    return int(loud[0]) * frame
+
+
+def _trim_silence(audio):
+    """Cut the quiet start of a recording"""
+    return np.asarray(audio)[_leading_silence(audio):]
+
+
+class ContinuousDictation:
+    """
+    Hands-free dictation on top of a continuous recording.
+
+    Blocks from the recorder go through the EndpointDetector; every
+    finished utterance is handed to `on_utterance` for transcription. With
+    a KeywordSpotter, dictation is asleep until an utterance starts with
+    the keyword, then stays awake for `wake_timeout` seconds after the last
+    utterance. Speech following the keyword in the same utterance is
+    dictated too.
+
+    push_block() is meant to run on the recorder thread; the callbacks are
+    called from there as well.
+    """
+
+    def __init__(self, on_utterance, detector=None, spotter=None, wake_timeout=10.0,
+                 on_speech_start=None, on_wake=None):
+        """
+        Initialize continuous dictation.
+
+        Args:
+            on_utterance: Called with each utterance to transcribe
+            detector: EndpointDetector (default: one with default settings)
+            spotter: Optional KeywordSpotter; None dictates every utterance
+            wake_timeout: Seconds of silence before the keyword is needed again
+            on_speech_start: Called when speech starts while awake, e.g. to
+                reload an unloaded model in time
+            on_wake: Called when the keyword was recognized
+        """
+        self.on_utterance = on_utterance
+        self.detector = detector or EndpointDetector()
+        self.spotter = spotter
+        self.wake_timeout = wake_timeout
+        self.on_speech_start = on_speech_start
+        self.on_wake = on_wake
+        self._awake_until = None
+        self.utterances = 0
+        self.rejected = 0
+
+    @property
+    def awake(self):
+        """Whether utterances are dictated without the keyword"""
+        if self.spotter is None:
+            return True
+        return self._awake_until is not None and self._now() <= self._awake_until
+
+    def _now(self):
+        """Stream time in seconds"""
+        return self.detector.position / self.detector.sample_rate
+
+    def push_block(self, block):
+        """
+        Feed a block from the recorder.
+
+        Args:
+            block: Numpy array of shape (samples,) or (samples, channels)
+        """
+        was_in_speech = self.detector.in_speech
+        for utterance in self.detector.push(block):
+            self._handle(utterance)
+        if not was_in_speech and self.detector.in_speech and self.on_speech_start and self.awake:
+            self.on_speech_start()
+
+    def flush(self):
+        """Handle the utterance in progress when listening stops"""
+        utterance = self.detector.flush()
+        if utterance is not None:
+            self._handle(utterance)
+
+    def _handle(self, utterance):
+        """Dictate, wake up on or ignore a finished utterance"""
+        if self.awake:
+            self._deliver(utterance)
+            return
+
+        end = self.spotter.match(utterance)
+        if end is None:
+            self.rejected += 1
+            return
+        self._awake_until = self._now() + self.wake_timeout
+        if self.on_wake:
+            self.on_wake()
+        rest = utterance[end:]
+        if len(rest) >= self.detector.min_speech_frames * self.detector.frame:
+            self._deliver(rest)
+
+    def _deliver(self, utterance):
+        """Hand an utterance over for transcription"""
+        self.utterances += 1
+        if self.spotter is not None:
+            self._awake_until = self._now() + self.wake_timeout
+        self.on_utterance(utterance)
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""Offline word and character error rate evaluation of the speech recognizer"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import platform
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Only numpy and the standard library are imported at module level, so the
+# scoring functions can be used by the benchmarks without loading torch.
+
+REPORT_VERSION = 1
+
+
+def load_manifest(path):
+    """
+    Read an evaluation manifest.
+
+    One JSON object per line with "audio" (path relative to the manifest)
+    and "text" (the reference transcript); an optional "id" names the entry.
+
+    Returns:
+        list: Dicts with "id", "audio" (absolute path) and "text"
+    """
+    base_dir = os.path.dirname(os.path.abspath(path))
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if "audio" not in entry or "text" not in entry:
+                raise ValueError(f"{path}:{number}: entries need \"audio\" and \"text\"")
+            entries.append({
+                "id": entry.get("id", entry["audio"]),
+                "audio": os.path.join(base_dir, entry["audio"]),
+                "text": entry["text"],
+            })
+    return entries
+
+
+def normalize_for_scoring(text):
+    """Lowercase, drop punctuation and collapse whitespace"""
+    return " ".join(re.sub(r"[^\w\s]|_", " ", text.lower()).split())
+
+
+def align(reference, hypothesis):
+    """
+    Levenshtein alignment of two token sequences.
+
+    The dynamic programming table is filled one reference token at a time
+    with numpy: substitutions and deletions are vectorized directly, and
+    the left-to-right chain of insertions is solved with a running minimum
+    (cost[j] = min over k <= j of base[k] + j - k). Only one row is kept.
+    Besides the cost, only the insertions on the best path are counted:
+    on a path to cell (i, j), deletions - insertions = i - j, and the
+    substitutions are the rest of the cost, so no backtrace is needed.
+
+    Args:
+        reference: Sequence of tokens (words or characters)
+        hypothesis: Sequence of tokens
+
+    Returns:
+        dict: "hits", "substitutions", "insertions" and "deletions"
+    """
+    n, m = len(reference), len(hypothesis)
+    if n == 0 or m == 0:
+        return {"hits": 0, "substitutions": 0, "insertions": m, "deletions": n}
+
+    ids = {}
+    reference_ids = np.array([ids.setdefault(token, len(ids)) for token in reference])
+    hypothesis_ids = np.array([ids.setdefault(token, len(ids)) for token in hypothesis])
+
+    positions = np.arange(m + 1)
+    cost = positions.copy()
+    insertions = positions.copy()
+    base = np.empty(m + 1, dtype=np.int64)
+    base_insertions = np.empty(m + 1, dtype=np.int64)
+    for token in reference_ids:
+        # Diagonal (hit or substitution) or vertical (deletion) step
+        diagonal = cost[:-1] + (hypothesis_ids != token)
+        vertical = cost[1:] + 1
+        take_diagonal = diagonal <= vertical
+        base[0] = cost[0] + 1
+        np.minimum(diagonal, vertical, out=base[1:])
+        base_insertions[0] = insertions[0]
+        base_insertions[1:] = np.where(take_diagonal, insertions[:-1], insertions[1:])
+
+        # Horizontal steps (insertions) from the cheapest cell on the left
+        offsets = base - positions
+        best = np.minimum.accumulate(offsets)
+        start = np.maximum.accumulate(np.where(offsets == best, positions, 0))
+        cost = best + positions
+        insertions = base_insertions[start] + positions - start
+
+    total = int(cost[-1])
+    inserted = int(insertions[-1])
+    deleted = inserted + n - m
+    return {
+        "hits": n - (total - inserted),
+        "substitutions": total - inserted - deleted,
+        "insertions": inserted,
+        "deletions": deleted,
+    }
+
+
+def score(reference, hypothesis, normalize=True):
+    """
+    Word and character errors of one transcript.
+
+    Args:
+        reference: Reference transcript
+        hypothesis: Recognizer output
+        normalize: Ignore case and punctuation
+
+    Returns:
+        dict: "words" and "characters", each an align() result plus the
+        reference length under "count"
+    """
+    if normalize:
+        reference, hypothesis = normalize_for_scoring(reference), normalize_for_scoring(hypothesis)
+    else:
+        reference, hypothesis = " ".join(reference.split()), " ".join(hypothesis.split())
+
+    words = align(reference.split(), hypothesis.split())
+    words["count"] = len(reference.split())
+    characters = align(reference, hypothesis)
+    characters["count"] = len(reference)
+    return {"words": words, "characters": characters}
+
+
+def error_rate(counts):
+    """(S + I + D) / N of an align() result with "count" (None for an empty reference)"""
+    if not counts["count"]:
+        return None
+    return (counts["substitutions"] + counts["insertions"] + counts["deletions"]) / counts["count"]
+
+
+def evaluate(entries, transcribe, postprocessors=(), jobs=4, normalize=True, sample_rate=16000,
+             progress=None, warmup=True):
+    """
+    Transcribe and score manifest entries in parallel.
+
+    Args:
+        entries: load_manifest() result
+        transcribe: Callable taking float32 samples and returning text
+            (an inference executor's transcribe method)
+        postprocessors: Objects whose process(text) method is applied in order
+        jobs: Files in flight at once; how many of them actually run on
+            the model at the same time depends on the executor
+        normalize: Ignore case and punctuation when scoring
+        sample_rate: Sampling rate the audio is converted to
+        progress: Called with (done, total) after every file
+        warmup: Transcribe a second of silence in every job slot first, so
+            model loading (e.g. in worker processes) is not timed
+
+    Returns:
+        dict: Report with a "summary" and per-file "files" results
+    """
+    from src.audio_archive import load_audio
+
+    done = [0]
+
+    def run(entry):
+        result = {"id": entry["id"], "audio": entry["audio"], "reference": entry["text"]}
+        try:
+            audio = load_audio(entry["audio"], sample_rate)
+            result["audio_seconds"] = len(audio) / sample_rate
+            started = time.perf_counter()
+            text = transcribe(audio)
+            result["transcribe_seconds"] = time.perf_counter() - started
+            for postprocessor in postprocessors:
+                text = postprocessor.process(text)
+            result["hypothesis"] = text
+            result.update(score(entry["text"], text, normalize))
+            result["wer"] = error_rate(result["words"])
+            result["cer"] = error_rate(result["characters"])
+        except Exception as e:
+            print(f"Error evaluating {entry['audio']}: {e}", file=sys.stderr)
+            result["error"] = str(e)
+        done[0] += 1
+        if progress is not None:
+            progress(done[0], len(entries))
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        if warmup:
+            list(pool.map(transcribe, [np.zeros(sample_rate, dtype=np.float32)] * max(1, jobs)))
+        started = time.perf_counter()
+        files = list(pool.map(run, entries))
+        wall = time.perf_counter() - started
+
+    return {
+        "version": REPORT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "summary": summarize(files, wall),
+        "files": files,
+    }
+
+
+def summarize(files, wall_seconds):
+    """Corpus-level totals of per-file results"""
+    scored = [result for result in files if "error" not in result]
+    summary = {"files": len(files), "failed": len(files) - len(scored)}
+    for unit in ("words", "characters"):
+        totals = {key: sum(result[unit][key] for result in scored)
+                  for key in ("count", "hits", "substitutions", "insertions", "deletions")}
+        summary[unit] = totals
+    summary["wer"] = error_rate(summary["words"])
+    summary["cer"] = error_rate(summary["characters"])
+
+    audio = sum(result["audio_seconds"] for result in scored)
+    summary["audio_seconds"] = audio
+    summary["wall_seconds"] = wall_seconds
+    # Wall-clock seconds per audio second over the whole run, so parallel
+    # executors show their speed-up; per-file times include waiting for a
+    # free model
+    summary["real_time_factor"] = wall_seconds / audio if audio else None
+    latencies = [result["transcribe_seconds"] for result in scored]
+    summary["median_latency_seconds"] = float(np.median(latencies)) if latencies else None
+    return summary
+
+
+def write_report(report, path):
+    """Write a report as indented JSON"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def _percent(value):
+    return "-" if value is None else f"{value * 100:.2f}"
+
+
+def format_comparison(reports):
+    """
+    Side-by-side table of reports: accuracy next to speed.
+
+    Args:
+        reports: (name, report) pairs
+
+    Returns:
+        str: The table
+    """
+    lines = [f"{'report':<24}{'model':<28}{'executor':<10}{'WER %':>8}{'CER %':>8}"
+             f"{'S/I/D':>16}{'RTF':>7}{'median s':>10}"]
+    for name, report in reports:
+        summary = report["summary"]
+        config = report.get("config", {})
+        words = summary["words"]
+        errors = f"{words['substitutions']}/{words['insertions']}/{words['deletions']}"
+        rtf = summary.get("real_time_factor")
+        latency = summary.get("median_latency_seconds")
+        lines.append(
+            f"{name[:23]:<24}{str(config.get('model', '-'))[-27:]:<28}{config.get('executor', '-'):<10}"
+            f"{_percent(summary['wer']):>8}{_percent(summary['cer']):>8}{errors:>16}"
+            f"{'-' if rtf is None else f'{rtf:.3f}':>7}{'-' if latency is None else f'{latency:.2f}':>10}"
+        )
+    return "\n".join(lines)
+
+
+def build_parser():
+    """Create the command line parser"""
+    parser = argparse.ArgumentParser(
+        prog="speech2clipboard-eval",
+        description="Transcribe a manifest of recordings and report word and character error rates."
+    )
+    parser.add_argument("manifest", nargs="?", help="JSON lines file of {\"audio\": ..., \"text\": ...}")
+    parser.add_argument(
+        "--model", default=os.environ.get("SPEECH_MODEL"),
+        help="speech model ID or local path (default: $SPEECH_MODEL or the built-in Hungarian model)"
+    )
+    parser.add_argument("--executor", choices=("thread", "process", "remote"), default="thread",
+                        help="where inference runs (default: thread)")
+    parser.add_argument("--workers", type=int, default=2,
+                        help="model processes for --executor process (default: 2)")
+    parser.add_argument("--nodes", default=os.environ.get("INFERENCE_NODES", ""),
+                        help="worker addresses for --executor remote (default: $INFERENCE_NODES)")
+    parser.add_argument("--jobs", type=int, default=4, help="files in flight at once (default: 4)")
+    parser.add_argument("--compile-backend", choices=("trace", "compile"),
+                        help="run the recognizer through the compiled inference engine")
+    parser.add_argument("--raw", action="store_true",
+                        help="score the recognizer output without vocabulary and text normalization")
+    parser.add_argument("--exact", action="store_true", help="score case and punctuation too")
+    parser.add_argument("-o", "--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", nargs="+", metavar="REPORT",
+                        help="print saved reports side by side instead of evaluating")
+    return parser
+
+
+def create_executor(args):
+    """Create the inference executor selected on the command line"""
+    from src.inference_executor import ThreadExecutor, ProcessExecutor, RemoteExecutor, parse_nodes
+
+    options = {}
+    if args.model:
+        options["model_name"] = args.model
+    if args.compile_backend:
+        options["compile_backend"] = args.compile_backend
+
+    if args.executor == "process":
+        return ProcessExecutor(options=options, workers=args.workers)
+    if args.executor == "remote":
+        nodes = parse_nodes(args.nodes)
+        if not nodes:
+            raise ValueError("--nodes (or INFERENCE_NODES) is empty")
+        return RemoteExecutor(nodes)
+
+    from src.speech_recognition import SpeechRecognizer
+    return ThreadExecutor(SpeechRecognizer(**options))
+
+
+def main(argv=None):
+    """Entry point of speech2clipboard-eval"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        reports = []
+        for path in args.compare:
+            with open(path, encoding="utf-8") as f:
+                reports.append((os.path.basename(path), json.load(f)))
+        print(format_comparison(reports))
+        return 0
+
+    if not args.manifest:
+        parser.error("a manifest is needed (or --compare)")
+
+    entries = load_manifest(args.manifest)
+    if not entries:
+        print("The manifest is empty", file=sys.stderr)
+        return 1
+
+    postprocessors = []
+    if not args.raw:
+        from src.text_normalization import TextNormalizer
+        from src.vocabulary import Vocabulary, DEFAULT_VOCABULARY_FILE
+        vocabulary_file = os.environ.get("VOCABULARY_FILE", DEFAULT_VOCABULARY_FILE)
+        postprocessors.append(Vocabulary(os.path.expanduser(vocabulary_file) if vocabulary_file else None))
+        punctuation_model = os.environ.get("PUNCTUATION_MODEL")
+        postprocessors.append(TextNormalizer(os.path.expanduser(punctuation_model) if punctuation_model else None))
+
+    executor = create_executor(args)
+    try:
+        def progress(done, total):
+            print(f"\r{done}/{total} files", end="", file=sys.stderr, flush=True)
+
+        report = evaluate(entries, executor.transcribe, postprocessors, jobs=args.jobs,
+                          normalize=not args.exact, progress=progress)
+        print(file=sys.stderr)
+    finally:
+        executor.close()
+
+    report["manifest"] = os.path.abspath(args.manifest)
+    report["config"] = {
+        "model": args.model or "jonatasgrosman/wav2vec2-large-xlsr-53-hungarian",
+        "executor": args.executor,
+        "workers": args.workers if args.executor == "process" else 1,
+        "jobs": args.jobs,
+        "compile_backend": args.compile_backend,
+        "postprocessing": not args.raw,
+        "normalized_scoring": not args.exact,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+    if args.output:
+        write_report(report, args.output)
+
+    summary = report["summary"]
+    words = summary["words"]
+    print(format_comparison([(os.path.basename(args.output or args.manifest), report)]))
+    print(f"\n{summary['files']} files ({summary['failed']} failed), {words['count']} reference words: "
+          f"{words['substitutions']} substitutions, {words['insertions']} insertions, "
+          f"{words['deletions']} deletions")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
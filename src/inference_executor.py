@@ -0,0 +1,318 @@
+import socket
+import threading
+import time
+
+from src.inference_server import (
+    PING, PONG, TRANSCRIBE, RESULT, ERROR, LOAD, DEFAULT_PORT,
+    send_frame, recv_frame, encode_audio, ProtocolError
+)
+
+EXECUTORS = ("thread", "process", "remote")
+
+
+class ThreadExecutor:
+    """
+    Runs inference in the calling thread with an in-process recognizer.
+
+    This is what the application always did: SpeechProcessThread calls
+    transcribe() and the model runs inside the GUI process.
+    """
+
+    name = "thread"
+
+    def __init__(self, recognizer=None, factory=None):
+        """
+        Initialize the executor.
+
+        Args:
+            recognizer: Loaded SpeechRecognizer
+            factory: Callable creating the recognizer on first use, when
+                none is passed (used for failover, so a remote setup does
+                not load the model unless it is needed)
+        """
+        self.recognizer = recognizer
+        self.factory = factory
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio):
+        """Transcribe audio (blocks until done)"""
+        with self._lock:
+            if self.recognizer is None:
+                self.recognizer = self.factory()
+        return self.recognizer.transcribe(audio)
+
+    def close(self):
+        """Nothing to release; the recognizer belongs to the caller"""
+
+
+# The recognizer of a process pool worker, created by _init_worker()
+_worker_recognizer = None
+
+
+def _init_worker(factory, options):
+    """Load the recognizer once per worker process"""
+    global _worker_recognizer
+    _worker_recognizer = factory(**options)
+
+
+def _worker_transcribe(audio):
+    """Transcribe audio in a worker process"""
+    return _worker_recognizer.transcribe(audio)
+
+
+def _worker_ready():
+    """Warm-up task: returns once the worker has loaded its model"""
+    return _worker_recognizer is not None
+
+
+class ProcessExecutor:
+    """
+    Runs inference in a pool of worker processes.
+
+    Every worker loads its own copy of the model, so the GUI process stays
+    small and inference never competes with the Qt event loop for the GIL.
+    Workers are started with "spawn", which is safe next to Qt and torch
+    threads.
+    """
+
+    name = "process"
+
+    def __init__(self, factory=None, options=None, workers=1):
+        """
+        Initialize the executor and start loading the model in the workers.
+
+        Args:
+            factory: Picklable callable creating the recognizer in a worker
+                (default: SpeechRecognizer)
+            options: Keyword arguments for the factory
+            workers: Number of worker processes
+        """
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        if factory is None:
+            from src.speech_recognition import SpeechRecognizer
+            factory = SpeechRecognizer
+
+        self.workers = workers
+        # Submitted tasks, cancelled by close() if they have not started
+        self._futures = set()
+        self._futures_lock = threading.Lock()
+        self.pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(factory, options or {})
+        )
+        # Start the workers now instead of on the first recording
+        for _ in range(workers):
+            self._submit(_worker_ready)
+
+    def transcribe(self, audio):
+        """Transcribe audio in a worker (blocks until done)"""
+        return self._submit(_worker_transcribe, audio).result()
+
+    def close(self):
+        """Stop the worker processes, dropping tasks that have not started"""
+        # shutdown(cancel_futures=True) would need Python 3.9
+        with self._futures_lock:
+            futures = list(self._futures)
+        for future in futures:
+            future.cancel()
+        self.pool.shutdown(wait=False)
+
+    def _submit(self, function, *args):
+        """Submit a task to the pool and track it until it is done"""
+        future = self.pool.submit(function, *args)
+        with self._futures_lock:
+            self._futures.add(future)
+        future.add_done_callback(self._forget)
+        return future
+
+    def _forget(self, future):
+        """Stop tracking a finished or cancelled task"""
+        with self._futures_lock:
+            self._futures.discard(future)
+
+
+class RemoteNode:
+    """Connection state and health of one remote worker"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.healthy = True
+        self.outstanding = 0
+        self.remote_load = 0
+        self.failures = 0
+        self.latency = None
+
+    @property
+    def address(self):
+        return f"{self.host}:{self.port}"
+
+
+def parse_nodes(value):
+    """
+    Parse a comma-separated list of worker addresses.
+
+    Args:
+        value: For example "gpu-server:8765,10.0.0.5" (the port defaults to 8765)
+
+    Returns:
+        list: (host, port) tuples
+    """
+    nodes = []
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        host, _, port = item.rpartition(":") if ":" in item else (item, "", "")
+        nodes.append((host, int(port) if port else DEFAULT_PORT))
+    return nodes
+
+
+class RemoteExecutor:
+    """
+    Sends audio to remote inference workers (see src/inference_server.py).
+
+    Requests go to the healthy worker with the least load, counting both
+    the requests this client has in flight and the load the worker
+    reported in its last health check. A worker that fails a request or a
+    health check is skipped until a later health check succeeds. When no
+    worker can take the request, it runs on the fallback executor.
+    """
+
+    name = "remote"
+
+    def __init__(self, nodes, fallback=None, timeout=120.0, health_interval=10.0, sample_rate=16000):
+        """
+        Initialize the executor and start the health checks.
+
+        Args:
+            nodes: (host, port) tuples of the workers
+            fallback: Executor used when every worker is down (None = fail)
+            timeout: Seconds to wait for a transcription
+            health_interval: Seconds between health checks (0 = no checks)
+            sample_rate: Sampling rate of the audio in Hz
+        """
+        self.nodes = [RemoteNode(host, port) for host, port in nodes]
+        self.fallback = fallback
+        self.timeout = timeout
+        self.health_interval = health_interval
+        self.sample_rate = sample_rate
+        self.connect_timeout = min(timeout, 3.0)
+
+        self._lock = threading.Lock()
+        self._next = 0
+        self._stop = threading.Event()
+        self._health_thread = None
+        if health_interval:
+            self._health_thread = threading.Thread(target=self._health_loop, daemon=True)
+            self._health_thread.start()
+
+    def transcribe(self, audio):
+        """
+        Transcribe audio on a remote worker, failing over to the next
+        worker and finally to the fallback executor.
+        """
+        payload = encode_audio(audio, self.sample_rate)
+
+        tried = set()
+        while True:
+            node = self._pick(tried)
+            if node is None:
+                break
+            tried.add(node)
+            try:
+                return self._request(node, payload)
+            except (OSError, ProtocolError) as e:
+                print(f"Inference worker {node.address} failed: {e}")
+                self._mark_down(node)
+            except RuntimeError as e:
+                # The worker is fine but could not transcribe this audio
+                print(f"Inference worker {node.address} returned an error: {e}")
+
+        if self.fallback is None:
+            raise RuntimeError("No inference worker available")
+        print("No inference worker available, transcribing locally")
+        return self.fallback.transcribe(audio)
+
+    def check_health(self):
+        """Ping every worker once and update its health"""
+        for node in self.nodes:
+            started = time.perf_counter()
+            try:
+                with self._connect(node, self.connect_timeout) as sock:
+                    send_frame(sock, PING)
+                    frame_type, payload = recv_frame(sock)
+                if frame_type != PONG:
+                    raise ProtocolError(f"Expected PONG, got frame type {frame_type}")
+            except (OSError, ProtocolError):
+                self._mark_down(node)
+                continue
+
+            with self._lock:
+                if not node.healthy:
+                    print(f"Inference worker {node.address} is back")
+                node.healthy = True
+                node.failures = 0
+                node.remote_load = LOAD.unpack(payload)[0]
+                node.latency = time.perf_counter() - started
+
+    def close(self):
+        """Stop the health checks and close the fallback"""
+        self._stop.set()
+        if self._health_thread is not None:
+            self._health_thread.join(timeout=self.connect_timeout + 1)
+        if self.fallback is not None:
+            self.fallback.close()
+
+    def _health_loop(self):
+        """Check the workers periodically until closed"""
+        while not self._stop.is_set():
+            self.check_health()
+            self._stop.wait(self.health_interval)
+
+    def _pick(self, exclude):
+        """Choose the least loaded healthy worker, round-robin among equals"""
+        with self._lock:
+            order = self.nodes[self._next:] + self.nodes[:self._next]
+            candidates = [node for node in order if node.healthy and node not in exclude]
+            if not candidates:
+                return None
+            node = min(candidates, key=lambda n: n.outstanding + n.remote_load)
+            self._next = (self.nodes.index(node) + 1) % len(self.nodes)
+            node.outstanding += 1
+            return node
+
+    def _request(self, node, payload):
+        """Send one transcription request to a worker"""
+        try:
+            with self._connect(node, self.connect_timeout) as sock:
+                sock.settimeout(self.timeout)
+                send_frame(sock, TRANSCRIBE, payload)
+                frame_type, response = recv_frame(sock)
+        finally:
+            with self._lock:
+                node.outstanding -= 1
+
+        if frame_type == RESULT:
+            return response.decode("utf-8")
+        if frame_type == ERROR:
+            raise RuntimeError(response.decode("utf-8", errors="replace"))
+        raise ProtocolError(f"Unexpected frame type {frame_type}")
+
+    def _connect(self, node, timeout):
+        """Open a connection to a worker"""
+        sock = socket.create_connection((node.host, node.port), timeout=timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+    def _mark_down(self, node):
+        """Stop sending requests to a worker until it passes a health check"""
+        with self._lock:
+            if node.healthy:
+                print(f"Inference worker {node.address} is down")
+            node.healthy = False
+            node.failures += 1
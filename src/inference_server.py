@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Remote inference worker for Hungarian Speech to Clipboard.
+
+Runs the speech model on a (usually bigger) machine and transcribes audio
+sent by RemoteExecutor clients over TCP.
+
+Protocol: every message is a frame of a 12-byte header followed by the
+payload. The header holds the magic b"S2CP", the protocol version, the
+frame type, a reserved byte and the payload length (network byte order).
+
+    PING        empty              health check
+    PONG        !I                 requests the worker is currently running
+    TRANSCRIBE  !IHI + zlib(PCM)   sample rate, channels, samples per channel,
+                                   then zlib-compressed little-endian int16
+                                   samples (interleaved)
+    RESULT      UTF-8 text         transcription
+    ERROR       UTF-8 text         the request failed on the worker
+
+A connection carries any number of request/response pairs. There is no
+authentication, so the worker only listens on localhost unless it is
+started with --allow-remote.
+
+Usage:
+    python -m src.inference_server [--host 127.0.0.1] [--port 8765] [--model ID]
+    python -m src.inference_server --host 0.0.0.0 --allow-remote
+"""
+
+import sys
+import zlib
+import socket
+import struct
+import argparse
+import ipaddress
+import threading
+import socketserver
+
+import numpy as np
+
+MAGIC = b"S2CP"
+VERSION = 2
+DEFAULT_PORT = 8765
+
+HEADER = struct.Struct("!4sBBxxI")
+AUDIO_HEADER = struct.Struct("!IHI")
+LOAD = struct.Struct("!I")
+
+# Frame types
+PING = 1
+PONG = 2
+TRANSCRIBE = 3
+RESULT = 4
+ERROR = 5
+
+# Larger frames are rejected (about 30 minutes of 16 kHz stereo PCM)
+MAX_PAYLOAD = 128 * 1024 * 1024
+
+# Largest decompressed audio accepted, so a small frame cannot expand
+# into gigabytes
+MAX_AUDIO_BYTES = MAX_PAYLOAD
+
+
+class ProtocolError(Exception):
+    """The peer sent something that is not a valid frame"""
+
+
+def send_frame(sock, frame_type, payload=b""):
+    """Send one frame over a connected socket"""
+    sock.sendall(HEADER.pack(MAGIC, VERSION, frame_type, len(payload)) + payload)
+
+
+def _recv_exactly(sock, size):
+    """Read exactly size bytes, or raise ConnectionError on EOF"""
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if count == 0:
+            raise ConnectionError("Connection closed by peer")
+        received += count
+    return bytes(buffer)
+
+
+def recv_frame(sock):
+    """
+    Receive one frame.
+
+    Returns:
+        tuple: (frame type, payload bytes)
+    """
+    magic, version, frame_type, length = HEADER.unpack(_recv_exactly(sock, HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ProtocolError(f"Unsupported frame (magic {magic!r}, version {version})")
+    if length > MAX_PAYLOAD:
+        raise ProtocolError(f"Frame of {length} bytes is too large")
+    return frame_type, _recv_exactly(sock, length) if length else b""
+
+
+def encode_audio(audio, sample_rate=16000):
+    """
+    Pack audio into a TRANSCRIBE payload.
+
+    Args:
+        audio: Float samples in [-1, 1], shape (samples,) or (samples, channels)
+        sample_rate: Sampling rate in Hz
+
+    Returns:
+        bytes: Payload
+    """
+    audio = np.asarray(audio, dtype=np.float32)
+    channels = 1 if audio.ndim == 1 else audio.shape[1]
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).round().astype("<i2")
+    return AUDIO_HEADER.pack(sample_rate, channels, len(pcm)) + zlib.compress(pcm.tobytes(), 1)
+
+
+def decode_audio(payload):
+    """
+    Unpack a TRANSCRIBE payload.
+
+    The audio is decompressed up to the size announced in the header, and
+    payloads that would expand beyond it (or beyond MAX_AUDIO_BYTES) are
+    rejected without being expanded.
+
+    Returns:
+        tuple: (float32 audio array, sample rate)
+    """
+    if len(payload) < AUDIO_HEADER.size:
+        raise ProtocolError("Truncated audio payload")
+    sample_rate, channels, samples = AUDIO_HEADER.unpack_from(payload)
+    expected = samples * max(channels, 1) * 2
+    if expected > MAX_AUDIO_BYTES:
+        raise ProtocolError(f"Audio of {expected} bytes is too large")
+    decompressor = zlib.decompressobj()
+    try:
+        pcm = decompressor.decompress(payload[AUDIO_HEADER.size:], expected)
+        # All announced samples are there: the rest may only end the stream
+        if len(pcm) == expected and decompressor.decompress(decompressor.unconsumed_tail, 1):
+            raise ProtocolError("Audio payload is larger than its header says")
+    except zlib.error as e:
+        raise ProtocolError(f"Corrupt audio payload: {e}")
+    if len(pcm) != expected:
+        raise ProtocolError(f"Audio payload holds {len(pcm)} bytes, the header says {expected}")
+    audio = np.frombuffer(pcm, dtype="<i2").astype(np.float32) / 32767
+    if channels > 1:
+        audio = audio.reshape(-1, channels)
+    return audio, sample_rate
+
+
+class _WorkerHandler(socketserver.BaseRequestHandler):
+    """Serves the requests of one client connection"""
+
+    def handle(self):
+        server = self.server
+        while True:
+            try:
+                frame_type, payload = recv_frame(self.request)
+            except (ConnectionError, OSError, struct.error):
+                return
+            except ProtocolError as e:
+                print(f"Closing connection from {self.client_address[0]}: {e}")
+                return
+
+            if frame_type == PING:
+                send_frame(self.request, PONG, LOAD.pack(server.active))
+            elif frame_type == TRANSCRIBE:
+                self._transcribe(payload)
+            else:
+                send_frame(self.request, ERROR, f"Unknown frame type {frame_type}".encode("utf-8"))
+
+    def _transcribe(self, payload):
+        server = self.server
+        with server.active_lock:
+            server.active += 1
+        try:
+            audio, sample_rate = decode_audio(payload)
+            if sample_rate != server.recognizer.sampling_rate:
+                raise ProtocolError(
+                    f"Expected {server.recognizer.sampling_rate} Hz audio, got {sample_rate} Hz"
+                )
+            text = server.recognizer.transcribe(audio)
+            send_frame(self.request, RESULT, text.encode("utf-8"))
+        except Exception as e:
+            print(f"Error transcribing request from {self.client_address[0]}: {e}")
+            send_frame(self.request, ERROR, str(e).encode("utf-8"))
+        finally:
+            with server.active_lock:
+                server.active -= 1
+
+
+class InferenceServer(socketserver.ThreadingTCPServer):
+    """
+    TCP server that transcribes audio with a local recognizer.
+
+    Every connection gets its own thread; the recognizer serializes the
+    actual inference.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, recognizer, host="127.0.0.1", port=DEFAULT_PORT):
+        """
+        Initialize the server.
+
+        Args:
+            recognizer: Object with a transcribe(audio) method and a
+                sampling_rate attribute (normally a SpeechRecognizer)
+            host: Interface to listen on
+            port: TCP port (0 picks a free port, see address)
+        """
+        self.recognizer = recognizer
+        self.active = 0
+        self.active_lock = threading.Lock()
+        super().__init__((host, port), _WorkerHandler)
+
+    @property
+    def address(self):
+        """(host, port) the server is listening on"""
+        return self.server_address[:2]
+
+
+def is_loopback(host):
+    """Whether a listen address only accepts connections from this machine"""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        # A host name: it is local only if every address it resolves to is
+        try:
+            addresses = {info[4][0] for info in socket.getaddrinfo(host, None)}
+        except OSError:
+            return False
+        return bool(addresses) and all(ipaddress.ip_address(address.split("%")[0]).is_loopback
+                                       for address in addresses)
+
+
+def main(argv=None):
+    """Run a worker until interrupted"""
+    parser = argparse.ArgumentParser(
+        prog="speech2clipboard-worker",
+        description="Serve speech recognition to speech2clipboard clients over TCP."
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on (default: 127.0.0.1)")
+    parser.add_argument("--allow-remote", action="store_true",
+                        help="allow a --host other than localhost; the worker has no authentication")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"TCP port (default: {DEFAULT_PORT})")
+    parser.add_argument("--model", help="speech model ID or local path (default: the built-in Hungarian model)")
+    args = parser.parse_args(argv)
+    if not args.allow_remote and not is_loopback(args.host):
+        parser.error(f"--host {args.host} accepts connections from other machines; "
+                     "add --allow-remote to listen there (the worker has no authentication)")
+
+    from src.speech_recognition import SpeechRecognizer
+    recognizer = SpeechRecognizer(args.model) if args.model else SpeechRecognizer()
+
+    with InferenceServer(recognizer, args.host, args.port) as server:
+        host, port = server.address
+        print(f"Inference worker listening on {host}:{port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
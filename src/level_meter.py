@@ -0,0 +1,107 @@
+import numpy as np
+
+
+class LevelMeter:
+    """
+    Decimated level buffer shared between the audio callback and the UI.
+
+    The audio callback pushes raw blocks, which are reduced to fixed-size
+    columns (min, max and RMS of `decimation` samples) and written into a
+    preallocated ring. The UI thread reads the most recent columns without
+    taking a lock: there is a single writer, and the write counter is only
+    published after the column data has been stored.
+    """
+
+    def __init__(self, sample_rate=16000, decimation=160, capacity=8192):
+        """
+        Initialize the level meter.
+
+        Args:
+            sample_rate: Sampling rate of the pushed audio in Hz
+            decimation: Number of samples reduced into one envelope column
+                (160 samples = 10 ms at 16 kHz)
+            capacity: Number of envelope columns kept in the ring
+        """
+        self.sample_rate = sample_rate
+        self.decimation = decimation
+        self.capacity = capacity
+
+        self._mins = np.zeros(capacity, dtype=np.float32)
+        self._maxs = np.zeros(capacity, dtype=np.float32)
+        self._rms = np.zeros(capacity, dtype=np.float32)
+        self._carry = np.zeros(0, dtype=np.float32)
+        self._written = 0
+
+        # (rms, peak) of the most recent block, replaced as a single tuple
+        self.level = (0.0, 0.0)
+
+    def reset(self):
+        """Forget all buffered levels (call before a new recording)"""
+        self._carry = np.zeros(0, dtype=np.float32)
+        self._written = 0
+        self.level = (0.0, 0.0)
+
+    def push(self, block):
+        """
+        Add a block of audio samples. Only the audio thread may call this.
+
+        Args:
+            block: Numpy array of shape (frames,) or (frames, channels)
+        """
+        samples = np.asarray(block, dtype=np.float32)
+        if samples.ndim > 1:
+            # Mix down to mono for display purposes
+            samples = samples.mean(axis=1)
+        if len(samples) == 0:
+            return
+
+        self.level = (
+            float(np.sqrt(np.mean(samples * samples))),
+            float(np.max(np.abs(samples))),
+        )
+
+        if len(self._carry) > 0:
+            samples = np.concatenate((self._carry, samples))
+
+        count = len(samples) // self.decimation
+        used = count * self.decimation
+        self._carry = samples[used:].copy()
+        if count == 0:
+            return
+
+        frames = samples[:used].reshape(count, self.decimation)
+        # Only the newest `capacity` columns can survive in the ring
+        if count > self.capacity:
+            frames = frames[-self.capacity:]
+            skipped = count - self.capacity
+        else:
+            skipped = 0
+
+        start = self._written + skipped
+        index = np.arange(start, start + len(frames)) % self.capacity
+        self._mins[index] = frames.min(axis=1)
+        self._maxs[index] = frames.max(axis=1)
+        self._rms[index] = np.sqrt(np.mean(frames * frames, axis=1))
+
+        # Publish the new columns only after they have been written
+        self._written = self._written + count
+
+    def columns_written(self):
+        """Total number of envelope columns pushed since the last reset"""
+        return self._written
+
+    def snapshot(self, count):
+        """
+        Copy the newest envelope columns. Safe to call from the UI thread.
+
+        Args:
+            count: Number of columns requested; capped at half the ring so
+                the writer cannot overwrite columns while they are copied
+
+        Returns:
+            tuple: (mins, maxs, rms) arrays, oldest column first
+        """
+        written = self._written
+        count = max(0, min(count, written, self.capacity // 2))
+        index = np.arange(written - count, written) % self.capacity
+        return self._mins[index], self._maxs[index], self._rms[index]
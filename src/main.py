@@ -4,38 +4,143 @@ import sys
 import os
 import threading
 import numpy as np
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import QThread, pyqtSignal, pyqtSlot, Qt, QObject
+from PyQt5.QtWidgets import QApplication, QMessageBox
+from PyQt5.QtCore import QThread, QTimer, pyqtSignal, pyqtSlot, Qt, QObject
 
 # Import custom modules
 from src.speech_recognition import SpeechRecognizer
 from src.audio_recorder import AudioRecorder
 from src.clipboard_manager import ClipboardManager
+from src.clipboard_history import ClipboardHistory, BackgroundWriter, DEFAULT_HISTORY_FILE
+from src.noise_suppression import SpectralGate
+from src.audio_archive import AudioArchive
+from src.audio_spool import find_unfinished, read_spool
+from src.resource_monitor import MemoryPressureMonitor
+from src.text_normalization import TextNormalizer
+from src.vocabulary import Vocabulary, DEFAULT_VOCABULARY_FILE
+from src.continuous_dictation import ContinuousDictation, EndpointDetector, KeywordSpotter
+from src.inference_executor import ThreadExecutor, ProcessExecutor, RemoteExecutor, parse_nodes
+from src.profiling import CycleProfiler, NULL_CYCLE, DEFAULT_PROFILE_DIR
 from src.ui.main_window import MainWindow
 
+# Where in-progress recordings are spooled (set SPOOL_DIR= to disable)
+DEFAULT_SPOOL_DIR = "~/.cache/speech2clipboard/spool"
+
+# Where torch.compile kernels are cached between runs
+DEFAULT_COMPILE_CACHE_DIR = "~/.cache/speech2clipboard/compiled"
+
+# Unload the model after this many idle minutes (set IDLE_UNLOAD_MINUTES=0 to disable)
+DEFAULT_IDLE_UNLOAD_MINUTES = 15
+
+def _env_float(name):
+    """Read an optional numeric setting from the environment"""
+    value = os.environ.get(name)
+    try:
+        return float(value) if value else None
+    except ValueError:
+        print(f"Ignoring invalid {name}={value!r}")
+        return None
+
+
+def recognizer_options(model_name=None, channel_labels=None):
+    """
+    SpeechRecognizer arguments from the environment.
+    
+    Args:
+        model_name: Model ID or local path (None for the default model)
+        channel_labels: Speaker names for multi-channel recordings
+        
+    Returns:
+        dict: Keyword arguments for SpeechRecognizer
+    """
+    options = {"channel_labels": channel_labels}
+    backend = os.environ.get("COMPILE_BACKEND", "").lower()
+    if backend and backend != "none":
+        options["compile_backend"] = backend
+        options["compile_cache_dir"] = os.path.expanduser(
+            os.environ.get("COMPILE_CACHE_DIR", DEFAULT_COMPILE_CACHE_DIR)
+        )
+        options["compile_warmup"] = os.environ.get("COMPILE_WARMUP", "false").lower() == "true"
+    idle_minutes = _env_float("IDLE_UNLOAD_MINUTES")
+    if idle_minutes is None:
+        idle_minutes = DEFAULT_IDLE_UNLOAD_MINUTES
+    if idle_minutes > 0:
+        options["idle_timeout"] = idle_minutes * 60
+    if os.environ.get("MEMORY_PRESSURE_UNLOAD", "true").lower() == "true":
+        options["memory_monitor"] = MemoryPressureMonitor()
+    if model_name:
+        options["model_name"] = model_name
+    return options
+
+
+class ModelLoadThread(QThread):
+    """Thread for loading the speech model after the window is shown"""
+    
+    # Signals carrying the loaded SpeechRecognizer or the error message
+    model_ready = pyqtSignal(object)
+    model_failed = pyqtSignal(str)
+    
+    def __init__(self, model_name=None, channel_labels=None):
+        """
+        Initialize the model loading thread.
+        
+        Args:
+            model_name: Model ID or local path (None for the default model)
+            channel_labels: Speaker names for multi-channel recordings
+        """
+        super().__init__()
+        self.model_name = model_name
+        self.channel_labels = channel_labels
+    
+    def run(self):
+        """Load the model (this is where torch and transformers get imported)"""
+        try:
+            options = recognizer_options(self.model_name, self.channel_labels)
+            self.model_ready.emit(SpeechRecognizer(**options))
+        except Exception as e:
+            print(f"Error loading speech model: {e}")
+            self.model_failed.emit(str(e))
+
+
 class SpeechProcessThread(QThread):
     """Thread for processing speech in the background"""
     
     # Signal to send transcription back to the main thread
     transcription_ready = pyqtSignal(str)
     
-    def __init__(self, audio_data, recognizer):
+    def __init__(self, audio_data, executor, spool_path=None, postprocessors=(), profile_cycle=NULL_CYCLE):
         """
         Initialize the speech processing thread.
         
         Args:
             audio_data: Audio data as numpy array
-            recognizer: SpeechRecognizer instance
+            executor: Inference executor (thread, process pool or remote)
+            spool_path: Spool file holding the audio, deleted once transcribed
+            postprocessors: Objects whose process(text) method is applied
+                to the transcription in order (e.g. TextNormalizer)
+            profile_cycle: ProfiledCycle the transcription is part of
         """
         super().__init__()
         self.audio_data = audio_data
-        self.recognizer = recognizer
+        self.executor = executor
+        self.spool_path = spool_path
+        self.postprocessors = postprocessors
+        self.profile_cycle = profile_cycle
     
     def run(self):
         """Process the audio data and emit the result"""
         try:
             # Transcribe the audio
-            transcription = self.recognizer.transcribe(self.audio_data)
+            with self.profile_cycle.stage("transcribe", torch_trace=True):
+                transcription = self.executor.transcribe(self.audio_data)
+            
+            # Clean up the text; a failing stage leaves it as it was
+            with self.profile_cycle.stage("postprocess"):
+                for postprocessor in self.postprocessors:
+                    try:
+                        transcription = postprocessor.process(transcription)
+                    except Exception as e:
+                        print(f"Error in {type(postprocessor).__name__}: {e}")
             
             # Emit the transcription signal
             self.transcription_ready.emit(transcription)
@@ -47,9 +152,35 @@ class SpeechProcessThread(QThread):
 class SpeechToClipboardApp(QObject):
     """Main application class"""
     
-    def __init__(self):
-        """Initialize the application"""
+    # Result of a queued clipboard write, emitted from the writer thread
+    clipboard_written = pyqtSignal(bool)
+    
+    # Continuous dictation events, emitted from the recording thread
+    utterance_detected = pyqtSignal(object)
+    wake_word_detected = pyqtSignal()
+    
+    # Path of a saved profile bundle, emitted from the profile writer
+    profile_saved = pyqtSignal(str)
+    
+    # Length of the background noise sample taken by "Calibrate Noise"
+    CALIBRATION_MS = 1500
+    
+    # How often the idle and memory pressure policy is checked
+    IDLE_CHECK_MS = 30000
+    
+    # How long a profile bundle waits for the copy it should include
+    PROFILE_COPY_TIMEOUT = 5.0
+    
+    def __init__(self, model_name=None):
+        """
+        Initialize the application.
+        
+        Args:
+            model_name: Speech model ID or local path (default: SPEECH_MODEL
+                environment variable, then the built-in Hungarian model)
+        """
         super().__init__() # Call QObject initializer
+        self.model_name = model_name or os.environ.get("SPEECH_MODEL")
         # Create Qt application
         self.app = QApplication(sys.argv)
         
@@ -59,22 +190,115 @@ class SpeechToClipboardApp(QObject):
         # Connect signals
         self.connect_signals()
         
-        # Show the main window
+        # Show the main window; the model is loaded once it has been painted
         self.window.show()
     
     def setup_components(self):
         """Initialize the application components"""
-        # Create the speech recognizer
-        self.recognizer = SpeechRecognizer()
+        # The speech recognizer is created by ModelLoadThread; with the
+        # process and remote executors the GUI process has no model at all
+        self.recognizer = None
+        self.model_thread = None
+        self.executor = None
+        self.executor_type = os.environ.get("INFERENCE_EXECUTOR", "thread").lower()
+        self.channel_labels = [
+            label.strip() for label in os.environ.get("CHANNEL_LABELS", "").split(",") if label.strip()
+        ]
+        
+        # Create the optional noise suppression stage
+        self.noise_suppressor = None
+        if os.environ.get("NOISE_SUPPRESSION", "false").lower() == "true":
+            self.noise_suppressor = SpectralGate(sample_rate=16000)
+        
+        # Create the optional compressed archive of recordings
+        self.archive = None
+        archive_dir = os.environ.get("ARCHIVE_DIR")
+        if archive_dir:
+            try:
+                self.archive = AudioArchive(
+                    os.path.expanduser(archive_dir),
+                    format=os.environ.get("ARCHIVE_FORMAT", "flac"),
+                    max_age_days=_env_float("ARCHIVE_MAX_DAYS"),
+                    max_total_mb=_env_float("ARCHIVE_MAX_MB"),
+                )
+            except Exception as e:
+                print(f"Audio archive disabled: {e}")
+        
+        # Text clean-up between the recognizer and the clipboard: the user's
+        # vocabulary and spoken commands first, then normalization
+        self.postprocessors = [
+            Vocabulary(
+                os.path.expanduser(os.environ.get("VOCABULARY_FILE", DEFAULT_VOCABULARY_FILE)) or None,
+                commands=os.environ.get("VOCABULARY_COMMANDS", "true").lower() == "true"
+            )
+        ]
+        if os.environ.get("TEXT_NORMALIZATION", "true").lower() == "true":
+            punctuation_model = os.environ.get("PUNCTUATION_MODEL")
+            self.postprocessors.append(
+                TextNormalizer(os.path.expanduser(punctuation_model) if punctuation_model else None)
+            )
+        
+        # Spool in-progress recordings to disk so a crash loses nothing
+        self.spool_dir = os.path.expanduser(os.environ.get("SPOOL_DIR", DEFAULT_SPOOL_DIR))
         
         # Create the audio recorder
-        self.recorder = AudioRecorder(sample_rate=16000, channels=1)
+        channels = int(_env_float("CHANNELS") or 1)
+        self.recorder = AudioRecorder(
+            sample_rate=16000, channels=channels,
+            noise_suppressor=self.noise_suppressor, archive=self.archive,
+            spool_dir=self.spool_dir or None
+        )
+        
+        # Processing threads still running, and recovered spools waiting for one
+        self.process_threads = []
+        self.recovery_queue = []
+        self.recovering_path = None
+        
+        # Recordings finished before the model was loaded
+        self.pending_audio = []
+        
+        # Continuous dictation: utterances are transcribed one at a time,
+        # in the order they were spoken
+        self.dictation = None
+        self.utterance_queue = []
+        self.utterance_thread = None
+        self.keyword_spotter = None
+        wake_word_dir = os.environ.get("WAKE_WORD_DIR")
+        if wake_word_dir:
+            try:
+                self.keyword_spotter = KeywordSpotter.from_directory(
+                    os.path.expanduser(wake_word_dir),
+                    threshold=_env_float("WAKE_WORD_THRESHOLD") or 0.3
+                )
+            except Exception as e:
+                print(f"Wake word disabled: {e}")
         
-        # Create the clipboard manager
+        # Create the clipboard manager; copies run on a background writer so
+        # the UI never waits for wl-copy/xclip
         self.clipboard = ClipboardManager()
+        self.clipboard_writer = BackgroundWriter()
+        history_file = os.environ.get("CLIPBOARD_HISTORY_FILE", DEFAULT_HISTORY_FILE)
+        self.clipboard_history = ClipboardHistory(
+            os.path.expanduser(history_file) if history_file else None,
+            capacity=int(_env_float("CLIPBOARD_HISTORY_SIZE") or 50)
+        )
+        
+        # Profiling of record -> transcribe -> copy cycles (Help menu or DEBUG)
+        self.profiler = CycleProfiler(
+            os.environ.get("PROFILE_DIR") or DEFAULT_PROFILE_DIR,
+            enabled=os.environ.get("DEBUG", "false").lower() == "true",
+            on_saved=self.profile_saved.emit
+        )
+        self.profile_cycle = NULL_CYCLE
+        # Bundles are saved on their own thread so they never delay a copy
+        self.profile_writer = BackgroundWriter(name="profile-writer")
         
         # Create the main window
         self.window = MainWindow()
+        
+        # Periodically unload an idle model (started once the model is loaded)
+        self.idle_timer = QTimer()
+        self.idle_timer.setInterval(self.IDLE_CHECK_MS)
     
     def connect_signals(self):
         """Connect the signals between components"""
@@ -82,53 +306,468 @@ class SpeechToClipboardApp(QObject):
         self.window.start_recording_signal.connect(self.start_recording)
         self.window.stop_recording_signal.connect(self.stop_recording)
         
-        # Connect clipboard button
-        self.window.clipboard_btn.clicked.connect(self.copy_to_clipboard)
+        # Copy requests from the window and the clipboard history
+        self.window.copy_requested_signal.connect(self.copy_to_clipboard)
+        self.window.history_selected_signal.connect(self.copy_from_history)
+        self.window.set_clipboard_history(self.clipboard_history)
+        self.clipboard_written.connect(self.handle_clipboard_written)
+        
+        # Load the model and look for crashed recordings after the first paint
+        self.window.first_paint_signal.connect(self.load_model)
+        self.window.first_paint_signal.connect(self.offer_unfinished_recordings)
+        
+        # Noise calibration
+        self.window.calibrate_noise_signal.connect(self.calibrate_noise)
+        
+        # Feed the level display from the recorder
+        self.window.set_level_source(self.recorder.level_meter)
+        
+        # Idle model unloading
+        self.idle_timer.timeout.connect(self.check_model_idle)
+        
+        # Continuous dictation
+        self.window.continuous_dictation_signal.connect(self.set_continuous_dictation)
+        self.utterance_detected.connect(self.handle_utterance)
+        self.wake_word_detected.connect(lambda: self.window.set_listening_status("Listening..."))
+        
+        # Profiling
+        self.window.profiling_signal.connect(self.set_profiling)
+        self.profile_saved.connect(self.handle_profile_saved)
+        self.window.set_profiling(self.profiler.enabled)
+    
+    @pyqtSlot()
+    def load_model(self):
+        """Start loading the speech model in the background"""
+        if self.executor is not None or self.model_thread is not None:
+            return
+        
+        if self.executor_type in ("process", "remote"):
+            try:
+                self.executor = self.create_executor()
+            except Exception as e:
+                print(f"Error starting {self.executor_type} inference: {e}")
+                self.window.status_bar.showMessage(f"Inference unavailable: {e}")
+                return
+            self.window.status_bar.showMessage(f"Using {self.executor_type} inference", 3000)
+            self.process_pending()
+            return
+        
+        self.window.status_bar.showMessage("Loading speech model...")
+        self.model_thread = ModelLoadThread(self.model_name, self.channel_labels)
+        self.model_thread.model_ready.connect(self.handle_model_ready)
+        self.model_thread.model_failed.connect(self.handle_model_failed)
+        self.model_thread.start()
+    
+    def handle_model_ready(self, recognizer):
+        """Start using the loaded model and process waiting recordings"""
+        self.recognizer = recognizer
+        self.executor = ThreadExecutor(recognizer)
+        self.window.status_bar.showMessage("Speech model loaded", 3000)
+        self.idle_timer.start()
+        self.process_pending()
+    
+    def create_executor(self):
+        """
+        Create the process pool or remote executor set in INFERENCE_EXECUTOR.
+        
+        Returns:
+            ProcessExecutor or RemoteExecutor
+        """
+        options = recognizer_options(self.model_name, self.channel_labels)
+        
+        if self.executor_type == "process":
+            return ProcessExecutor(options=options, workers=int(_env_float("INFERENCE_WORKERS") or 1))
+        
+        nodes = parse_nodes(os.environ.get("INFERENCE_NODES", ""))
+        if not nodes:
+            raise ValueError("INFERENCE_NODES is empty")
+        fallback = None
+        if os.environ.get("INFERENCE_FALLBACK", "true").lower() == "true":
+            # The local model is only loaded if every worker is down
+            fallback = ThreadExecutor(factory=lambda: SpeechRecognizer(**options))
+        return RemoteExecutor(
+            nodes, fallback=fallback,
+            timeout=_env_float("INFERENCE_TIMEOUT") or 120.0
+        )
+    
+    def process_pending(self):
+        """Transcribe the recordings that were waiting for the model"""
+        pending, self.pending_audio = self.pending_audio, []
+        for audio_data, spool_path, cycle in pending:
+            self.start_processing(audio_data, spool_path, cycle)
+        self._process_next_utterance()
+    
+    def handle_model_failed(self, message):
+        """Report a model that could not be loaded"""
+        self.model_thread = None
+        self.window.recording_status.setText("Ready")
+        self.window.status_bar.showMessage(f"Failed to load speech model: {message}")
     
     @pyqtSlot()
     def start_recording(self):
         """Start recording audio"""
-        self.recorder.start_recording()
+        self.profile_cycle = self.profiler.begin_cycle()
+        self.recorder.start_recording(profile_cycle=self.profile_cycle)
+        
+        # Reload an unloaded model while the user is still speaking
+        if self.recognizer is not None:
+            self.recognizer.prefetch()
+    
+    def check_model_idle(self):
+        """Unload the model when it is idle or the system is short on memory"""
+        # A recording in progress is about to need the model; continuous
+        # listening does not count until speech is detected
+        if self.recognizer is None or self.process_threads:
+            return
+        if self.recorder.is_recording() and (self.dictation is None or self.dictation.detector.in_speech):
+            return
+        
+        reason = self.recognizer.release_if_idle()
+        if reason:
+            self.window.status_bar.showMessage(f"Speech model unloaded ({reason})", 5000)
     
     @pyqtSlot()
     def stop_recording(self):
         """Stop recording and process the audio"""
         # Stop the recording
-        audio_data = self.recorder.stop_recording()
+        cycle, self.profile_cycle = self.profile_cycle, NULL_CYCLE
+        with cycle.stage("stop recording"):
+            audio_data = self.recorder.stop_recording()
         
         if len(audio_data) > 0:
-            # Create and start a thread for processing
-            self.process_thread = SpeechProcessThread(audio_data, self.recognizer)
-            self.process_thread.transcription_ready.connect(self.handle_transcription)
-            self.process_thread.start()
+            self.start_processing(audio_data, self.recorder.last_spool_path, cycle)
+        elif self.recorder.spool_error:
+            self.window.status_bar.showMessage(
+                "The recording could not be read back; it will be offered for recovery at the next start"
+            )
+            self.window.recording_status.setText("Ready")
         else:
+            self.recorder.discard_spool()
             self.window.status_bar.showMessage("No audio recorded", 3000)
             self.window.recording_status.setText("Ready")
     
+    def start_processing(self, audio_data, spool_path=None, cycle=NULL_CYCLE):
+        """
+        Transcribe audio in a background thread.
+        
+        Args:
+            audio_data: Audio data as numpy array
+            spool_path: Spool file to delete once the transcription arrives
+            cycle: ProfiledCycle of the recording, if it is profiled
+        """
+        if self.executor is None:
+            # Picked up by process_pending(); the audio is safe in the spool
+            self.pending_audio.append((audio_data, spool_path, cycle))
+            self.window.status_bar.showMessage("Waiting for the speech model to load...")
+            return
+        
+        if cycle.active:
+            cycle.describe(**self.inference_description(audio_data))
+        
+        thread = SpeechProcessThread(audio_data, self.executor, spool_path, self.postprocessors, cycle)
+        thread.transcription_ready.connect(
+            lambda text, path=spool_path: self.handle_processed(text, path, cycle)
+        )
+        thread.finished.connect(lambda: self.process_threads.remove(thread))
+        self.process_threads.append(thread)
+        thread.start()
+    
+    def inference_description(self, audio_data):
+        """
+        What a profiled transcription runs on, for the profile report.
+        
+        Args:
+            audio_data: Audio about to be transcribed
+            
+        Returns:
+            dict: Executor, model, backend, device and input length
+        """
+        description = {
+            "executor": self.executor.name,
+            "input_samples": len(audio_data),
+            "input_seconds": len(audio_data) / self.recorder.sample_rate,
+            "channels": audio_data.shape[1] if audio_data.ndim > 1 else 1,
+        }
+        if self.recognizer is not None:
+            description["model"] = self.recognizer.model_name
+            description["device"] = self.recognizer.device
+            engine = self.recognizer.engine
+            description["backend"] = engine.backend if engine is not None else "eager"
+        else:
+            # The model runs in worker processes or on remote nodes
+            description["model"] = self.model_name or "default"
+            description["backend"] = os.environ.get("COMPILE_BACKEND") or "eager"
+        return description
+    
+    def handle_processed(self, text, spool_path, cycle=NULL_CYCLE):
+        """Deliver a transcription and clean up its spool"""
+        # Keep the spool when nothing came back so the audio can be retried
+        if text and spool_path:
+            self.recorder.discard_spool(spool_path)
+        
+        self.handle_transcription(text, cycle)
+        
+        if spool_path and spool_path == self.recovering_path:
+            self.recovering_path = None
+            if self.recovery_queue:
+                self._process_next_recovered()
+    
+    def offer_unfinished_recordings(self):
+        """Offer to transcribe recordings spooled before a crash"""
+        spools = find_unfinished(self.spool_dir)
+        if not spools:
+            return
+        
+        total = int(sum(info["duration"] for info in spools))
+        answer = QMessageBox.question(
+            self.window,
+            "Unfinished recordings",
+            f"Found {len(spools)} recording(s) ({total // 60:02d}:{total % 60:02d}) "
+            "that were not transcribed.\n\nTranscribe them now?",
+            QMessageBox.Yes | QMessageBox.No | QMessageBox.Discard,
+            QMessageBox.Yes
+        )
+        if answer == QMessageBox.Yes:
+            self.recovery_queue = [info["path"] for info in spools]
+            self._process_next_recovered()
+        elif answer == QMessageBox.Discard:
+            for info in spools:
+                self.recorder.discard_spool(info["path"])
+    
+    def _process_next_recovered(self):
+        """Start transcribing the next recovered spool"""
+        path = self.recovery_queue.pop(0)
+        try:
+            audio_data, _ = read_spool(path)
+        except Exception as e:
+            print(f"Error reading spool {path}: {e}")
+            if self.recovery_queue:
+                self._process_next_recovered()
+            return
+        
+        self.window.recording_status.setText("Processing...")
+        self.window.status_bar.showMessage("Transcribing recovered recording...")
+        self.recovering_path = path
+        self.start_processing(audio_data, path)
+    
+    @pyqtSlot(bool)
+    def set_continuous_dictation(self, enabled):
+        """
+        Start or stop continuous dictation.
+        
+        Args:
+            enabled: Whether to listen continuously
+        """
+        if enabled:
+            if self.recorder.is_recording():
+                return
+            detector = EndpointDetector(
+                sample_rate=self.recorder.sample_rate,
+                margin_db=_env_float("CONTINUOUS_MARGIN_DB") or 10.0,
+                end_ms=_env_float("CONTINUOUS_END_SILENCE_MS") or 700,
+                max_utterance_s=_env_float("CONTINUOUS_MAX_UTTERANCE_S") or 30.0
+            )
+            self.dictation = ContinuousDictation(
+                self.utterance_detected.emit,
+                detector=detector,
+                spotter=self.keyword_spotter,
+                wake_timeout=_env_float("WAKE_WORD_TIMEOUT") or 10.0,
+                on_speech_start=self._prefetch_model,
+                on_wake=self.wake_word_detected.emit
+            )
+            self.recorder.start_recording(stream_to=self.dictation.push_block)
+            if self.keyword_spotter is not None:
+                self.window.set_listening_status("Say the wake word...")
+            return
+        
+        if self.dictation is None:
+            return
+        self.recorder.stop_recording()
+        self.dictation.flush()
+        self.dictation = None
+    
+    def _prefetch_model(self):
+        """Reload an unloaded model as soon as speech starts"""
+        if self.recognizer is not None:
+            self.recognizer.prefetch()
+    
+    @pyqtSlot(object)
+    def handle_utterance(self, audio_data):
+        """Queue an utterance detected in continuous dictation"""
+        self.utterance_queue.append(audio_data)
+        self._process_next_utterance()
+    
+    def _process_next_utterance(self):
+        """Transcribe the oldest queued utterance unless one is in progress"""
+        if self.utterance_thread is not None or not self.utterance_queue:
+            return
+        if self.executor is None:
+            self.window.status_bar.showMessage("Waiting for the speech model to load...")
+            return
+        
+        audio_data = self.utterance_queue.pop(0)
+        self.window.set_listening_status("Transcribing...")
+        thread = SpeechProcessThread(audio_data, self.executor, postprocessors=self.postprocessors)
+        thread.transcription_ready.connect(self.handle_utterance_text)
+        thread.finished.connect(lambda: self.process_threads.remove(thread))
+        self.process_threads.append(thread)
+        self.utterance_thread = thread
+        thread.start()
+    
     @pyqtSlot(str)
-    def handle_transcription(self, text):
+    def handle_utterance_text(self, text):
+        """Deliver the transcription of an utterance and start the next one"""
+        self.utterance_thread = None
+        if text:
+            self.window.append_transcription(text)
+            self.copy_to_clipboard(text)
+        
+        if self.dictation is not None and not self.dictation.awake:
+            self.window.set_listening_status("Say the wake word...")
+        else:
+            self.window.set_listening_status("Listening...")
+        self._process_next_utterance()
+    
+    @pyqtSlot()
+    def calibrate_noise(self):
+        """Record a short sample of background noise for the noise suppressor"""
+        if self.noise_suppressor is None:
+            self.window.status_bar.showMessage(
+                "Noise suppression is disabled (set NOISE_SUPPRESSION=true)", 3000
+            )
+            return
+        if self.recorder.is_recording():
+            return
+        
+        # The calibration uses the recorder, so recording waits for it
+        self.window.set_calibrating(True)
+        self.window.status_bar.showMessage("Calibrating noise profile, please stay quiet...")
+        self.recorder.start_recording(calibrate=True)
+        QTimer.singleShot(self.CALIBRATION_MS, self._finish_calibration)
+    
+    def _finish_calibration(self):
+        """Stop the calibration recording and report the result"""
+        self.recorder.stop_recording()
+        self.window.set_calibrating(False)
+        if self.noise_suppressor.calibrated:
+            self.window.status_bar.showMessage("Noise profile calibrated", 3000)
+        else:
+            self.window.status_bar.showMessage("Noise calibration failed", 3000)
+    
+    @pyqtSlot(str)
+    def handle_transcription(self, text, cycle=NULL_CYCLE):
         """Handle the transcription result"""
         # Update the UI
         self.window.set_transcription(text)
         
         # Automatically copy to clipboard if there's text
         if text:
-            self.copy_to_clipboard()
+            self.copy_to_clipboard(text, cycle)
+        else:
+            self.finish_profile(cycle, text)
+
+    @pyqtSlot(str)
+    def copy_to_clipboard(self, text, cycle=NULL_CYCLE):
+        """
+        Queue a copy to the clipboard and record it in the history.
+        
+        The copy itself runs on the background writer; a newer copy
+        replaces one that has not been written yet.
+        
+        Args:
+            text: Text to copy
+            cycle: ProfiledCycle finished by the copy, if it is profiled
+        """
+        if not text:
+            return
+        
+        clipboard = self.clipboard
+        written = self.clipboard_written
+        copied = threading.Event() if cycle.active else None
+        
+        def write():
+            try:
+                with cycle.stage("copy"):
+                    success = clipboard.copy_to_clipboard(text)
+                written.emit(success)
+            finally:
+                if copied is not None:
+                    copied.set()
+        
+        self.clipboard_writer.submit("clipboard", write)
+        self.finish_profile(cycle, text, copied)
+        
+        if self.clipboard_history.add(text):
+            self.clipboard_writer.submit("history", self.clipboard_history.save)
     
-    def copy_to_clipboard(self):
-        """Copy the transcription to clipboard"""
-        text = self.window.get_transcription()
-        if text:
-            success = self.clipboard.copy_to_clipboard(text)
-            if success:
-                self.window.status_bar.showMessage("Copied to clipboard!", 3000)
-            else:
-                self.window.status_bar.showMessage("Failed to copy to clipboard", 3000)
+    @pyqtSlot(str)
+    def copy_from_history(self, text):
+        """Copy an entry picked from the clipboard history"""
+        self.copy_to_clipboard(text)
     
+    @pyqtSlot(bool)
+    def set_profiling(self, enabled):
+        """
+        Turn profiling of record -> transcribe -> copy cycles on or off.
+        
+        Args:
+            enabled: Whether to profile the following recordings
+        """
+        self.profiler.enabled = enabled
+        if enabled:
+            self.window.status_bar.showMessage(
+                f"Profiling recordings; reports are saved to {self.profiler.directory}", 5000
+            )
+    
+    def finish_profile(self, cycle, text, copied=None):
+        """
+        Save the bundle of a profiled cycle once its copy has run.
+        
+        The bundle is written on the profile writer, not the clipboard
+        writer, so saving it does not delay the next copy. If a newer copy
+        replaced this one before it ran, the bundle is saved without the
+        copy stage after PROFILE_COPY_TIMEOUT.
+        
+        Args:
+            cycle: ProfiledCycle (nothing happens for NULL_CYCLE)
+            text: The transcription delivered by the cycle
+            copied: Event set when the cycle's copy has run (None if
+                there is nothing to copy)
+        """
+        if not cycle.active:
+            return
+        timeout = self.PROFILE_COPY_TIMEOUT
+        
+        def save():
+            if copied is not None:
+                copied.wait(timeout)
+            cycle.finish(text_length=len(text))
+        
+        self.profile_writer.submit(("profile", id(cycle)), save)
+    
+    @pyqtSlot(str)
+    def handle_profile_saved(self, path):
+        """Tell the user where a profile bundle was saved"""
+        self.window.status_bar.showMessage(f"Profile saved to {path}", 10000)
+    
+    @pyqtSlot(bool)
+    def handle_clipboard_written(self, success):
+        """Report the result of a queued clipboard write"""
+        if success:
+            self.window.status_bar.showMessage("Copied to clipboard!", 3000)
+        else:
+            self.window.status_bar.showMessage("Failed to copy to clipboard", 3000)
+        
     def run(self):
         """Run the application"""
         # Exit when the application is closed
-        return self.app.exec_()
+        result = self.app.exec_()
+        if self.executor is not None:
+            self.executor.close()
+        # Finish the queued clipboard and history writes and profile bundles
+        self.clipboard_writer.close()
+        self.profile_writer.close()
+        return result
 
 
 if __name__ == "__main__":
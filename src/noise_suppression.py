@@ -0,0 +1,216 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class SpectralGate:
+    """
+    Streaming STFT noise gate.
+
+    Audio is cut into 50% overlapping frames with a square-root Hann window,
+    every frequency bin below a per-bin noise threshold is attenuated, and
+    the frames are overlap-added back. All frames that are complete after a
+    block arrives are processed together, so the per-block cost is a handful
+    of vectorized NumPy calls regardless of the block size.
+
+    The noise profile (mean and standard deviation of the magnitude of every
+    bin) is learned from the first `profile_ms` of each stream, unless it has
+    been fixed with calibrate().
+    """
+
+    def __init__(self, sample_rate=16000, frame_size=512, profile_ms=300,
+                 threshold_std=1.5, reduction_db=18.0):
+        """
+        Initialize the noise gate.
+
+        Args:
+            sample_rate: Sampling rate in Hz
+            frame_size: STFT frame length in samples (must be even)
+            profile_ms: Length of the stream prefix used to learn the noise
+            threshold_std: Gate opens this many standard deviations above
+                the mean noise magnitude of a bin
+            reduction_db: Attenuation applied to gated bins
+        """
+        if frame_size % 2:
+            raise ValueError("frame_size must be even")
+
+        self.sample_rate = sample_rate
+        self.frame_size = frame_size
+        self.hop = frame_size // 2
+        self.profile_frames = max(1, int(profile_ms * sample_rate / 1000) // self.hop)
+        self.threshold_std = threshold_std
+        self.floor_gain = 10 ** (-reduction_db / 20)
+
+        # Periodic sqrt-Hann: analysis * synthesis windows sum to 1 at 50% overlap
+        n = np.arange(frame_size)
+        self.window = np.sqrt(0.5 - 0.5 * np.cos(2 * np.pi * n / frame_size)).astype(np.float32)
+
+        self.calibrated = False
+        self.threshold = None
+        self.reset_stream()
+
+    def reset_stream(self, channels=None):
+        """
+        Prepare for a new stream. Forgets the learned noise profile unless
+        it was set with calibrate().
+
+        Args:
+            channels: Number of channels, or None to take it from the first block
+        """
+        self.channels = channels
+        self._input = None
+        self._overlap = None
+        self._skip = self.hop
+        self._samples_in = 0
+        self._samples_out = 0
+        if not self.calibrated:
+            self.threshold = None
+            self._noise_sum = 0.0
+            self._noise_sq_sum = 0.0
+            self._noise_frames = 0
+
+    def calibrate(self, noise_audio):
+        """
+        Fix the noise profile from a recording of background noise only.
+
+        Args:
+            noise_audio: Numpy array of shape (samples,) or (samples, channels)
+        """
+        audio = self._as_2d(noise_audio)
+        if len(audio) < self.frame_size:
+            raise ValueError("Calibration audio is shorter than one frame")
+
+        frames = sliding_window_view(audio, self.frame_size, axis=0)[::self.hop]
+        magnitude = np.abs(np.fft.rfft(frames * self.window, axis=-1))
+        self.threshold = self._threshold_from(
+            magnitude.sum(axis=0), (magnitude ** 2).sum(axis=0), len(magnitude)
+        )
+        self.calibrated = True
+        self.reset_stream(audio.shape[1])
+
+    def clear_calibration(self):
+        """Go back to learning the noise profile from each stream"""
+        self.calibrated = False
+        self.reset_stream(self.channels)
+
+    def process_block(self, block):
+        """
+        Gate a block of a stream. Output lags the input by half a frame;
+        call flush() at the end of the stream to get the remainder.
+
+        Args:
+            block: Numpy array of shape (samples,) or (samples, channels)
+
+        Returns:
+            numpy.ndarray: Gated samples, same number of dimensions as block
+        """
+        squeeze = np.ndim(block) == 1
+        audio = self._as_2d(block)
+        self._samples_in += len(audio)
+        output = self._process(audio)
+        return output[:, 0] if squeeze else output
+
+    def flush(self, squeeze=False):
+        """
+        Return the samples still buffered at the end of a stream.
+
+        Args:
+            squeeze: Return a 1-D array for mono streams
+
+        Returns:
+            numpy.ndarray: Remaining gated samples
+        """
+        if self._input is None:
+            return np.zeros((0,) if squeeze else (0, 1), dtype=np.float32)
+
+        padding = np.zeros((self.frame_size, self._input.shape[1]), dtype=np.float32)
+        output = self._process(padding)
+        output = output[:max(0, self._samples_in - self._samples_out + len(output))]
+        self._samples_out = self._samples_in
+        return output[:, 0] if squeeze and output.shape[1] == 1 else output
+
+    def process(self, audio):
+        """
+        Gate a complete recording.
+
+        Args:
+            audio: Numpy array of shape (samples,) or (samples, channels)
+
+        Returns:
+            numpy.ndarray: Gated audio with the same shape as the input
+        """
+        squeeze = np.ndim(audio) == 1
+        self.reset_stream()
+        head = self.process_block(audio)
+        tail = self.flush(squeeze=squeeze)
+        return np.concatenate((head, tail))
+
+    def _as_2d(self, audio):
+        """View audio as float32 (samples, channels)"""
+        audio = np.asarray(audio, dtype=np.float32)
+        return audio.reshape(-1, 1) if audio.ndim == 1 else audio
+
+    def _threshold_from(self, total, sq_total, count):
+        """Per-channel, per-bin gate threshold from magnitude statistics"""
+        mean = total / count
+        std = np.sqrt(np.maximum(sq_total / count - mean ** 2, 0.0))
+        return mean + self.threshold_std * std
+
+    def _process(self, audio):
+        """Run all complete frames through the gate and overlap-add them"""
+        if self._input is None:
+            self.channels = audio.shape[1]
+            # Half a frame of silence so the first output samples are fully windowed
+            self._input = np.zeros((self.hop, self.channels), dtype=np.float32)
+            self._overlap = np.zeros((self.hop, self.channels), dtype=np.float32)
+
+        buffer = np.concatenate((self._input, audio))
+        count = (len(buffer) - self.frame_size) // self.hop + 1
+        if count <= 0:
+            self._input = buffer
+            return np.zeros((0, self.channels), dtype=np.float32)
+
+        # (frames, channels, frame_size)
+        frames = sliding_window_view(buffer, self.frame_size, axis=0)[::self.hop][:count]
+        spectrum = np.fft.rfft(frames * self.window, axis=-1)
+        magnitude = np.abs(spectrum)
+
+        gain = np.ones(magnitude.shape, dtype=np.float32)
+        learning = 0
+        if self.threshold is None:
+            learning = min(count, self.profile_frames - self._noise_frames)
+            self._noise_sum = self._noise_sum + magnitude[:learning].sum(axis=0)
+            self._noise_sq_sum = self._noise_sq_sum + (magnitude[:learning] ** 2).sum(axis=0)
+            self._noise_frames += learning
+            if self._noise_frames >= self.profile_frames:
+                self.threshold = self._threshold_from(
+                    self._noise_sum, self._noise_sq_sum, self._noise_frames
+                )
+
+        if self.threshold is not None and learning < count:
+            open_bins = magnitude[learning:] > self.threshold
+            mask = np.where(open_bins, 1.0, self.floor_gain)
+            # Smooth across neighbouring bins to avoid musical noise
+            mask[..., 1:-1] = 0.25 * mask[..., :-2] + 0.5 * mask[..., 1:-1] + 0.25 * mask[..., 2:]
+            gain[learning:] = mask
+
+        frames_out = np.fft.irfft(spectrum * gain, n=self.frame_size, axis=-1) * self.window
+        frames_out = frames_out.astype(np.float32)
+
+        # Overlap-add: each hop is the first half of one frame plus the
+        # second half of the previous one
+        first = frames_out[..., :self.hop]
+        second = frames_out[..., self.hop:]
+        hops = first.copy()
+        hops[0] += self._overlap.T
+        hops[1:] += second[:-1]
+        self._overlap = second[-1].T.copy()
+        self._input = buffer[count * self.hop:]
+
+        # (frames, channels, hop) -> (samples, channels)
+        output = hops.transpose(0, 2, 1).reshape(-1, self.channels)
+        if self._skip:
+            skipped = min(self._skip, len(output))
+            output = output[skipped:]
+            self._skip -= skipped
+        self._samples_out += len(output)
+        return output
@@ -0,0 +1,300 @@
+import os
+import io
+import sys
+import json
+import time
+import pstats
+import cProfile
+import platform
+import threading
+import functools
+import contextlib
+
+# Where profile bundles are saved unless PROFILE_DIR says otherwise
+DEFAULT_PROFILE_DIR = "~/.cache/speech2clipboard/profiles"
+
+# Profile hooks the application runs per record -> transcribe -> copy
+# cycle: begin_cycle(), five stages and three checks of cycle.active
+HOOKS_PER_CYCLE = 9
+
+
+class NullCycle:
+    """
+    Stand-in for a ProfiledCycle while profiling is off.
+
+    Every hook is a no-op, so the application calls them unconditionally
+    and pays only a method call when nothing is profiled.
+    """
+
+    active = False
+
+    def stage(self, name, torch_trace=False):
+        return _NO_STAGE
+
+    def describe(self, **info):
+        pass
+
+    def finish(self, **info):
+        return None
+
+
+_NO_STAGE = contextlib.nullcontext()
+NULL_CYCLE = NullCycle()
+
+
+class ProfiledCycle:
+    """
+    Profile of one record -> transcribe -> copy cycle.
+
+    The stages of a cycle run on different threads (recording thread, GUI,
+    processing thread, clipboard writer), so each stage gets its own
+    cProfile profiler, enabled in the thread running it; the profiles are
+    merged when the cycle finishes. Stages marked with torch_trace also
+    run under the torch profiler when torch is loaded in this process.
+    """
+
+    active = True
+
+    def __init__(self, directory, on_saved=None):
+        """
+        Start a cycle.
+
+        Args:
+            directory: Directory the bundle is saved in
+            on_saved: Called with the bundle path once it is saved
+        """
+        self.directory = directory
+        self.on_saved = on_saved
+        self.started = time.perf_counter()
+        self.created = time.time()
+        self.info = {}
+        self.timings = []
+        self._profiles = []
+        self._torch_profiles = []
+        self._lock = threading.Lock()
+        self._finished = False
+
+    def describe(self, **info):
+        """Record facts about the cycle (model, backend, input length, ...)"""
+        with self._lock:
+            self.info.update(info)
+
+    @contextlib.contextmanager
+    def stage(self, name, torch_trace=False):
+        """
+        Profile a stage of the cycle in the calling thread.
+
+        Args:
+            name: Stage name in the report
+            torch_trace: Also record a torch profiler trace
+        """
+        profile = cProfile.Profile()
+        torch_profile = None
+        if torch_trace and "torch" in sys.modules:
+            torch_profile = _start_torch_profiler()
+        try:
+            profile.enable()
+        except ValueError as e:
+            # Another profiler is already running (Python 3.12+ allows one)
+            print(f"Profiling stage {name!r} without cProfile: {e}")
+            profile = None
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            if profile is not None:
+                profile.disable()
+            if torch_profile is not None:
+                torch_profile.__exit__(None, None, None)
+            with self._lock:
+                self.timings.append({
+                    "stage": name, "seconds": seconds, "profiled": profile is not None,
+                    "thread": threading.current_thread().name
+                })
+                if profile is not None:
+                    self._profiles.append(profile)
+                if torch_profile is not None:
+                    self._torch_profiles.append((name, torch_profile))
+
+    def finish(self, **info):
+        """
+        End the cycle and save its bundle.
+
+        Args:
+            **info: Last facts about the cycle (e.g. the text length)
+
+        Returns:
+            str: Bundle directory, or None if it could not be saved
+        """
+        with self._lock:
+            if self._finished:
+                return None
+            self._finished = True
+            self.info.update(info)
+        try:
+            path = self.save()
+        except Exception as e:
+            print(f"Error saving profile: {e}")
+            return None
+        if self.on_saved is not None:
+            self.on_saved(path)
+        return path
+
+    def report(self):
+        """
+        The cycle's stage timings and environment.
+
+        Returns:
+            dict: JSON-serializable report
+        """
+        torch = sys.modules.get("torch")
+        environment = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        }
+        if torch is not None:
+            environment["torch"] = torch.__version__
+            environment["torch_threads"] = torch.get_num_threads()
+            environment["torch_interop_threads"] = torch.get_num_interop_threads()
+        return {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.created)),
+            "total_seconds": time.perf_counter() - self.started,
+            "stages": list(self.timings),
+            "cycle": dict(self.info),
+            "environment": environment,
+            "hook_overhead": {
+                "disabled_seconds_per_hook": _disabled_overhead(),
+                "hooks_per_cycle": HOOKS_PER_CYCLE,
+            },
+        }
+
+    def save(self):
+        """
+        Write the bundle: report.json, profile.pstats, profile.txt (the
+        top functions by cumulative time) and a Chrome trace per torch
+        profiled stage.
+
+        Returns:
+            str: Bundle directory
+        """
+        path = _new_bundle_dir(self.directory, self.created)
+
+        if self._profiles:
+            stats = pstats.Stats(self._profiles[0])
+            for profile in self._profiles[1:]:
+                stats.add(profile)
+            stats.dump_stats(os.path.join(path, "profile.pstats"))
+            summary = io.StringIO()
+            stats.stream = summary
+            stats.sort_stats("cumulative").print_stats(40)
+            with open(os.path.join(path, "profile.txt"), "w", encoding="utf-8") as f:
+                f.write(summary.getvalue())
+
+        traces = []
+        for name, torch_profile in self._torch_profiles:
+            trace = f"torch_trace_{name.replace(' ', '_')}.json"
+            torch_profile.export_chrome_trace(os.path.join(path, trace))
+            traces.append(trace)
+
+        report = self.report()
+        report["torch_traces"] = traces
+        with open(os.path.join(path, "report.json"), "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        return path
+
+
+class CycleProfiler:
+    """
+    Switch for profiling record -> transcribe -> copy cycles.
+
+    While enabled, begin_cycle() returns a ProfiledCycle that is saved to
+    its own bundle directory when it finishes; otherwise it returns
+    NULL_CYCLE.
+    """
+
+    def __init__(self, directory=DEFAULT_PROFILE_DIR, enabled=False, on_saved=None):
+        """
+        Initialize the profiler.
+
+        Args:
+            directory: Directory the bundles are saved in
+            enabled: Profile every cycle from the start
+            on_saved: Called with the path of every saved bundle (from the
+                thread that finished the cycle)
+        """
+        self.directory = os.path.expanduser(directory)
+        self.enabled = enabled
+        self.on_saved = on_saved
+
+    def begin_cycle(self):
+        """
+        Start profiling a cycle if profiling is enabled.
+
+        Returns:
+            ProfiledCycle or NULL_CYCLE
+        """
+        if not self.enabled:
+            return NULL_CYCLE
+        return ProfiledCycle(self.directory, self.on_saved)
+
+
+def _start_torch_profiler():
+    """A running torch profiler, or None if it cannot be started"""
+    try:
+        import torch
+        activities = [torch.profiler.ProfilerActivity.CPU]
+        if torch.cuda.is_available():
+            activities.append(torch.profiler.ProfilerActivity.CUDA)
+        torch_profile = torch.profiler.profile(activities=activities, record_shapes=True)
+        torch_profile.__enter__()
+        return torch_profile
+    except Exception as e:
+        print(f"Torch profiler unavailable: {e}")
+        return None
+
+
+def _new_bundle_dir(directory, created):
+    """Create a directory for a bundle, named after its start time"""
+    os.makedirs(directory, exist_ok=True)
+    name = time.strftime("%Y%m%d-%H%M%S", time.localtime(created))
+    path = os.path.join(directory, name)
+    number = 1
+    while True:
+        try:
+            os.mkdir(path)
+            return path
+        except FileExistsError:
+            number += 1
+            path = os.path.join(directory, f"{name}-{number}")
+
+
+def measure_disabled_overhead(calls=20000):
+    """
+    Time the profile hooks while profiling is off.
+
+    Args:
+        calls: Number of stage hooks timed
+
+    Returns:
+        float: Seconds per hook (a stage entered and left on NULL_CYCLE)
+    """
+    cycle = NULL_CYCLE
+    started = time.perf_counter()
+    for _ in range(calls):
+        with cycle.stage("stage"):
+            pass
+    hooked = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(calls):
+        pass
+    empty = time.perf_counter() - started
+    return max(hooked - empty, 0.0) / calls
+
+
+@functools.lru_cache(maxsize=None)
+def _disabled_overhead():
+    """measure_disabled_overhead(), measured once per process for the reports"""
+    return measure_disabled_overhead()
@@ -0,0 +1,148 @@
+import sys
+import gc
+
+
+def read_meminfo(path="/proc/meminfo"):
+    """
+    Read system memory counters.
+
+    Args:
+        path: meminfo file (Linux only)
+
+    Returns:
+        dict: Counter name to bytes (e.g. "MemTotal", "MemAvailable"), or
+        an empty dict when the file is not available
+    """
+    values = {}
+    try:
+        with open(path, encoding="ascii") as f:
+            for line in f:
+                name, _, rest = line.partition(":")
+                fields = rest.split()
+                if not fields:
+                    continue
+                value = int(fields[0])
+                if len(fields) > 1 and fields[1] == "kB":
+                    value *= 1024
+                values[name] = value
+    except (OSError, ValueError):
+        return {}
+    return values
+
+
+def read_pressure(path="/proc/pressure/memory"):
+    """
+    Read Linux pressure stall information (PSI) for memory.
+
+    Args:
+        path: PSI file
+
+    Returns:
+        dict: {"some": {"avg10": ..., "avg60": ..., "avg300": ..., "total": ...},
+        "full": {...}}, or None when PSI is not available
+    """
+    try:
+        with open(path, encoding="ascii") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+
+    pressure = {}
+    for line in lines:
+        kind, *fields = line.split()
+        values = {}
+        for field in fields:
+            key, _, value = field.partition("=")
+            try:
+                values[key] = float(value)
+            except ValueError:
+                continue
+        pressure[kind] = values
+    return pressure
+
+
+def rss_bytes():
+    """
+    Resident set size of the current process.
+
+    Returns:
+        int: Bytes, or 0 if it cannot be determined
+    """
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+
+    try:
+        import resource
+        # Peak rather than current RSS, but better than nothing off Linux
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return 0
+
+
+class MemoryPressureMonitor:
+    """
+    Decides when the system is short enough on memory to drop the model.
+    """
+
+    def __init__(self, min_available_fraction=0.10, psi_threshold=10.0,
+                 meminfo_path="/proc/meminfo", psi_path="/proc/pressure/memory"):
+        """
+        Initialize the monitor.
+
+        Args:
+            min_available_fraction: Pressure when MemAvailable falls below
+                this share of MemTotal
+            psi_threshold: Pressure when tasks were stalled on memory for
+                more than this percentage of the last 10 seconds (PSI "some")
+            meminfo_path: meminfo file
+            psi_path: PSI file
+        """
+        self.min_available_fraction = min_available_fraction
+        self.psi_threshold = psi_threshold
+        self.meminfo_path = meminfo_path
+        self.psi_path = psi_path
+
+    def check(self):
+        """
+        Check for memory pressure.
+
+        Returns:
+            str: Reason for the pressure, or None if memory is fine
+        """
+        pressure = read_pressure(self.psi_path)
+        if pressure and "some" in pressure:
+            stalled = pressure["some"].get("avg10", 0.0)
+            if stalled > self.psi_threshold:
+                return f"memory stalls {stalled:.1f}% (PSI avg10)"
+
+        meminfo = read_meminfo(self.meminfo_path)
+        total = meminfo.get("MemTotal")
+        available = meminfo.get("MemAvailable")
+        if total and available is not None and available < total * self.min_available_fraction:
+            return f"only {available / total * 100:.1f}% of memory available"
+
+        return None
+
+
+def release_allocator_caches():
+    """Return freed memory to the OS after a large object has been dropped"""
+    gc.collect()
+
+    if "torch" in sys.modules:
+        torch = sys.modules["torch"]
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    if sys.platform.startswith("linux"):
+        try:
+            import ctypes
+            # glibc keeps freed heap pages; hand them back to the kernel
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+        except (OSError, AttributeError):
+            pass
@@ -1,17 +1,60 @@
-import torch
-import librosa
+import time
+import threading
 import numpy as np
-from transformers import Wav2Vec2ForCTC, Wav2Vec2Processor, Wav2Vec2CTCTokenizer, Wav2Vec2FeatureExtractor
+
+from src.resource_monitor import release_allocator_caches
+
+# torch and transformers take seconds to import, so they are imported on
+# first use: the GUI, --help and the CLI start without paying for them.
 
 class SpeechRecognizer:
-    def __init__(self, model_name="jonatasgrosman/wav2vec2-large-xlsr-53-hungarian"):
+    # Memory pressure only unloads a model unused for this many seconds...
+    PRESSURE_MIN_IDLE = 120
+    # ...and loaded at least this long ago, so a reload that itself causes
+    # pressure does not start an unload/reload loop
+    PRESSURE_RELOAD_COOLDOWN = 600
+    
+    def __init__(self, model_name="jonatasgrosman/wav2vec2-large-xlsr-53-hungarian", channel_labels=None,
+                 compile_backend=None, compile_cache_dir=None, compile_warmup=False,
+                 idle_timeout=None, memory_monitor=None):
         """
         Initialize the speech recognizer with a Hungarian speech model.
         Default model: jonatasgrosman/wav2vec2-large-xlsr-53-hungarian - A Hungarian fine-tuned Wav2Vec2 model
+        
+        Args:
+            model_name: Hugging Face model ID or local path
+            channel_labels: Speaker names for the channels of multi-channel
+                recordings (default: "Speaker 1", "Speaker 2", ...)
+            compile_backend: None for eager PyTorch, or "trace"/"compile" to
+                run mono inputs through a length-bucketed CompiledEngine
+            compile_cache_dir: Where torch.compile caches its kernels across runs
+            compile_warmup: Compile all buckets while loading the model
+            idle_timeout: Unload the model after this many seconds without
+                a transcription (None = keep it loaded)
+            memory_monitor: MemoryPressureMonitor; the model is unloaded
+                while it reports pressure (None = ignore memory pressure)
         """
         self.sampling_rate = 16000  # Required sampling rate for the model (kHz)
+        self.model_name = model_name
+        self.channel_labels = channel_labels or []
+        self.compile_backend = compile_backend
+        self.compile_cache_dir = compile_cache_dir
+        self.compile_warmup = compile_warmup
         self.processor = None
         self.model = None
+        self.engine = None
+        self.idle_timeout = idle_timeout
+        self.memory_monitor = memory_monitor
+        
+        # Held while the model is loaded, used or unloaded
+        self._lock = threading.RLock()
+        self._prefetch_thread = None
+        self.last_used = time.monotonic()
+        self.loaded_at = None
+        # Seconds taken by every load, the first one included
+        self.load_times = []
+        
+        import torch
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         
         print(f"Initializing speech recognition model on {self.device}...")
@@ -19,28 +62,141 @@ class SpeechRecognizer:
         
     def load_model(self, model_name):
         """Load the Wav2Vec2 model and processor"""
+        from transformers import (
+            Wav2Vec2ForCTC, Wav2Vec2Processor, Wav2Vec2CTCTokenizer, Wav2Vec2FeatureExtractor
+        )
+        
+        started = time.perf_counter()
         try:
-            # Try loading with the standard processor first
-            try:
-                self.processor = Wav2Vec2Processor.from_pretrained(model_name)
-            except Exception as e:
-                print(f"Failed to load processor directly: {e}")
-                # Manual fallback to load tokenizer and feature extractor separately
-                tokenizer = Wav2Vec2CTCTokenizer.from_pretrained(model_name)
-                feature_extractor = Wav2Vec2FeatureExtractor.from_pretrained(
-                    model_name,
-                    sampling_rate=self.sampling_rate,
-                    padding_value=0.0,
-                    do_normalize=True,
-                    return_attention_mask=True
-                )
-                self.processor = Wav2Vec2Processor(feature_extractor=feature_extractor, tokenizer=tokenizer)
+            # The processor is small and survives unload_model()
+            if self.processor is None:
+                # Try loading with the standard processor first
+                try:
+                    self.processor = Wav2Vec2Processor.from_pretrained(model_name)
+                except Exception as e:
+                    print(f"Failed to load processor directly: {e}")
+                    # Manual fallback to load tokenizer and feature extractor separately
+                    tokenizer = Wav2Vec2CTCTokenizer.from_pretrained(model_name)
+                    feature_extractor = Wav2Vec2FeatureExtractor.from_pretrained(
+                        model_name,
+                        sampling_rate=self.sampling_rate,
+                        padding_value=0.0,
+                        do_normalize=True,
+                        return_attention_mask=True
+                    )
+                    self.processor = Wav2Vec2Processor(feature_extractor=feature_extractor, tokenizer=tokenizer)
                 
             self.model = Wav2Vec2ForCTC.from_pretrained(model_name).to(self.device)
+            self.model.eval()
             print("Model loaded successfully")
         except Exception as e:
             print(f"Error loading model: {e}")
             raise
+        
+        if self.compile_backend:
+            self._create_engine()
+        
+        self.load_times.append(time.perf_counter() - started)
+        self.last_used = time.monotonic()
+        self.loaded_at = self.last_used
+    
+    def is_loaded(self):
+        """Check whether the model weights are in memory"""
+        return self.model is not None
+    
+    def ensure_loaded(self):
+        """Reload the model if it was unloaded (blocks until it is ready)"""
+        with self._lock:
+            if self.model is None:
+                print("Reloading speech model...")
+                self.load_model(self.model_name)
+    
+    def prefetch(self):
+        """
+        Start reloading an unloaded model in the background.
+        
+        Called when recording starts, so the model is back in memory by the
+        time the audio is ready to be transcribed.
+        """
+        self.last_used = time.monotonic()
+        if self.model is not None:
+            return
+        if self._prefetch_thread is not None and self._prefetch_thread.is_alive():
+            return
+        
+        def reload():
+            try:
+                self.ensure_loaded()
+            except Exception as e:
+                # transcribe() tries again and reports the error
+                print(f"Error prefetching model: {e}")
+        
+        self._prefetch_thread = threading.Thread(target=reload, daemon=True)
+        self._prefetch_thread.start()
+    
+    def unload_model(self):
+        """Release the model, the compiled engine and the allocator caches"""
+        with self._lock:
+            if self.model is None:
+                return
+            self.model = None
+            self.engine = None
+            release_allocator_caches()
+            print("Speech model unloaded")
+    
+    def release_if_idle(self):
+        """
+        Unload the model when it has been idle too long or memory is short.
+        
+        Never waits: if the model is busy (transcribing or loading) nothing
+        happens and the check is simply repeated later. Memory pressure is
+        ignored until the model has been unused for PRESSURE_MIN_IDLE
+        seconds and loaded for PRESSURE_RELOAD_COOLDOWN seconds.
+        
+        Returns:
+            str: Why the model was unloaded, or None if it was kept
+        """
+        if self.model is None:
+            return None
+        
+        now = time.monotonic()
+        reason = None
+        if self.idle_timeout and now - self.last_used > self.idle_timeout:
+            reason = f"idle for {self.idle_timeout / 60:g} min"
+        elif self.memory_monitor is not None and self._pressure_may_unload(now):
+            reason = self.memory_monitor.check()
+        if reason is None:
+            return None
+        
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            self.unload_model()
+        finally:
+            self._lock.release()
+        return reason
+    
+    def _pressure_may_unload(self, now):
+        """Check whether the model is idle and settled enough for a pressure unload"""
+        if now - self.last_used < self.PRESSURE_MIN_IDLE:
+            return False
+        return self.loaded_at is None or now - self.loaded_at >= self.PRESSURE_RELOAD_COOLDOWN
+    
+    def _create_engine(self):
+        """Set up the compiled engine, staying in eager mode if that fails"""
+        from src.compiled_inference import CompiledEngine
+        
+        try:
+            self.engine = CompiledEngine(
+                self.model, self.model_name, device=self.device,
+                sampling_rate=self.sampling_rate, backend=self.compile_backend,
+                cache_dir=self.compile_cache_dir
+            )
+            if self.compile_warmup:
+                self.engine.warmup()
+        except Exception as e:
+            print(f"Compiled inference unavailable, using eager mode: {e}")
+            self.engine = None
     
     def preprocess_audio(self, audio_array):
         """Preprocess the audio to match model requirements"""
@@ -50,6 +206,12 @@ class SpeechRecognizer:
         
         return audio_array
     
+    def channel_label(self, channel):
+        """Speaker label shown for a channel of a multi-channel recording"""
+        if channel < len(self.channel_labels):
+            return f"{self.channel_labels[channel]} (ch {channel + 1})"
+        return f"Speaker {channel + 1} (ch {channel + 1})"
+    
     def transcribe(self, audio_array):
         """
         Transcribe the audio to text.
@@ -60,31 +222,134 @@ class SpeechRecognizer:
         Returns:
             transcription: String of transcribed text
         """
+        self.last_used = time.monotonic()
         try:
-            # Ensure audio is properly shaped (flatten if multi-dimensional)
+            # Keep channels apart: flattening would interleave their samples
             if audio_array.ndim > 1:
-                audio_array = audio_array.flatten()
+                if audio_array.shape[1] > 1:
+                    return self.transcribe_channels(audio_array)
+                audio_array = audio_array[:, 0]
                 
             # Preprocess the audio
             audio_array = self.preprocess_audio(audio_array)
             
-            # Tokenize
-            input_values = self.processor(
-                audio_array, 
-                sampling_rate=self.sampling_rate, 
-                return_tensors="pt"
-            ).input_values.to(self.device)
-            
-            # Retrieve logits
+            with self._lock:
+                self.ensure_loaded()
+                return self._transcribe_mono(audio_array)
+        
+        except Exception as e:
+            print(f"Error during transcription: {e}")
+            return ""
+        finally:
+            self.last_used = time.monotonic()
+    
+    def _transcribe_mono(self, audio_array):
+        """Decode one preprocessed mono recording (the model must be loaded)"""
+        import torch
+        
+        # Tokenize
+        input_values = self.processor(
+            audio_array, 
+            sampling_rate=self.sampling_rate, 
+            return_tensors="pt"
+        ).input_values.to(self.device)
+        
+        # Retrieve logits, through a compiled graph when available
+        logits = None
+        if self.engine is not None:
+            logits = self.engine.logits(input_values)
+        if logits is None:
             with torch.no_grad():
                 logits = self.model(input_values).logits
+        
+        # Take argmax and decode
+        predicted_ids = torch.argmax(logits, dim=-1)
+        transcription = self.processor.batch_decode(predicted_ids)[0]
+        
+        return transcription
+    
+    def transcribe_batch(self, audio_arrays, word_offsets=False):
+        """
+        Transcribe several mono recordings in one padded forward pass.
+        
+        Args:
+            audio_arrays: List of 1-D numpy arrays (lengths may differ)
+            word_offsets: Also return the position of every word
+            
+        Returns:
+            list: Transcriptions, or (transcription, word offsets) tuples
+            with offsets in seconds when word_offsets is True
+        """
+        import torch
+        
+        audio_arrays = [self.preprocess_audio(np.asarray(audio, dtype=np.float32)) for audio in audio_arrays]
+        
+        with self._lock:
+            self.ensure_loaded()
+            inputs = self.processor(
+                audio_arrays,
+                sampling_rate=self.sampling_rate,
+                padding=True,
+                return_attention_mask=True,
+                return_tensors="pt"
+            )
+            input_values = inputs.input_values.to(self.device)
+            
+            # Models with group-norm feature extractors must not get a mask
+            # (they were trained on zero padding); layer-norm models need it
+            attention_mask = None
+            if getattr(self.model.config, "feat_extract_norm", "layer") == "layer":
+                attention_mask = inputs.attention_mask.to(self.device)
             
-            # Take argmax and decode
+            with torch.no_grad():
+                logits = self.model(input_values, attention_mask=attention_mask).logits
             predicted_ids = torch.argmax(logits, dim=-1)
-            transcription = self.processor.batch_decode(predicted_ids)[0]
             
-            return transcription
+            # Seconds per logit frame of the convolutional feature encoder
+            frame_seconds = np.prod(self.model.config.conv_stride) / self.sampling_rate
+        self.last_used = time.monotonic()
         
-        except Exception as e:
-            print(f"Error during transcription: {e}")
-            return "" 
\ No newline at end of file
+        if not word_offsets:
+            return self.processor.batch_decode(predicted_ids)
+        
+        decoded = self.processor.batch_decode(predicted_ids, output_word_offsets=True)
+        results = []
+        for text, offsets in zip(decoded.text, decoded.word_offsets):
+            words = [
+                (word["word"], word["start_offset"] * frame_seconds, word["end_offset"] * frame_seconds)
+                for word in offsets
+            ]
+            results.append((text, words))
+        return results
+    
+    def transcribe_channels(self, audio_array):
+        """
+        Transcribe every channel of a multi-channel recording separately and
+        merge the results into a transcript labeled by speaker and channel.
+        
+        Args:
+            audio_array: Numpy array of shape (samples, channels)
+            
+        Returns:
+            transcription: Speaker turns in time order, one per line
+        """
+        channels = [audio_array[:, channel] for channel in range(audio_array.shape[1])]
+        results = self.transcribe_batch(channels, word_offsets=True)
+        
+        # Order all words by start time, then group runs from the same channel
+        words = sorted(
+            (start, channel, word)
+            for channel, (_, offsets) in enumerate(results)
+            for word, start, _ in offsets
+        )
+        turns = []
+        for start, channel, word in words:
+            if turns and turns[-1][0] == channel:
+                turns[-1][1].append(word)
+            else:
+                turns.append((channel, [word]))
+        
+        return "\n".join(
+            f"{self.channel_label(channel)}: {' '.join(turn_words)}"
+            for channel, turn_words in turns
+        )
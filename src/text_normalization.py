@@ -0,0 +1,659 @@
+import re
+import threading
+
+# torch and transformers are only imported when a punctuation model is
+# configured, the rule-based normalizer needs nothing but re.
+
+# Morphemes of Hungarian number words: (kind, value). Alternations are
+# tried longest first, so "hatvan" is not read as "hat" + "van".
+MORPHEMES = {
+    "nulla": ("zero", 0),
+    "egy": ("unit", 1), "kettő": ("unit", 2), "két": ("unit", 2), "három": ("unit", 3),
+    "négy": ("unit", 4), "öt": ("unit", 5), "hat": ("unit", 6), "hét": ("unit", 7),
+    "nyolc": ("unit", 8), "kilenc": ("unit", 9),
+    "tizen": ("prefix", 10), "huszon": ("prefix", 20),
+    "tíz": ("tens", 10), "húsz": ("tens", 20), "harminc": ("tens", 30), "negyven": ("tens", 40),
+    "ötven": ("tens", 50), "hatvan": ("tens", 60), "hetven": ("tens", 70),
+    "nyolcvan": ("tens", 80), "kilencven": ("tens", 90),
+    "száz": ("hundred", 100),
+    "ezer": ("scale", 1000), "millió": ("scale", 10 ** 6), "milliárd": ("scale", 10 ** 9),
+}
+
+# Stems that only occur before a suffix: hármat, hetet, ezret, hússzal
+SUFFIX_STEMS = {"hárm": ("unit", 3), "het": ("unit", 7), "ezr": ("scale", 1000), "hús": ("tens", 20)}
+
+# Stems that are also ordinary words take only this suffix ("húst" is meat)
+STEM_ONLY_SUFFIX = {"hús": "szal"}
+
+# Ordinal stems before "-ik": tizenötödik, huszadik, kétszázadik
+ORDINAL_STEMS = {
+    "egyed": ("unit", 1), "ketted": ("unit", 2), "harmad": ("unit", 3), "negyed": ("unit", 4),
+    "ötöd": ("unit", 5), "hatod": ("unit", 6), "heted": ("unit", 7), "nyolcad": ("unit", 8),
+    "kilenced": ("unit", 9), "tized": ("tens", 10), "huszad": ("tens", 20),
+    "harmincad": ("tens", 30), "negyvened": ("tens", 40), "ötvened": ("tens", 50),
+    "hatvanad": ("tens", 60), "hetvened": ("tens", 70), "nyolcvanad": ("tens", 80),
+    "kilencvened": ("tens", 90), "század": ("hundred", 100), "ezred": ("scale", 1000),
+    "milliomod": ("scale", 10 ** 6),
+}
+
+# Case endings written after a hyphen: tízszer -> 10-szer, tízzel -> 10-zel
+CASE_SUFFIX = (
+    r"[aeoö]?[tns]|sz[oeö]r|b[ae]n?|b[óő]l|h[oeö]z|n[áé]l|t[óő]l|ig|r[ae]|r[óő]l"
+    r"|(?:sz|zs|cs|[bcdfghjklmnprstvz])[ae]l|n[ae]k|ért"
+)
+
+# Day of the month: ötödike, ötödikén, harmadikáig, elsejétől
+DAY_SUFFIX = r"[aeáé](?:n|ig|t|t[óő]l|r[ae]|r[óő]l|h[oeö]z)?"
+
+MONTHS = {
+    "január", "február", "március", "április", "május", "június", "július",
+    "augusztus", "szeptember", "október", "november", "december",
+}
+
+# Spoken unit (one or more words) -> written abbreviation
+UNITS = {
+    ("százalék",): "%",
+    ("forint",): "Ft",
+    ("euró",): "€",
+    ("kilométer", "per", "óra"): "km/h",
+    ("kilométer",): "km",
+    ("méter",): "m",
+    ("centiméter",): "cm",
+    ("milliméter",): "mm",
+    ("négyzetméter",): "m²",
+    ("kilogramm",): "kg",
+    ("kiló",): "kg",
+    ("gramm",): "g",
+    ("liter",): "l",
+    ("deciliter",): "dl",
+    ("milliliter",): "ml",
+}
+
+# Decimal fractions: három egész öt tized -> 3,5
+FRACTIONS = {"tized": 1, "század": 2, "ezred": 3}
+
+# Sentence-final punctuation, after which the next word is capitalized
+SENTENCE_END = (".", "?", "!")
+
+# Punctuation attached to the end of a word (dictated or predicted)
+TRAILING_PUNCTUATION = ".,?!:;…)\""
+
+# Speaker turn prefix of multi-channel transcripts ("Anna (ch 1): ...")
+TURN_PREFIX = re.compile(r"^(.*?\(ch \d+\): )(.*)$")
+
+
+def _alternation(words):
+    """Regex alternation of words, longest first"""
+    return "|".join(sorted((re.escape(word) for word in words), key=len, reverse=True))
+
+
+_MORPHEME = re.compile(_alternation(MORPHEMES))
+_SUFFIX_STEM = re.compile(f"(?:{_alternation(SUFFIX_STEMS)})(?=.)")
+_CARDINAL_REST = re.compile(f"(?:{CASE_SUFFIX})")
+_ORDINAL = re.compile(f"(?P<body>.+?)ik(?P<rest>{DAY_SUFFIX})?")
+_FIRST = re.compile(r"els(?:ő|ej(?P<rest>[eé](?:n|ig|t|t[óő]l|r[ae]|r[óő]l)?))")
+_SECOND = re.compile(f"második(?P<rest>{DAY_SUFFIX})?")
+_UNIT_REST = re.compile(f"(?:{CASE_SUFFIX}|[aeoö]?t|[ae]?k[ae]l|[oeö]?[kt]?)")
+_UNIT_FIRST_WORDS = {unit[0] for unit in UNITS}
+_UNITS_BY_LENGTH = sorted(UNITS.items(), key=lambda item: -len(item[0]))
+
+
+def _morphemes(word):
+    """
+    Split a word into number morphemes and a trailing case suffix.
+
+    Returns:
+        tuple: ((kind, value) tuple, suffix) or None if the word is not a number
+    """
+    morphemes = []
+    position = 0
+    while position < len(word):
+        match = _MORPHEME.match(word, position)
+        if match is None:
+            match = _SUFFIX_STEM.match(word, position)
+            if match is None:
+                break
+            stem = match.group()
+            morphemes.append(SUFFIX_STEMS[stem])
+            position = match.end()
+            # Suffix-only stems must be followed by the suffix itself
+            if not _CARDINAL_REST.fullmatch(word, position):
+                return None
+            if stem in STEM_ONLY_SUFFIX and word[position:] != STEM_ONLY_SUFFIX[stem]:
+                return None
+            break
+        morphemes.append(MORPHEMES[match.group()])
+        position = match.end()
+
+    if not morphemes:
+        return None
+    rest = word[position:]
+    if rest and not _CARDINAL_REST.fullmatch(rest):
+        return None
+    return tuple(morphemes), rest
+
+
+def _group(morphemes, index):
+    """
+    Read a number below 1000 (hundreds, tens, units) starting at index.
+
+    Returns:
+        tuple: (value or None if nothing was read, next index)
+    """
+    count = len(morphemes)
+    value = None
+
+    def kind(offset):
+        return morphemes[index + offset][0] if index + offset < count else None
+
+    if kind(0) == "unit" and kind(1) == "hundred":
+        value = morphemes[index][1] * 100
+        index += 2
+    elif kind(0) == "hundred":
+        value = 100
+        index += 1
+
+    if kind(0) == "prefix" and kind(1) == "unit":
+        value = (value or 0) + morphemes[index][1] + morphemes[index + 1][1]
+        return value, index + 2
+    if kind(0) == "tens":
+        tens = morphemes[index][1]
+        value = (value or 0) + tens
+        index += 1
+        # harmincöt, but never tízöt or húszöt (those are tizen-/huszon-)
+        if tens >= 30 and kind(0) == "unit":
+            value += morphemes[index][1]
+            index += 1
+        return value, index
+    if kind(0) == "unit":
+        value = (value or 0) + morphemes[index][1]
+        index += 1
+    return value, index
+
+
+def number_value(morphemes):
+    """
+    Evaluate a sequence of number morphemes.
+
+    Args:
+        morphemes: (kind, value) tuples, e.g. from "kétezer" "huszonnégy"
+
+    Returns:
+        int: The number, or None if the sequence is not a well-formed number
+    """
+    if not morphemes:
+        return None
+    if morphemes[0][0] == "zero":
+        return 0 if len(morphemes) == 1 else None
+
+    total = 0
+    last_scale = None
+    index = 0
+    while index < len(morphemes):
+        value, index = _group(morphemes, index)
+        if index < len(morphemes) and morphemes[index][0] == "scale":
+            scale = morphemes[index][1]
+            # Scales must decrease: kétmillió-ötszázezer, never ezermillió
+            if last_scale is not None and scale >= last_scale:
+                return None
+            total += (1 if value is None else value) * scale
+            last_scale = scale
+            index += 1
+        elif value is None or index < len(morphemes):
+            return None
+        else:
+            total += value
+    return total
+
+
+def format_number(value):
+    """Write a number the Hungarian way: 2024, 12 500"""
+    if value < 10000:
+        return str(value)
+    return f"{value:,}".replace(",", " ")
+
+
+class HungarianNumberNormalizer:
+    """
+    Rule-based inverse text normalization for Hungarian.
+
+    Rewrites spelled-out numbers the way they are written:
+
+        huszonöt                      -> 25
+        kétezer huszonnégy március    -> 2024. március
+        március tizenötödikén         -> március 15-én
+        tizenegyedik                  -> 11.
+        három egész öt tized          -> 3,5
+        tizenöt százalékkal           -> 15%-kal
+        ezerszer                      -> 1000-szer
+
+    Small numbers (below min_value) stay words unless they are followed by
+    a unit, are part of a date or have a decimal part: "egy" is also the
+    indefinite article and "hat", "hét" are ordinary words.
+
+    All patterns are compiled when the module is imported and word
+    analyses are cached, so long transcripts take a few milliseconds.
+    """
+
+    def __init__(self, min_value=10):
+        """
+        Initialize the normalizer.
+
+        Args:
+            min_value: Smallest standalone number written with digits
+        """
+        self.min_value = min_value
+        self._cache = {}
+
+    def normalize(self, text):
+        """
+        Normalize the numbers in a text.
+
+        Args:
+            text: Space-separated words (punctuation attached to words is kept)
+
+        Returns:
+            str: Text with numbers, dates and units written with digits
+        """
+        words = text.split()
+        stripped = [word.rstrip(TRAILING_PUNCTUATION) for word in words]
+        breaks = {i for i, word in enumerate(words) if word != stripped[i]}
+        output = list(words)
+        for start, end, replacement in reversed(self.convert(stripped, breaks)):
+            output[start:end] = [replacement + words[end - 1][len(stripped[end - 1]):]]
+        return " ".join(output)
+
+    def convert(self, words, breaks=()):
+        """
+        Find the spans of words to rewrite.
+
+        Args:
+            words: Words without punctuation
+            breaks: Indices of words followed by punctuation (numbers are
+                not joined across them)
+
+        Returns:
+            list: (start, end, replacement) for words[start:end], in order
+        """
+        analyses = [self._analyze(word.lower()) for word in words]
+        spans = []
+        index = 0
+        while index < len(words):
+            span = self._match(words, analyses, index, breaks)
+            if span is None:
+                index += 1
+            else:
+                spans.append(span)
+                index = span[1]
+        return spans
+
+    def _analyze(self, word):
+        """Classify a lowercase word (cached)"""
+        analysis = self._cache.get(word)
+        if analysis is None and word not in self._cache:
+            analysis = self._classify(word)
+            if len(self._cache) > 100000:
+                self._cache.clear()
+            self._cache[word] = analysis
+        return analysis
+
+    def _classify(self, word):
+        """
+        Classify a lowercase word.
+
+        Returns:
+            tuple: ("cardinal", morphemes, suffix), ("ordinal", value, day
+            suffix or None), ("month",), ("point",), ("fraction", digits),
+            ("unit",) or None for any other word
+        """
+        if word in MONTHS:
+            return ("month",)
+        if word == "egész":
+            return ("point",)
+        if word in FRACTIONS:
+            return ("fraction", FRACTIONS[word])
+        if word in _UNIT_FIRST_WORDS or any(word.startswith(unit[0]) for unit in UNITS if len(unit) == 1):
+            return ("unit",)
+
+        word = word.replace("-", "")
+        match = _FIRST.fullmatch(word)
+        if match:
+            rest = match.group("rest")
+            return ("ordinal", 1, "j" + rest if rest else None)
+        match = _SECOND.fullmatch(word)
+        if match:
+            return ("ordinal", 2, match.group("rest"))
+        match = _ORDINAL.fullmatch(word)
+        if match:
+            # Stems overlap ("tizen-egyed", "tize-negyed"), so try every one
+            body = match.group("body")
+            for stem, morpheme in ORDINAL_STEMS.items():
+                if not body.endswith(stem):
+                    continue
+                prefix = _morphemes(body[:-len(stem)]) if body != stem else ((), "")
+                if prefix is None or prefix[1]:
+                    continue
+                value = number_value(prefix[0] + (morpheme,))
+                if value is not None:
+                    return ("ordinal", value, match.group("rest"))
+
+        parsed = _morphemes(word)
+        if parsed is not None:
+            return ("cardinal",) + parsed
+        return None
+
+    def _cardinal_run(self, analyses, index, breaks):
+        """
+        Longest run of words from index that forms one number.
+
+        Returns:
+            tuple: (end index, value, suffix) or None
+        """
+        best = None
+        morphemes = ()
+        end = index
+        while end < len(analyses) and analyses[end] and analyses[end][0] == "cardinal":
+            morphemes += analyses[end][1]
+            end += 1
+            value = number_value(morphemes)
+            if value is not None:
+                best = (end, value, analyses[end - 1][2])
+            # A suffix or punctuation ends the number
+            if analyses[end - 1][2] or end - 1 in breaks:
+                break
+        return best
+
+    def _unit(self, words, analyses, index, breaks):
+        """
+        Match a unit at index.
+
+        Returns:
+            tuple: (end index, written unit with its suffix) or None
+        """
+        if index >= len(words) or not analyses[index] or analyses[index][0] != "unit":
+            return None
+        for spoken, written in _UNITS_BY_LENGTH:
+            end = index + len(spoken)
+            if end > len(words) or any(i in breaks for i in range(index, end - 1)):
+                continue
+            candidate = [word.lower() for word in words[index:end]]
+            if candidate[:-1] != list(spoken[:-1]) or not candidate[-1].startswith(spoken[-1]):
+                continue
+            rest = candidate[-1][len(spoken[-1]):]
+            if rest and not _UNIT_REST.fullmatch(rest):
+                continue
+            return end, written + (f"-{rest}" if rest else "")
+        return None
+
+    def _match(self, words, analyses, index, breaks):
+        """Rewrite the words starting at index, returning a span or None"""
+        analysis = analyses[index]
+        if analysis is None:
+            return None
+        kind = analysis[0]
+
+        # Day after a month name: március tizenöt(ödikén)
+        if kind == "month" and index + 1 < len(words) and index not in breaks:
+            day = analyses[index + 1]
+            if day and day[0] == "ordinal" and 1 <= day[1] <= 31:
+                return index + 1, index + 2, self._ordinal(day[1], day[2])
+            if day and day[0] == "cardinal" and not day[2]:
+                run = self._cardinal_run(analyses, index + 1, breaks)
+                if run and 1 <= run[1] <= 31:
+                    return index + 1, run[0], f"{run[1]}."
+            return None
+
+        if kind == "ordinal":
+            value, day = analysis[1], analysis[2]
+            if day or value >= self.min_value:
+                return index, index + 1, self._ordinal(value, day)
+            return None
+
+        if kind != "cardinal":
+            return None
+        run = self._cardinal_run(analyses, index, breaks)
+        if run is None:
+            return None
+        end, value, suffix = run
+        if suffix:
+            if value >= self.min_value:
+                return index, end, f"{format_number(value)}-{suffix}"
+            return None
+
+        text = format_number(value)
+        decimal = False
+        after = analyses[end] if end < len(words) and end - 1 not in breaks else None
+
+        # Decimal: három egész huszonöt (század)
+        if after and after[0] == "point" and end not in breaks:
+            fraction = self._cardinal_run(analyses, end + 1, breaks)
+            if fraction and not fraction[2]:
+                digits = str(fraction[1])
+                fraction_end = fraction[0]
+                place = analyses[fraction_end] if fraction_end < len(words) and fraction_end - 1 not in breaks else None
+                if place and place[0] == "fraction":
+                    if len(digits) > place[1]:
+                        return None
+                    digits = digits.zfill(place[1])
+                    fraction_end += 1
+                text = f"{text},{digits}"
+                end = fraction_end
+                decimal = True
+
+        unit = self._unit(words, analyses, end, breaks) if end - 1 not in breaks else None
+        if unit:
+            unit_end, written = unit
+            separator = "" if written.startswith("%") else " "
+            return index, unit_end, f"{text}{separator}{written}"
+
+        # Year before a month name: kétezer huszonnégy március
+        if (not decimal and 1000 <= value <= 2999 and end < len(words) and end - 1 not in breaks
+                and analyses[end] and analyses[end][0] == "month"):
+            return index, end, f"{value}."
+
+        if decimal or value >= self.min_value:
+            return index, end, text
+        return None
+
+    def _ordinal(self, value, day):
+        """Write an ordinal: 15. or, as a day of the month, 15-én"""
+        if day:
+            return f"{value}-{day}"
+        return f"{value}."
+
+
+def _capitalize(word):
+    """Upper-case the first letter, after any opening bracket or quote"""
+    for index, char in enumerate(word):
+        if char.isalpha():
+            return word[:index] + char.upper() + word[index + 1:]
+        if char not in "(\"„'":
+            break
+    return word
+
+
+def _label_actions(label):
+    """
+    Interpret a punctuation model label.
+
+    Labels name the punctuation after a word ("PERIOD", "COMMA", or the
+    mark itself like "." and ",") and optionally capitalization ("UPPER").
+
+    Returns:
+        tuple: (punctuation mark or "", capitalize)
+    """
+    upper = label.upper()
+    names = {"PERIOD": ".", "COMMA": ",", "QUESTION": "?", "EXCLAMATION": "!", "COLON": ":", "SEMICOLON": ";"}
+    mark = ""
+    for name, symbol in names.items():
+        if name in upper:
+            mark = symbol
+            break
+    else:
+        for symbol in ".,?!:;":
+            if symbol in label:
+                mark = symbol
+                break
+    capitalize = "UPPER" in upper or "CAP" in upper
+    return mark, capitalize
+
+
+class PunctuationModel:
+    """
+    Restores punctuation (and casing, if the model predicts it) with a
+    token classification model loaded from a local path.
+
+    Words are classified in chunks, several chunks per forward pass, and
+    every word takes the label of its first sub-token.
+    """
+
+    def __init__(self, model_path, chunk_words=150, batch_size=8):
+        """
+        Load the model.
+
+        Args:
+            model_path: Local directory of a Hugging Face token
+                classification model with a fast tokenizer
+            chunk_words: Words per model input
+            batch_size: Chunks per forward pass
+        """
+        import torch
+        from transformers import AutoTokenizer, AutoModelForTokenClassification
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_path, local_files_only=True)
+        self.model = AutoModelForTokenClassification.from_pretrained(model_path, local_files_only=True)
+        self.model.eval()
+        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.model.to(self.device)
+        self.chunk_words = chunk_words
+        self.batch_size = batch_size
+        self.actions = {
+            int(label_id): _label_actions(label)
+            for label_id, label in self.model.config.id2label.items()
+        }
+
+    def predict(self, words):
+        """
+        Predict the punctuation after every word.
+
+        Args:
+            words: List of words
+
+        Returns:
+            list: (punctuation mark or "", capitalize) for every word
+        """
+        import torch
+
+        results = [("", False)] * len(words)
+        chunks = [
+            (start, words[start:start + self.chunk_words])
+            for start in range(0, len(words), self.chunk_words)
+        ]
+        for batch_start in range(0, len(chunks), self.batch_size):
+            batch = chunks[batch_start:batch_start + self.batch_size]
+            inputs = self.tokenizer(
+                [chunk for _, chunk in batch], is_split_into_words=True,
+                padding=True, truncation=True, return_tensors="pt"
+            )
+            with torch.inference_mode():
+                logits = self.model(**{key: value.to(self.device) for key, value in inputs.items()}).logits
+            predictions = logits.argmax(dim=-1).cpu().numpy()
+
+            for row, (start, _) in enumerate(batch):
+                previous = None
+                for token, word_index in enumerate(inputs.word_ids(row)):
+                    if word_index is None or word_index == previous:
+                        continue
+                    previous = word_index
+                    results[start + word_index] = self.actions.get(int(predictions[row, token]), ("", False))
+        return results
+
+
+class TextNormalizer:
+    """
+    Post-processing between the recognizer and the clipboard.
+
+    Restores punctuation and casing with an optional PunctuationModel,
+    writes numbers with digits (HungarianNumberNormalizer) and capitalizes
+    sentences. Multi-channel transcripts are normalized turn by turn.
+    """
+
+    def __init__(self, punctuation_model_path=None, number_normalizer=None):
+        """
+        Initialize the normalizer.
+
+        Args:
+            punctuation_model_path: Local punctuation model directory
+                (None = rules only; the model is loaded on first use)
+            number_normalizer: HungarianNumberNormalizer (default: a new one)
+        """
+        self.punctuation_model_path = punctuation_model_path
+        self.numbers = number_normalizer or HungarianNumberNormalizer()
+        self._punctuation = None
+        self._lock = threading.Lock()
+
+    def punctuation_model(self):
+        """Load the punctuation model on first use (None if unavailable)"""
+        with self._lock:
+            if self._punctuation is None and self.punctuation_model_path:
+                try:
+                    self._punctuation = PunctuationModel(self.punctuation_model_path)
+                except Exception as e:
+                    print(f"Punctuation model disabled: {e}")
+                    self.punctuation_model_path = None
+            return self._punctuation
+
+    def process(self, text):
+        """
+        Normalize a transcription.
+
+        Args:
+            text: Recognizer output (lowercase, no punctuation)
+
+        Returns:
+            str: Text ready for the clipboard
+        """
+        lines = []
+        for line in text.split("\n"):
+            match = TURN_PREFIX.match(line)
+            if match:
+                lines.append(match.group(1) + self.normalize(match.group(2)))
+            else:
+                lines.append(self.normalize(line))
+        return "\n".join(lines)
+
+    def normalize(self, text):
+        """Normalize one line of text"""
+        words = text.split()
+        if not words:
+            return text.strip()
+
+        # Punctuation already in the text (dictated commands) wins over
+        # the model's prediction
+        stripped = [word.rstrip(TRAILING_PUNCTUATION) for word in words]
+        model = self.punctuation_model()
+        if model is not None:
+            actions = model.predict(stripped)
+        else:
+            actions = [("", False)] * len(words)
+        tokens = [
+            (word, words[i][len(word):] or mark, capitalize)
+            for i, (word, (mark, capitalize)) in enumerate(zip(stripped, actions))
+        ]
+
+        # Numbers are joined only within a clause
+        breaks = {i for i, token in enumerate(tokens) if token[1]}
+        for start, end, replacement in reversed(self.numbers.convert(stripped, breaks)):
+            tokens[start:end] = [(replacement, tokens[end - 1][1], tokens[start][2])]
+
+        output = []
+        sentence_start = True
+        for word, mark, capitalize in tokens:
+            if capitalize or sentence_start:
+                word = _capitalize(word)
+            sentence_start = mark[:1] in SENTENCE_END
+            # "15." already ends with the period the model predicted
+            if mark == "." and word.endswith("."):
+                mark = ""
+            output.append(word + mark)
+        return " ".join(output)
@@ -0,0 +1,121 @@
+import time
+from PyQt5.QtWidgets import QFrame, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem, QLabel
+from PyQt5.QtCore import Qt, pyqtSignal
+
+class HistoryPopup(QFrame):
+    """
+    Quick-pick list of earlier transcriptions.
+
+    Typing filters the list, Enter or a double click picks the selected
+    entry, Alt+1 ... Alt+9 pick the first nine entries directly and Escape
+    closes the popup.
+    """
+
+    # Emitted with the text of the picked entry
+    entry_selected = pyqtSignal(str)
+
+    PREVIEW_CHARS = 80
+
+    def __init__(self, parent=None):
+        super().__init__(parent, Qt.Popup)
+        self.setFrameShape(QFrame.StyledPanel)
+        self.setMinimumWidth(420)
+        self._entries = []
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(6, 6, 6, 6)
+
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter clipboard history...")
+        self.filter_edit.textChanged.connect(self._apply_filter)
+        self.filter_edit.returnPressed.connect(self._pick_current)
+        self.filter_edit.installEventFilter(self)
+        layout.addWidget(self.filter_edit)
+
+        self.list_widget = QListWidget()
+        self.list_widget.itemActivated.connect(self._pick_item)
+        layout.addWidget(self.list_widget)
+
+        self.empty_label = QLabel("No copied transcriptions yet")
+        self.empty_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.empty_label)
+
+    def set_entries(self, entries):
+        """
+        Fill the list.
+
+        Args:
+            entries: ClipboardHistory.entries() (most recent first)
+        """
+        self._entries = entries
+        self.filter_edit.clear()
+        self._apply_filter("")
+
+    def popup(self, anchor):
+        """Show the popup centered over a widget"""
+        self.adjustSize()
+        center = anchor.mapToGlobal(anchor.rect().center())
+        self.move(center.x() - self.width() // 2, center.y() - self.height() // 2)
+        self.show()
+        self.filter_edit.setFocus()
+
+    def _apply_filter(self, pattern):
+        """Show the entries containing the filter text"""
+        pattern = pattern.lower()
+        self.list_widget.clear()
+        now = time.time()
+        for entry in self._entries:
+            text = entry["text"]
+            if pattern and pattern not in text.lower():
+                continue
+            preview = " ".join(text.split())
+            if len(preview) > self.PREVIEW_CHARS:
+                preview = preview[:self.PREVIEW_CHARS - 1] + "…"
+            number = self.list_widget.count() + 1
+            prefix = f"{number}. " if number <= 9 else ""
+            item = QListWidgetItem(f"{prefix}{preview}  ({_age(now - entry.get('time', now))})")
+            item.setData(Qt.UserRole, text)
+            item.setToolTip(text)
+            self.list_widget.addItem(item)
+
+        has_items = self.list_widget.count() > 0
+        self.list_widget.setVisible(has_items)
+        self.empty_label.setVisible(not has_items)
+        if has_items:
+            self.list_widget.setCurrentRow(0)
+
+    def _pick_current(self):
+        item = self.list_widget.currentItem()
+        if item is not None:
+            self._pick_item(item)
+
+    def _pick_item(self, item):
+        self.hide()
+        self.entry_selected.emit(item.data(Qt.UserRole))
+
+    def eventFilter(self, watched, event):
+        """Move through the list and pick by number while typing in the filter"""
+        if watched is self.filter_edit and event.type() == event.KeyPress:
+            key = event.key()
+            if key in (Qt.Key_Down, Qt.Key_Up):
+                row = self.list_widget.currentRow() + (1 if key == Qt.Key_Down else -1)
+                if 0 <= row < self.list_widget.count():
+                    self.list_widget.setCurrentRow(row)
+                return True
+            if event.modifiers() & Qt.AltModifier and Qt.Key_1 <= key <= Qt.Key_9:
+                item = self.list_widget.item(key - Qt.Key_1)
+                if item is not None:
+                    self._pick_item(item)
+                return True
+        return super().eventFilter(watched, event)
+
+
+def _age(seconds):
+    """Short human-readable age: 5 s, 3 min, 2 h, 4 d"""
+    if seconds < 60:
+        return f"{int(seconds)} s"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} min"
+    if seconds < 86400:
+        return f"{int(seconds // 3600)} h"
+    return f"{int(seconds // 86400)} d"
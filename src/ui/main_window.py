@@ -2,13 +2,17 @@ import os
 import sys
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-    QPushButton, QTextEdit, QLabel, QStatusBar,
+    QPushButton, QLabel, QStatusBar,
     QComboBox, QAction, QMessageBox, QShortcut, QApplication,
-    QFrame, QSizePolicy, QProgressBar
+    QFrame, QSizePolicy
 )
 from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QSize
 from PyQt5.QtGui import QIcon, QKeySequence, QFont, QColor, QPalette, QPixmap
 
+from src.ui.waveform_widget import WaveformWidget
+from src.ui.history_popup import HistoryPopup
+from src.ui.transcript_view import TranscriptView
+
 class StyleHelper:
     """Helper class for UI styling"""
     
@@ -99,9 +103,27 @@ class StyleHelper:
 class MainWindow(QMainWindow):
     """Main application window"""
     
+    # Redraw rate cap for the waveform and level meter
+    LEVEL_FPS = 30
+    
     # Signal to communicate with audio recording thread
     start_recording_signal = pyqtSignal()
     stop_recording_signal = pyqtSignal()
+    calibrate_noise_signal = pyqtSignal()
+    
+    # Text the user asked to copy (button, menu or Ctrl+C), and an entry
+    # picked from the clipboard history
+    copy_requested_signal = pyqtSignal(str)
+    history_selected_signal = pyqtSignal(str)
+    
+    # Continuous dictation switched on (True) or off (False)
+    continuous_dictation_signal = pyqtSignal(bool)
+    
+    # Profiling of recordings turned on or off from the Help menu
+    profiling_signal = pyqtSignal(bool)
+    
+    # Emitted once, after the window has been painted for the first time
+    first_paint_signal = pyqtSignal()
     
     def __init__(self):
         super().__init__()
@@ -129,9 +151,23 @@ class MainWindow(QMainWindow):
         
         # Recording state
         self.is_recording = False
+        self.is_listening = False
+        self.is_calibrating = False
         self.recording_timer = QTimer(self)
         self.recording_timer.timeout.connect(self._update_recording_time)
         self.recording_time = 0
+        
+        # Single redraw timer for the level display, reused across recordings
+        self.level_timer = QTimer(self)
+        self.level_timer.setInterval(1000 // self.LEVEL_FPS)
+        self.level_timer.timeout.connect(self._update_levels)
+        
+        self._painted = False
+        
+        # Clipboard history quick-pick, filled by set_clipboard_history()
+        self.clipboard_history = None
+        self.history_popup = HistoryPopup(self)
+        self.history_popup.entry_selected.connect(self.history_selected_signal.emit)
     
     def _set_application_style(self):
         """Set global application style"""
@@ -210,7 +246,7 @@ class MainWindow(QMainWindow):
         # Copy action
         copy_action = QAction("&Copy", self)
         copy_action.setShortcut("Ctrl+C")
-        copy_action.setStatusTip("Copy transcription to clipboard")
+        copy_action.setStatusTip("Copy the selection or the newest transcription to clipboard")
         copy_action.triggered.connect(self.copy_to_clipboard)
         edit_menu.addAction(copy_action)
         
@@ -221,9 +257,41 @@ class MainWindow(QMainWindow):
         clear_action.triggered.connect(self.clear_transcription)
         edit_menu.addAction(clear_action)
         
+        # Clipboard history action
+        history_action = QAction("Clipboard &History...", self)
+        history_action.setShortcut("Ctrl+Shift+V")
+        history_action.setStatusTip("Copy an earlier transcription again")
+        history_action.triggered.connect(self.show_clipboard_history)
+        edit_menu.addAction(history_action)
+        
+        edit_menu.addSeparator()
+        
+        # Continuous dictation toggle
+        self.continuous_action = QAction("Continuous &Dictation", self)
+        self.continuous_action.setCheckable(True)
+        self.continuous_action.setShortcut("F3")
+        self.continuous_action.setStatusTip("Listen continuously and transcribe every utterance")
+        self.continuous_action.toggled.connect(self.set_continuous_dictation)
+        edit_menu.addAction(self.continuous_action)
+        
+        # Noise calibration action
+        self.calibrate_action = QAction("Calibrate &Noise", self)
+        self.calibrate_action.setStatusTip("Record background noise for noise suppression")
+        self.calibrate_action.triggered.connect(self.calibrate_noise_signal.emit)
+        edit_menu.addAction(self.calibrate_action)
+        
         # Help menu
         help_menu = menu_bar.addMenu("&Help")
         
+        # Profiling toggle (on from the start with DEBUG=true)
+        self.profile_action = QAction("&Profile Recordings", self)
+        self.profile_action.setCheckable(True)
+        self.profile_action.setStatusTip("Save a cProfile and torch profile of every record, transcribe and copy cycle")
+        self.profile_action.toggled.connect(self.profiling_signal.emit)
+        help_menu.addAction(self.profile_action)
+        
+        help_menu.addSeparator()
+        
         # About action
         about_action = QAction("&About", self)
         about_action.setStatusTip("About the application")
@@ -241,6 +309,9 @@ class MainWindow(QMainWindow):
         self.record_action.triggered.connect(self.toggle_recording)
         toolbar.addAction(self.record_action)
         
+        # Continuous dictation toggle (created with the Edit menu)
+        toolbar.addAction(self.continuous_action)
+        
         # Spacer
         spacer = QWidget()
         spacer.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
@@ -298,30 +369,15 @@ class MainWindow(QMainWindow):
         self.visualization_frame = QFrame()
         self.visualization_frame.setFrameShape(QFrame.StyledPanel)
         self.visualization_frame.setMinimumHeight(60)
-        self.visualization_frame.setMaximumHeight(60)
+        self.visualization_frame.setMaximumHeight(80)
         StyleHelper.set_frame_style(self.visualization_frame)
         
-        # Status indicator
-        self.status_indicator = QProgressBar()
-        self.status_indicator.setRange(0, 100)
-        self.status_indicator.setValue(0)
-        self.status_indicator.setTextVisible(False)
-        self.status_indicator.setStyleSheet("""
-            QProgressBar {
-                background-color: #f5f5f5;
-                border: none;
-                border-radius: 4px;
-                height: 5px;
-            }
-            QProgressBar::chunk {
-                background-color: #2979ff;
-                border-radius: 4px;
-            }
-        """)
+        # Live waveform and level meter fed by the recorder
+        self.waveform = WaveformWidget()
         
         viz_layout = QVBoxLayout(self.visualization_frame)
-        viz_layout.addWidget(QLabel("Recording status:"))
-        viz_layout.addWidget(self.status_indicator)
+        viz_layout.setContentsMargins(6, 6, 6, 6)
+        viz_layout.addWidget(self.waveform)
         
         controls_layout.addWidget(self.visualization_frame)
         
@@ -339,7 +395,7 @@ class MainWindow(QMainWindow):
         StyleHelper.set_label_style(self.transcription_label, heading=True)
         self.layout.addWidget(self.transcription_label)
         
-        self.transcription_text = QTextEdit()
+        self.transcription_text = TranscriptView()
         self.transcription_text.setReadOnly(False)  # Allow editing
         self.transcription_text.setMinimumHeight(150)
         StyleHelper.set_text_area_style(self.transcription_text)
@@ -366,9 +422,8 @@ class MainWindow(QMainWindow):
         self.record_shortcut = QShortcut(QKeySequence("F2"), self)
         self.record_shortcut.activated.connect(self.toggle_recording)
         
-        # Ctrl+C to copy to clipboard
-        self.copy_shortcut = QShortcut(QKeySequence("Ctrl+C"), self)
-        self.copy_shortcut.activated.connect(self.copy_to_clipboard)
+        # Ctrl+C is the shortcut of the Edit > Copy action; a second
+        # QShortcut for it would make the key sequence ambiguous
         
         # Ctrl+L to clear transcription
         self.clear_shortcut = QShortcut(QKeySequence("Ctrl+L"), self)
@@ -376,6 +431,8 @@ class MainWindow(QMainWindow):
     
     def toggle_recording(self):
         """Toggle recording state"""
+        if self.is_listening or self.is_calibrating:
+            return
         if not self.is_recording:
             self.start_recording()
         else:
@@ -389,8 +446,10 @@ class MainWindow(QMainWindow):
         self.recording_status.setText("Recording...")
         self.status_bar.showMessage("Recording in progress...")
         
-        # Update status indicator
-        self._animate_recording()
+        # Start the level display
+        self.waveform.clear()
+        self.waveform.set_active(True)
+        self.level_timer.start()
         
         # Start the timer
         self.recording_time = 0
@@ -408,20 +467,9 @@ class MainWindow(QMainWindow):
         self.recording_status.setText("Processing...")
         self.status_bar.showMessage("Processing audio...")
         
-        # Update status indicator
-        self.status_indicator.setValue(0)
-        self.status_indicator.setStyleSheet("""
-            QProgressBar {
-                background-color: #f5f5f5;
-                border: none;
-                border-radius: 4px;
-                height: 5px;
-            }
-            QProgressBar::chunk {
-                background-color: #2979ff;
-                border-radius: 4px;
-            }
-        """)
+        # Stop the level display
+        self.level_timer.stop()
+        self.waveform.set_active(False)
         
         # Stop the timer
         self.recording_timer.stop()
@@ -429,41 +477,90 @@ class MainWindow(QMainWindow):
         # Emit signal to stop recording
         self.stop_recording_signal.emit()
     
-    def _animate_recording(self):
-        """Animate the recording indicator"""
-        # Update status indicator style to indicate recording
-        self.status_indicator.setStyleSheet("""
-            QProgressBar {
-                background-color: #f5f5f5;
-                border: none;
-                border-radius: 4px;
-                height: 8px;
-            }
-            QProgressBar::chunk {
-                background-color: #f44336;
-                border-radius: 4px;
-            }
-        """)
+    def set_continuous_dictation(self, enabled):
+        """
+        Switch continuous dictation on or off.
+        
+        Args:
+            enabled: Whether to listen continuously
+        """
+        if enabled == self.is_listening:
+            return
+        if enabled and (self.is_recording or self.is_calibrating):
+            # A manual recording or noise calibration is in progress
+            self.continuous_action.setChecked(False)
+            return
         
-        # Start animation
-        self.animation_timer = QTimer(self)
-        self.animation_timer.timeout.connect(self._update_animation)
-        self.animation_timer.start(50)  # Update every 50ms
+        self.is_listening = enabled
+        self.continuous_action.setChecked(enabled)
+        self.record_btn.setEnabled(not enabled)
+        self.record_action.setEnabled(not enabled)
+        if enabled:
+            self.set_listening_status("Listening...")
+            self.status_bar.showMessage("Continuous dictation: speak, pause to transcribe (F3 to stop)")
+            self.waveform.clear()
+            self.waveform.set_active(True)
+            self.level_timer.start()
+        else:
+            self.recording_status.setText("Ready")
+            self.status_bar.showMessage("Continuous dictation stopped", 3000)
+            self.level_timer.stop()
+            self.waveform.set_active(False)
+        
+        self.continuous_dictation_signal.emit(enabled)
     
-    def _update_animation(self):
-        """Update the animation for recording visualization"""
-        if not self.is_recording:
-            self.animation_timer.stop()
+    def set_calibrating(self, calibrating):
+        """
+        Block recording while the noise profile is being recorded.
+        
+        Args:
+            calibrating: Whether a calibration recording is running
+        """
+        self.is_calibrating = calibrating
+        self.calibrate_action.setEnabled(not calibrating)
+        self.record_btn.setEnabled(not calibrating)
+        self.record_action.setEnabled(not calibrating)
+        self.continuous_action.setEnabled(not calibrating)
+    
+    def set_profiling(self, enabled):
+        """
+        Check or uncheck Help > Profile Recordings.
+        
+        Args:
+            enabled: Whether recordings are profiled
+        """
+        self.profile_action.setChecked(enabled)
+    
+    def set_listening_status(self, text):
+        """Show the continuous dictation state (listening, asleep, ...)"""
+        if self.is_listening:
+            self.recording_status.setText(text)
+    
+    def append_transcription(self, text):
+        """
+        Add an utterance transcribed in continuous dictation.
+        
+        Args:
+            text: Transcription of the utterance
+        """
+        self.transcription_text.append_text(text, separator=" ")
+    
+    def set_level_source(self, level_meter):
+        """
+        Set the LevelMeter that drives the waveform and level display.
+        
+        Args:
+            level_meter: LevelMeter filled by the audio recorder
+        """
+        self.waveform.set_level_meter(level_meter)
+    
+    def _update_levels(self):
+        """Redraw the waveform and level meter from the latest audio"""
+        if not self.is_recording and not self.is_listening:
+            self.level_timer.stop()
             return
-            
-        # Simple bouncing animation
-        current = self.status_indicator.value()
-        if current >= 100:
-            self.animation_direction = -1
-        elif current <= 0:
-            self.animation_direction = 1
-            
-        self.status_indicator.setValue(current + self.animation_direction * 5)
+        
+        self.waveform.refresh()
     
     def _update_recording_time(self):
         """Update the recording time display"""
@@ -473,25 +570,55 @@ class MainWindow(QMainWindow):
         self.timer_label.setText(f"{minutes:02d}:{seconds:02d}")
     
     def set_transcription(self, text):
-        """Set the transcription text"""
-        self.transcription_text.setText(text)
+        """
+        Show a new transcription below the earlier ones.
+        
+        Earlier text, including the user's edits, is kept; only the new
+        text is added to the document.
+        
+        Args:
+            text: The transcription
+        """
+        if text:
+            self.transcription_text.append_text(text)
         self.recording_status.setText("Ready")
         self.status_bar.showMessage("Transcription complete", 3000)
     
     def get_transcription(self):
         """Get the current transcription text"""
+        self.transcription_text.flush()
         return self.transcription_text.toPlainText()
     
     def copy_to_clipboard(self):
-        """Copy the transcription to clipboard"""
-        text = self.get_transcription()
+        """
+        Ask the application to copy the selected text to the clipboard, or
+        the newest transcription if nothing is selected.
+        """
+        text = self.transcription_text.selected_text()
+        if not text:
+            text = self.transcription_text.last_segment() or self.get_transcription()
         if text:
-            # This will be implemented by connecting to ClipboardManager
-            self.status_bar.showMessage("Copied to clipboard!", 3000)
+            self.copy_requested_signal.emit(text)
+    
+    def set_clipboard_history(self, clipboard_history):
+        """
+        Set the ClipboardHistory shown by the quick-pick popup.
+        
+        Args:
+            clipboard_history: ClipboardHistory kept by the application
+        """
+        self.clipboard_history = clipboard_history
+    
+    def show_clipboard_history(self):
+        """Open the clipboard history quick-pick"""
+        if self.clipboard_history is None:
+            return
+        self.history_popup.set_entries(self.clipboard_history.entries())
+        self.history_popup.popup(self.transcription_text)
     
     def clear_transcription(self):
         """Clear the transcription text area"""
-        self.transcription_text.clear()
+        self.transcription_text.clear_transcript()
         self.status_bar.showMessage("Transcription cleared", 3000)
     
     def _show_about(self):
@@ -505,8 +632,18 @@ class MainWindow(QMainWindow):
             "Version: 1.0.0"
         )
     
+    def paintEvent(self, event):
+        """Paint the window and announce the first paint"""
+        super().paintEvent(event)
+        if not self._painted:
+            self._painted = True
+            # Queued so listeners run after painting has finished
+            QTimer.singleShot(0, self.first_paint_signal.emit)
+    
     def closeEvent(self, event):
         """Handle application close event"""
         if self.is_recording:
             self.stop_recording()
+        if self.is_listening:
+            self.set_continuous_dictation(False)
         event.accept() 
\ No newline at end of file
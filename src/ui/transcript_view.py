@@ -0,0 +1,167 @@
+from PyQt5.QtWidgets import QTextEdit
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QTextCursor
+
+class TranscriptView(QTextEdit):
+    """
+    Transcript editor that is updated by small edits instead of setText().
+
+    The document is a sequence of segments, one per transcription. Only the
+    last segment, the live one, belongs to the application: set_live_text()
+    patches the changed part of it through a QTextCursor, and commit()
+    hands it over to the user. Everything before the live segment is never
+    touched again, so edits made there survive new results. If the user
+    edits the live segment itself, it is committed as it is and new text
+    starts a new segment.
+
+    Updates are queued and applied together once per frame, so the cost of
+    an update depends on the size of the change, not of the document.
+    """
+
+    FRAME_MS = 16
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Text of the live segment as last written; it always ends the
+        # document, so it is located from the end and edits above it do
+        # not move it
+        self._live_text = ""
+        self._live_separator = ""
+        # Tracks where the newest segment starts; QTextCursor positions
+        # follow the user's edits above it
+        self._segment_start = None
+        self._pending = []
+        self.updates_applied = 0
+
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.setInterval(self.FRAME_MS)
+        self._frame_timer.timeout.connect(self.flush)
+
+    def append_text(self, text, separator="\n"):
+        """
+        Add a finished transcription as a new segment.
+
+        Args:
+            text: The transcription
+            separator: Put between the previous text and this one
+        """
+        self._queue(("live", text, separator))
+        self._queue(("commit",))
+
+    def set_live_text(self, text, separator="\n"):
+        """
+        Show a transcription that may still change (e.g. a partial result).
+
+        Args:
+            text: Current text of the live segment
+            separator: Put before the segment if it is a new one
+        """
+        self._queue(("live", text, separator))
+
+    def commit(self):
+        """Hand the live segment over to the user"""
+        self._queue(("commit",))
+
+    def clear_transcript(self):
+        """Remove all text and forget the live segment"""
+        self._pending.clear()
+        self._frame_timer.stop()
+        self._live_text = ""
+        self._live_separator = ""
+        self._segment_start = None
+        self.clear()
+
+    def last_segment(self):
+        """
+        Get the newest transcription, with any edits the user made to it.
+
+        Returns:
+            str: Text of the newest segment, or "" if there is none
+        """
+        self.flush()
+        if self._segment_start is None:
+            return ""
+        cursor = QTextCursor(self.document())
+        start = min(self._segment_start.position(), self._document_length())
+        return self._document_text(cursor, start, self._document_length()).strip()
+
+    def selected_text(self):
+        """Plain text of the user's selection, or "" if nothing is selected"""
+        return self.textCursor().selectedText().replace("\u2029", "\n")
+
+    def _queue(self, update):
+        """Queue an update for the next frame, replacing a superseded one"""
+        if update[0] == "live" and self._pending and self._pending[-1][0] == "live":
+            self._pending[-1] = update
+        else:
+            self._pending.append(update)
+        if not self._frame_timer.isActive():
+            self._frame_timer.start()
+
+    def flush(self):
+        """Apply the queued updates now"""
+        self._frame_timer.stop()
+        if not self._pending:
+            return
+        updates, self._pending = self._pending, []
+
+        scrollbar = self.verticalScrollBar()
+        follow = scrollbar.value() >= scrollbar.maximum() - 4
+
+        cursor = QTextCursor(self.document())
+        cursor.beginEditBlock()
+        for update in updates:
+            if update[0] == "commit":
+                self._live_text = ""
+                self._live_separator = ""
+            else:
+                self._patch_live(cursor, update[1], update[2])
+        cursor.endEditBlock()
+        self.updates_applied += len(updates)
+
+        if follow:
+            scrollbar.setValue(scrollbar.maximum())
+
+    def _document_length(self):
+        """Characters in the document, without the final paragraph separator"""
+        return self.document().characterCount() - 1
+
+    def _patch_live(self, cursor, text, separator):
+        """Make the live segment show text, rewriting only what changed"""
+        length = self._document_length()
+        live = self._live_separator + self._live_text
+        start = length - len(live)
+
+        if live and (start < 0 or self._document_text(cursor, start, length) != live):
+            # The user edited the live segment: keep it and start a new one
+            self._live_text = ""
+            self._live_separator = ""
+            live = ""
+            start = length
+
+        if not live:
+            # A new segment; the separator is only needed after other text
+            needs_separator = length > 0 and not self.document().characterAt(length - 1).isspace()
+            self._live_separator = separator if needs_separator else ""
+
+        new = self._live_separator + text
+        common = 0
+        limit = min(len(live), len(new))
+        while common < limit and live[common] == new[common]:
+            common += 1
+
+        cursor.setPosition(start + common)
+        cursor.setPosition(length, QTextCursor.KeepAnchor)
+        cursor.insertText(new[common:])
+        self._live_text = text
+        if self._segment_start is None:
+            self._segment_start = QTextCursor(self.document())
+        self._segment_start.setPosition(start)
+
+    def _document_text(self, cursor, start, end):
+        """Plain text of a range of the document"""
+        cursor.setPosition(start)
+        cursor.setPosition(end, QTextCursor.KeepAnchor)
+        # Qt returns paragraph breaks as U+2029
+        return cursor.selectedText().replace("\u2029", "\n")
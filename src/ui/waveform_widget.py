@@ -0,0 +1,125 @@
+import math
+from PyQt5.QtWidgets import QWidget, QSizePolicy
+from PyQt5.QtCore import Qt, QLineF, QRectF
+from PyQt5.QtGui import QPainter, QColor, QPen
+
+class WaveformWidget(QWidget):
+    """
+    Scrolling waveform with an RMS/peak level meter.
+
+    The widget pulls the newest envelope columns from a LevelMeter when
+    refresh() is called. Only as many columns as there are pixels are
+    drawn, so the cost of a frame does not depend on the recording length.
+    """
+
+    METER_WIDTH = 14
+    FLOOR_DB = -60.0
+    PEAK_DECAY_DB = 1.5  # Peak hold decay per refresh
+
+    WAVE_COLOR = "#2979ff"
+    ACTIVE_COLOR = "#f44336"
+    GRID_COLOR = "#e0e0e0"
+    CLIP_COLOR = "#ff9800"
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.level_meter = None
+        self.active = False
+
+        self._mins = []
+        self._maxs = []
+        self._rms_db = self.FLOOR_DB
+        self._peak_db = self.FLOOR_DB
+        self._peak_hold_db = self.FLOOR_DB
+
+        self.setMinimumHeight(36)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+
+    def set_level_meter(self, level_meter):
+        """Set the LevelMeter the widget reads from"""
+        self.level_meter = level_meter
+        self.clear()
+
+    def set_active(self, active):
+        """Switch between the recording and idle colour scheme"""
+        self.active = active
+        self.update()
+
+    def clear(self):
+        """Reset the displayed waveform and levels"""
+        self._mins = []
+        self._maxs = []
+        self._rms_db = self.FLOOR_DB
+        self._peak_db = self.FLOOR_DB
+        self._peak_hold_db = self.FLOOR_DB
+        self.update()
+
+    def refresh(self):
+        """Pull the newest levels from the meter and schedule a repaint"""
+        if self.level_meter is None:
+            return
+
+        columns = max(0, self.width() - self.METER_WIDTH - 6)
+        mins, maxs, _ = self.level_meter.snapshot(columns)
+        self._mins = mins.tolist()
+        self._maxs = maxs.tolist()
+
+        rms, peak = self.level_meter.level
+        self._rms_db = self._to_db(rms)
+        self._peak_db = self._to_db(peak)
+        self._peak_hold_db = max(self._peak_db, self._peak_hold_db - self.PEAK_DECAY_DB)
+
+        self.update()
+
+    def _to_db(self, value):
+        """Convert a linear amplitude to dBFS clamped to the meter floor"""
+        if value <= 0:
+            return self.FLOOR_DB
+        return max(self.FLOOR_DB, min(0.0, 20.0 * math.log10(value)))
+
+    def _db_fraction(self, db):
+        """Map a dBFS value to the 0..1 range of the meter"""
+        return (db - self.FLOOR_DB) / -self.FLOOR_DB
+
+    def paintEvent(self, event):
+        """Draw the waveform envelope and the level meter"""
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("white"))
+
+        height = self.height()
+        wave_width = max(0, self.width() - self.METER_WIDTH - 6)
+        middle = height / 2.0
+        half = middle - 2
+
+        # Center line
+        painter.setPen(QPen(QColor(self.GRID_COLOR), 1))
+        painter.drawLine(QLineF(0, middle, wave_width, middle))
+
+        # Waveform envelope, newest column at the right edge
+        color = self.ACTIVE_COLOR if self.active else self.WAVE_COLOR
+        painter.setPen(QPen(QColor(color), 1))
+        offset = wave_width - len(self._mins)
+        lines = [
+            QLineF(offset + i + 0.5, middle - hi * half, offset + i + 0.5, middle - lo * half)
+            for i, (lo, hi) in enumerate(zip(self._mins, self._maxs))
+        ]
+        if lines:
+            painter.drawLines(lines)
+
+        # Level meter: RMS bar with a peak hold marker
+        meter_x = self.width() - self.METER_WIDTH
+        painter.fillRect(QRectF(meter_x, 0, self.METER_WIDTH, height), QColor(self.GRID_COLOR))
+
+        rms_height = self._db_fraction(self._rms_db) * height
+        painter.fillRect(
+            QRectF(meter_x, height - rms_height, self.METER_WIDTH, rms_height),
+            QColor(color)
+        )
+
+        peak_color = self.CLIP_COLOR if self._peak_hold_db >= -1.0 else color
+        peak_y = height - self._db_fraction(self._peak_hold_db) * height
+        painter.setPen(QPen(QColor(peak_color), 2))
+        painter.drawLine(QLineF(meter_x, peak_y, meter_x + self.METER_WIDTH, peak_y))
+
+        painter.end()
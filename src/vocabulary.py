@@ -0,0 +1,337 @@
+import os
+import time
+import threading
+from collections import deque
+
+from src.text_normalization import TURN_PREFIX
+
+# Where the user's dictionary lives unless VOCABULARY_FILE says otherwise
+DEFAULT_VOCABULARY_FILE = "~/.config/speech2clipboard/vocabulary.txt"
+
+# Spoken commands available without a dictionary file
+DEFAULT_COMMANDS = {
+    "új sor": "\n",
+    "új bekezdés": "\n\n",
+    "pont": ".",
+    "vessző": ",",
+    "kérdőjel": "?",
+    "felkiáltójel": "!",
+    "kettőspont": ":",
+    "pontosvessző": ";",
+    "gondolatjel": "–",
+    "nyitó zárójel": "(",
+    "záró zárójel": ")",
+    "idézőjel": "\"",
+}
+
+# Replacements made of these characters are attached to the previous word
+ATTACH_LEFT = set(".,;:?!…)")
+
+# Replacements made of these characters are attached to the next word
+ATTACH_RIGHT = set("(")
+
+
+class PhraseMatcher:
+    """
+    Word-level Aho-Corasick automaton.
+
+    Phrases are sequences of words. find() scans a list of words once and
+    returns the leftmost-longest non-overlapping matches, so "új sor" wins
+    over "új" and a phrase is never matched inside a longer one that
+    starts earlier.
+
+    Phrases can be added and removed after the automaton was built; build()
+    then only recomputes the failure links, the trie itself is kept.
+    """
+
+    def __init__(self):
+        # Node 0 is the root; per node: word -> child, failure link,
+        # (length, value) if a phrase ends here, and the nearest node on
+        # the failure chain where a phrase ends (-1 for none)
+        self.children = [{}]
+        self.fail = [0]
+        self.output = [None]
+        self.output_link = [-1]
+        self.count = 0
+        self._dirty = False
+
+    def __len__(self):
+        return self.count
+
+    def add(self, words, value):
+        """
+        Add a phrase (or replace its value).
+
+        Args:
+            words: Sequence of lowercase words
+            value: Returned with every match of the phrase
+        """
+        node = 0
+        for word in words:
+            child = self.children[node].get(word)
+            if child is None:
+                child = len(self.children)
+                self.children.append({})
+                self.fail.append(0)
+                self.output.append(None)
+                self.output_link.append(-1)
+                self.children[node][word] = child
+            node = child
+        if self.output[node] is None:
+            self.count += 1
+        self.output[node] = (len(words), value)
+        self._dirty = True
+
+    def remove(self, words):
+        """Remove a phrase; its trie nodes stay and are reused if it returns"""
+        node = 0
+        for word in words:
+            node = self.children[node].get(word)
+            if node is None:
+                return
+        if self.output[node] is not None:
+            self.output[node] = None
+            self.count -= 1
+            self._dirty = True
+
+    def build(self):
+        """Compute the failure and output links (breadth-first over the trie)"""
+        queue = deque()
+        for child in self.children[0].values():
+            self.fail[child] = 0
+            self.output_link[child] = -1
+            queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+            for word, child in self.children[node].items():
+                state = self.fail[node]
+                while state and word not in self.children[state]:
+                    state = self.fail[state]
+                self.fail[child] = self.children[state].get(word, 0)
+                fallback = self.fail[child]
+                self.output_link[child] = fallback if self.output[fallback] is not None else self.output_link[fallback]
+                queue.append(child)
+        self._dirty = False
+
+    def find(self, words):
+        """
+        Find the leftmost-longest non-overlapping phrases in a word list.
+
+        Args:
+            words: Lowercase words
+
+        Returns:
+            list: (start, end, value) for words[start:end], in order
+        """
+        if self._dirty:
+            self.build()
+
+        # Longest phrase starting at every position
+        longest = {}
+        state = 0
+        for position, word in enumerate(words):
+            while state and word not in self.children[state]:
+                state = self.fail[state]
+            state = self.children[state].get(word, 0)
+
+            node = state if self.output[state] is not None else self.output_link[state]
+            while node > 0:
+                length, value = self.output[node]
+                start = position + 1 - length
+                if start not in longest or longest[start][0] < position + 1:
+                    longest[start] = (position + 1, value)
+                node = self.output_link[node]
+
+        matches = []
+        position = 0
+        while position < len(words):
+            if position in longest:
+                end, value = longest[position]
+                matches.append((position, end, value))
+                position = end
+            else:
+                position += 1
+        return matches
+
+
+def parse_vocabulary(text):
+    """
+    Parse a vocabulary file.
+
+    One entry per line, "spoken words = replacement". Lines starting with
+    # are comments. "\\n" in a replacement is a line break, and an empty
+    replacement deletes the spoken words (e.g. filler words).
+
+    Returns:
+        dict: Tuple of lowercase spoken words -> replacement
+    """
+    entries = {}
+    for number, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        spoken, separator, replacement = line.partition("=")
+        words = tuple(spoken.lower().split())
+        if not separator or not words:
+            print(f"Ignoring vocabulary line {number}: {line!r}")
+            continue
+        entries[words] = replacement.strip().replace("\\n", "\n")
+    return entries
+
+
+class Vocabulary:
+    """
+    User vocabulary and spoken commands applied to transcriptions.
+
+    Replaces spoken phrases with their written form ("szpíd tu klipbord"
+    -> "Speech2Clipboard") and turns commands into punctuation and line
+    breaks ("vessző" -> ",", "új sor" -> line break). Runs before the
+    TextNormalizer, in one pass over the words of the transcript.
+
+    The dictionary file is checked for changes at most once per
+    check_interval seconds and changed entries are applied to the
+    existing matcher.
+    """
+
+    def __init__(self, path=None, commands=True, check_interval=1.0):
+        """
+        Initialize the vocabulary.
+
+        Args:
+            path: Dictionary file (None = built-in commands only; the file
+                does not have to exist yet)
+            commands: Include DEFAULT_COMMANDS (file entries override them)
+            check_interval: Seconds between modification time checks
+        """
+        self.path = path
+        self.commands = dict(DEFAULT_COMMANDS) if commands else {}
+        self.check_interval = check_interval
+        self.matcher = PhraseMatcher()
+        self.entries = {}
+        self._mtime = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+        self._mtime = self._file_mtime()
+        self._apply_entries(self._load())
+
+    def _file_mtime(self):
+        """Modification time of the dictionary file (None if it is missing)"""
+        try:
+            return os.stat(self.path).st_mtime_ns if self.path else None
+        except OSError:
+            return None
+
+    def _load(self):
+        """Read the commands and the dictionary file into one dict"""
+        entries = {tuple(spoken.split()): written for spoken, written in self.commands.items()}
+        if self.path:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    entries.update(parse_vocabulary(f.read()))
+            except FileNotFoundError:
+                pass
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"Error reading vocabulary {self.path}: {e}")
+        return entries
+
+    def _apply_entries(self, entries):
+        """
+        Update the matcher to the given entries.
+
+        Returns:
+            tuple: (added or changed, removed) entry counts
+        """
+        changed = [words for words, written in entries.items() if self.entries.get(words) != written]
+        removed = [words for words in self.entries if words not in entries]
+        for words in removed:
+            self.matcher.remove(words)
+        for words in changed:
+            self.matcher.add(words, entries[words])
+        self.matcher.build()
+        self.entries = entries
+        return len(changed), len(removed)
+
+    def reload_if_changed(self, force=False):
+        """
+        Apply changes of the dictionary file.
+
+        Args:
+            force: Check the file even if check_interval has not passed
+
+        Returns:
+            bool: Whether the vocabulary was reloaded
+        """
+        if not self.path:
+            return False
+        now = time.monotonic()
+        if not force and now - self._checked < self.check_interval:
+            return False
+        self._checked = now
+
+        mtime = self._file_mtime()
+        if mtime == self._mtime:
+            return False
+        self._mtime = mtime
+
+        with self._lock:
+            added, removed = self._apply_entries(self._load())
+        if added or removed:
+            print(f"Vocabulary reloaded: {added} added or changed, {removed} removed")
+        return True
+
+    def process(self, text):
+        """
+        Apply the vocabulary to a transcription.
+
+        Args:
+            text: Recognizer output
+
+        Returns:
+            str: Text with phrases replaced and commands applied
+        """
+        self.reload_if_changed()
+        lines = []
+        for line in text.split("\n"):
+            match = TURN_PREFIX.match(line)
+            if match:
+                lines.append(match.group(1) + self.apply(match.group(2)))
+            else:
+                lines.append(self.apply(line))
+        return "\n".join(lines)
+
+    def apply(self, text):
+        """Apply the vocabulary to one line of text"""
+        words = text.split()
+        with self._lock:
+            matches = self.matcher.find([word.lower() for word in words])
+        if not matches:
+            return text
+
+        output = []
+        glue = True  # no space before the next piece
+        position = 0
+        for start, end, written in matches + [(len(words), len(words), None)]:
+            for word in words[position:start]:
+                output.append(word if glue else " " + word)
+                glue = False
+            position = end
+            if not written:
+                continue
+            if "\n" in written:
+                if output:
+                    output[-1] = output[-1].rstrip()
+                output.append(written)
+                glue = True
+            elif set(written) <= ATTACH_LEFT:
+                output.append(written)
+                glue = False
+            elif set(written) <= ATTACH_RIGHT:
+                output.append(written if glue else " " + written)
+                glue = True
+            else:
+                output.append(written if glue else " " + written)
+                glue = False
+        return "".join(output)
+
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+import numpy as np
+import pytest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+sf = pytest.importorskip("soundfile")
+
+from src.audio_archive import ArchiveWriter, ArchiveReader, AudioArchive, load_audio
+
+SAMPLE_RATE = 16000
+
+def tone(seconds, channels=1):
+    """A quiet two-tone signal, one frequency per channel"""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    audio = np.stack([0.3 * np.sin(2 * np.pi * 220 * (channel + 1) * t) for channel in range(channels)], axis=1)
+    return audio.astype(np.float32)
+
+def write_blocks(path, audio, format):
+    """Write audio the way the recorder does, in blocks"""
+    with ArchiveWriter(path, SAMPLE_RATE, audio.shape[1], format) as writer:
+        for start in range(0, len(audio), 1024):
+            writer.write(audio[start:start + 1024])
+    return writer.stats()
+
+def test_flac_round_trip(tmp_path):
+    """FLAC archives decode to the recorded samples (16-bit accuracy)"""
+    audio = tone(2.0, channels=2)
+    path = str(tmp_path / "recording.flac")
+    stats = write_blocks(path, audio, "flac")
+    assert stats["duration"] == 2.0 and stats["compression_ratio"] > 1
+
+    reader = ArchiveReader(path, block_size=4000)
+    assert (reader.sample_rate, reader.channels, reader.duration) == (SAMPLE_RATE, 2, 2.0)
+    decoded = reader.read_all()
+    assert decoded.shape == audio.shape
+    assert np.max(np.abs(decoded - audio)) < 1e-4
+    blocks = list(reader)
+    assert [len(block) for block in blocks] == [4000] * 8
+    assert np.array_equal(np.concatenate(blocks), decoded)
+
+    mono = str(tmp_path / "mono.flac")
+    write_blocks(mono, tone(1.0), "flac")
+    assert load_audio(mono).shape == (SAMPLE_RATE,)
+
+def test_opus_round_trip(tmp_path):
+    """Opus archives are lossy but keep the length and the signal"""
+    if "OPUS" not in sf.available_subtypes("OGG"):
+        pytest.skip("libsndfile was built without Opus")
+    audio = tone(2.0)
+    path = str(tmp_path / "recording.opus")
+    stats = write_blocks(path, audio, "opus")
+    assert stats["compressed_bytes"] < stats["raw_bytes"] / 4
+
+    decoded = load_audio(path)
+    assert abs(len(decoded) - len(audio)) < SAMPLE_RATE // 10
+    length = min(len(decoded), len(audio))
+    correlation = np.corrcoef(decoded[:length], audio[:length, 0])[0, 1]
+    assert correlation > 0.9
+
+def test_size_limit_deletes_oldest_first(tmp_path):
+    """ARCHIVE_MAX_MB removes the oldest recordings, never the newest"""
+    archive = AudioArchive(str(tmp_path), format="flac", max_total_mb=0.2)
+    now = time.time()
+    paths = []
+    for age in (50, 40, 30, 20, 10):
+        writer = archive.new_writer(SAMPLE_RATE)
+        writer.write(np.random.default_rng(age).uniform(-0.5, 0.5, SAMPLE_RATE * 3).astype(np.float32))
+        writer.close()
+        os.utime(writer.path, (now - age, now - age))
+        paths.append(writer.path)
+    size = os.path.getsize(paths[0])
+    assert 0.05 * 1024 * 1024 < size < 0.1 * 1024 * 1024
+
+    deleted = archive.enforce_retention()
+    assert deleted == paths[:len(deleted)] and len(deleted) >= 2
+    remaining = archive.recordings()
+    assert remaining == paths[len(deleted):]
+    assert sum(os.path.getsize(path) for path in remaining) <= 0.2 * 1024 * 1024
+
+    # A single recording larger than the limit is kept
+    archive.max_total_mb = 0.01
+    archive.enforce_retention()
+    assert archive.recordings() == [paths[-1]]
+
+def test_age_and_count_limits(tmp_path):
+    """Old recordings and recordings over the count limit are removed"""
+    archive = AudioArchive(str(tmp_path), max_age_days=1, max_files=2)
+    now = time.time()
+    paths = []
+    for age_days in (3, 0.5, 0.2, 0.1):
+        writer = archive.new_writer(SAMPLE_RATE)
+        writer.write(tone(0.1))
+        writer.close()
+        os.utime(writer.path, (now - age_days * 86400, now - age_days * 86400))
+        paths.append(writer.path)
+    (tmp_path / "notes.txt").write_text("not a recording")
+
+    assert archive.enforce_retention() == paths[:2]
+    assert archive.recordings() == paths[2:]
+    assert (tmp_path / "notes.txt").exists()
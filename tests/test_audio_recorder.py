@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import time
+import pstats
+import threading
+from types import SimpleNamespace
+import numpy as np
+import pytest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.audio_recorder import AudioRecorder
+from src.audio_archive import AudioArchive
+from src.audio_spool import AudioSpool, find_unfinished
+from src.profiling import CycleProfiler
+
+BLOCKS = [np.full((512, 1), i / 10, dtype=np.float32) for i in range(6)]
+
+class FakeInputStream:
+    """Stands in for sounddevice.InputStream: feeds fixed blocks to the callback"""
+
+    fed = threading.Event()
+    # Called after every block, e.g. to drain the recorder between blocks
+    between_blocks = None
+
+    def __init__(self, samplerate, channels, device, callback):
+        self.callback = callback
+
+    def __enter__(self):
+        for block in BLOCKS:
+            self.callback(block, len(block), None, None)
+            if FakeInputStream.between_blocks is not None:
+                FakeInputStream.between_blocks()
+        FakeInputStream.fed.set()
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+@pytest.fixture
+def fake_stream(monkeypatch):
+    FakeInputStream.fed = threading.Event()
+    FakeInputStream.between_blocks = None
+    monkeypatch.setitem(sys.modules, "sounddevice", SimpleNamespace(InputStream=FakeInputStream))
+    return FakeInputStream
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+def test_streaming_mode_hands_blocks_to_consumer(tmp_path, fake_stream):
+    """Streamed blocks reach the consumer in order and are not kept, archived or spooled"""
+    archive = AudioArchive(str(tmp_path / "archive"))
+    recorder = AudioRecorder(archive=archive, spool_dir=str(tmp_path / "spool"))
+    received = []
+    recorder.start_recording(stream_to=received.append)
+    assert wait_for(lambda: len(received) == len(BLOCKS))
+
+    audio = recorder.stop_recording()
+    assert len(audio) == 0
+    np.testing.assert_array_equal(np.concatenate(received), np.concatenate(BLOCKS))
+    assert recorder.audio_data == []
+    assert recorder.last_spool_path is None and recorder.stream_to is None
+    assert archive.recordings() == []
+    assert not os.path.exists(tmp_path / "spool") or os.listdir(tmp_path / "spool") == []
+    # The level meter still sees the audio
+    assert recorder.level_meter.columns_written() > 0
+
+def test_consumer_errors_do_not_stop_streaming(fake_stream, capsys):
+    """A failing consumer is reported and the following blocks still arrive"""
+    received = []
+
+    def consumer(block):
+        received.append(block)
+        if len(received) == 2:
+            raise RuntimeError("consumer failed")
+    recorder = AudioRecorder()
+    recorder.start_recording(stream_to=consumer)
+    assert wait_for(lambda: len(received) == len(BLOCKS))
+    recorder.stop_recording()
+    assert capsys.readouterr().out.count("Error in audio stream consumer: consumer failed") == 1
+
+def test_normal_recording_is_spooled_and_archived(tmp_path, fake_stream):
+    """Without a consumer the same blocks are returned, spooled and archived"""
+    archive = AudioArchive(str(tmp_path / "archive"))
+    recorder = AudioRecorder(archive=archive, spool_dir=str(tmp_path / "spool"))
+    recorder.start_recording()
+    assert fake_stream.fed.wait(5)
+
+    audio = recorder.stop_recording()
+    np.testing.assert_array_equal(np.asarray(audio), np.concatenate(BLOCKS))
+    assert recorder.last_spool_path is not None
+    assert len(archive.recordings()) == 1
+
+def failing_after(method, calls):
+    """Wrap an AudioSpool method so that it raises after a number of calls"""
+    count = [0]
+
+    def wrapper(spool, *args):
+        count[0] += 1
+        if count[0] > calls:
+            raise OSError("No space left on device")
+        return method(spool, *args)
+    return wrapper
+
+def test_spool_error_keeps_the_whole_recording(tmp_path, fake_stream, monkeypatch, capsys):
+    """A spool that fails after the memory window was trimmed still yields every block"""
+    recorder = AudioRecorder(spool_dir=str(tmp_path), memory_window=0.05)
+    fake_stream.between_blocks = recorder._drain_pending
+    monkeypatch.setattr(AudioSpool, "append", failing_after(AudioSpool.append, 4))
+    recorder.start_recording()
+    assert fake_stream.fed.wait(5)
+
+    audio = recorder.stop_recording()
+    assert "Error writing recording spool" in capsys.readouterr().out
+    # The start of the recording had already left memory
+    assert recorder._trimmed_frames > 0
+    np.testing.assert_array_equal(audio, np.concatenate(BLOCKS))
+    assert not recorder.spool_error and os.listdir(tmp_path) == []
+
+def test_unreadable_spool_is_kept_for_recovery(tmp_path, fake_stream, monkeypatch):
+    """If the spool cannot be finished, the memory tail is not returned as the recording"""
+    recorder = AudioRecorder(spool_dir=str(tmp_path), memory_window=0.05)
+    fake_stream.between_blocks = recorder._drain_pending
+    monkeypatch.setattr(AudioSpool, "finish", failing_after(AudioSpool.finish, 0))
+    recorder.start_recording()
+    assert fake_stream.fed.wait(5)
+
+    audio = recorder.stop_recording()
+    assert len(audio) == 0
+    assert recorder.spool_error and os.path.exists(recorder.last_spool_path)
+    spools = find_unfinished(str(tmp_path))
+    assert [info["frames"] for info in spools] == [len(np.concatenate(BLOCKS))]
+
+def test_recording_is_profiled(tmp_path, fake_stream):
+    """A profiled recording adds a record stage with the spool writes and callback times"""
+    cycle = CycleProfiler(str(tmp_path / "profiles"), enabled=True).begin_cycle()
+    recorder = AudioRecorder(spool_dir=str(tmp_path / "spool"))
+    recorder.start_recording(profile_cycle=cycle)
+    assert fake_stream.fed.wait(5)
+    with cycle.stage("stop recording"):
+        recorder.stop_recording()
+    path = cycle.finish()
+
+    report = json.loads(open(os.path.join(path, "report.json"), encoding="utf-8").read())
+    assert [stage["stage"] for stage in report["stages"]] == ["record", "stop recording"]
+    assert report["cycle"]["record_callbacks"] == len(BLOCKS)
+    assert report["cycle"]["record_callback_seconds"] > 0
+    stats = pstats.Stats(os.path.join(path, "profile.pstats"))
+    assert any(function[2] == "_drain_pending" for function in stats.stats)
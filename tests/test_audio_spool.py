@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.audio_spool import AudioSpool, find_unfinished, read_spool
+
+def test_finished_spool_maps_all_samples(tmp_path, monkeypatch):
+    """Blocks appended across a file growth read back unchanged"""
+    monkeypatch.setattr(AudioSpool, "GROW_BYTES", 4096)
+    spool = AudioSpool.create(str(tmp_path), 16000, channels=2)
+    blocks = [np.full((700, 2), i, dtype=np.float32) for i in range(5)]
+    for block in blocks:
+        spool.append(block)
+    spool.finish()
+
+    audio, info = read_spool(spool.path)
+    assert isinstance(audio, np.memmap)
+    assert info["finished"] and info["frames"] == 3500
+    np.testing.assert_array_equal(audio, np.concatenate(blocks))
+
+def test_unclosed_spool_is_recovered(tmp_path):
+    """A spool that was never closed is found with its committed frames"""
+    spool = AudioSpool.create(str(tmp_path), 16000)
+    spool.append(np.ones(1600, dtype=np.float32))
+    spool.sync()
+    # Simulate a crash: the process goes away without finish()
+
+    spools = find_unfinished(str(tmp_path))
+    assert len(spools) == 1
+    assert spools[0]["frames"] == 1600 and not spools[0]["finished"]
+    audio, _ = read_spool(spools[0]["path"])
+    np.testing.assert_array_equal(audio[:, 0], np.ones(1600))
+
+def test_empty_spools_are_cleaned_up(tmp_path):
+    """Spools without any committed audio are not offered"""
+    AudioSpool.create(str(tmp_path), 16000).finish()
+
+    assert find_unfinished(str(tmp_path)) == []
+    assert os.listdir(str(tmp_path)) == []
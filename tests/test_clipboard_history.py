@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import threading
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.clipboard_history import ClipboardHistory, BackgroundWriter
+
+def test_duplicates_move_to_front():
+    """Copying a text again moves it to the front instead of adding it twice"""
+    history = ClipboardHistory()
+    for text in ["első", "második", "első", ""]:
+        history.add(text)
+    entries = history.entries()
+    assert [entry["text"] for entry in entries] == ["első", "második"]
+    assert entries[0]["copies"] == 2
+
+def test_capacity_drops_oldest():
+    """A full history forgets its oldest entry"""
+    history = ClipboardHistory(capacity=3)
+    for number in range(5):
+        history.add(f"szöveg {number}")
+    assert [entry["text"] for entry in history.entries()] == ["szöveg 4", "szöveg 3", "szöveg 2"]
+
+def test_persistence_roundtrip(tmp_path):
+    """Saved entries come back in the same order after a restart"""
+    path = str(tmp_path / "nested" / "history.json")
+    history = ClipboardHistory(path)
+    for text in ["a", "b", "c"]:
+        history.add(text)
+    history.save()
+    assert [entry["text"] for entry in ClipboardHistory(path).entries()] == ["c", "b", "a"]
+    assert [entry["text"] for entry in ClipboardHistory(path, capacity=2).entries()] == ["c", "b"]
+    assert os.listdir(tmp_path / "nested") == ["history.json"]
+
+def test_unreadable_history_is_ignored(tmp_path):
+    """A corrupt history file starts an empty history"""
+    path = tmp_path / "history.json"
+    path.write_text("{not json", encoding="utf-8")
+    history = ClipboardHistory(str(path))
+    assert len(history) == 0
+    history.add("új")
+    history.save()
+    assert json.loads(path.read_text(encoding="utf-8"))["entries"][0]["text"] == "új"
+
+def test_history_of_another_shape_is_ignored(tmp_path):
+    """Valid JSON that is not a saved history starts an empty history"""
+    path = tmp_path / "history.json"
+    for content in ([], "x", 3, None, {"entries": "x"}):
+        path.write_text(json.dumps(content), encoding="utf-8")
+        assert len(ClipboardHistory(str(path))) == 0
+
+    # Malformed entries are skipped, the rest is kept
+    path.write_text(json.dumps({"entries": [{"text": 5}, "x", {"text": "jó"}]}), encoding="utf-8")
+    assert [entry["text"] for entry in ClipboardHistory(str(path)).entries()] == ["jó"]
+
+def test_writer_coalesces_queued_jobs():
+    """Only the latest queued job per key runs, in submission order of the keys"""
+    writer = BackgroundWriter()
+    release = threading.Event()
+    ran = []
+    writer.submit("block", release.wait)
+    for number in range(5):
+        writer.submit("clipboard", lambda number=number: ran.append(("clipboard", number)))
+    writer.submit("history", lambda: ran.append(("history", 0)))
+    release.set()
+    assert writer.flush(timeout=5)
+    assert ran == [("clipboard", 4), ("history", 0)]
+    writer.close()
+
+def test_writer_survives_failing_jobs():
+    """An exception in one job does not stop the worker"""
+    writer = BackgroundWriter()
+    ran = []
+    writer.submit("a", lambda: 1 / 0)
+    writer.submit("b", lambda: ran.append("b"))
+    writer.close()
+    assert ran == ["b"]
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import pytest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+
+from src.compiled_inference import CompiledEngine
+from src.speech_recognition import SpeechRecognizer
+
+SAMPLE_RATE = 16000
+
+def tiny_model(norm):
+    """Randomly initialized Wav2Vec2ForCTC small enough to trace in a test"""
+    torch.manual_seed(0)
+    config = transformers.Wav2Vec2Config(
+        hidden_size=16, num_hidden_layers=1, num_attention_heads=2, intermediate_size=32,
+        conv_dim=(8,) * 7, vocab_size=12, num_conv_pos_embeddings=16, num_conv_pos_embedding_groups=2,
+        feat_extract_norm=norm, do_stable_layer_norm=norm == "layer"
+    )
+    return transformers.Wav2Vec2ForCTC(config).eval()
+
+def eager_and_padded(model, length, bucket):
+    """Logits of an input run as it is and zero-padded to a bucket with a mask"""
+    input_values = torch.randn(1, length, generator=torch.Generator().manual_seed(1))
+    padded = torch.zeros(1, bucket)
+    padded[:, :length] = input_values
+    mask = torch.zeros(1, bucket, dtype=torch.long)
+    mask[:, :length] = 1
+    with torch.no_grad():
+        eager = model(input_values).logits
+        frames = eager.shape[1]
+        padded_logits = model(padded, attention_mask=mask).logits[:, :frames]
+    return input_values, eager, padded_logits
+
+def test_layer_norm_matches_eager():
+    """Compiled logits of a padded input match the eager model"""
+    model = tiny_model("layer")
+    engine = CompiledEngine(model, "tiny", buckets=(1, 2))
+    input_values, eager, _ = eager_and_padded(model, 12000, SAMPLE_RATE)
+    compiled = engine.logits(input_values)
+    assert compiled is not None and compiled.shape == eager.shape
+    assert torch.allclose(compiled, eager, atol=1e-4)
+
+def test_group_norm_is_refused():
+    """Padding changes group norm results, so such models stay in eager mode"""
+    model = tiny_model("group")
+    input_values, eager, padded = eager_and_padded(model, 12000, SAMPLE_RATE)
+    # Group norm has no attention mask: the padding leaks into the logits
+    assert not torch.allclose(padded, eager, atol=1e-3)
+
+    with pytest.raises(ValueError):
+        CompiledEngine(model, "tiny", buckets=(1, 2))
+
+    recognizer = SpeechRecognizer.__new__(SpeechRecognizer)
+    recognizer.model = model
+    recognizer.model_name = "tiny"
+    recognizer.device = "cpu"
+    recognizer.sampling_rate = SAMPLE_RATE
+    recognizer.compile_backend = "trace"
+    recognizer.compile_cache_dir = None
+    recognizer.compile_warmup = False
+    recognizer._create_engine()
+    assert recognizer.engine is None
+
+def test_buckets_share_the_weights(tmp_path):
+    """Traced buckets reuse the model's parameters and write nothing to disk"""
+    model = tiny_model("layer")
+    engine = CompiledEngine(model, "tiny", buckets=(1, 2), cache_dir=str(tmp_path))
+    engine.warmup()
+
+    weights = {parameter.data_ptr() for parameter in model.parameters()}
+    extra = 0
+    for bucket in engine.buckets:
+        for parameter in engine._compiled[bucket].parameters():
+            if parameter.data_ptr() not in weights:
+                extra += parameter.numel() * parameter.element_size()
+    assert len(engine._compiled) == 2
+    assert extra == 0
+    assert os.listdir(tmp_path) == []
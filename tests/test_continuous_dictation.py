@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.continuous_dictation import EndpointDetector, KeywordSpotter, ContinuousDictation, prefix_dtw
+
+SAMPLE_RATE = 16000
+
+# (pitch Hz, formant Hz, seconds) per syllable
+KEYWORD = [(180, 700, 0.2), (220, 1200, 0.15), (160, 500, 0.25)]
+OTHER = [(200, 2000, 0.2), (150, 900, 0.3), (250, 600, 0.15)]
+
+def syllable(pitch, formant, seconds):
+    """Voiced, vowel-like burst"""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    phase = 2 * np.pi * np.cumsum(pitch * (1 + 0.05 * np.sin(2 * np.pi * 3 * t))) / SAMPLE_RATE
+    signal = sum(np.sin(k * phase) * np.exp(-((k * pitch - formant) / 400) ** 2) for k in range(1, 30))
+    envelope = np.sin(np.pi * np.arange(len(t)) / len(t)) ** 0.5
+    return 0.2 * signal * envelope / np.abs(signal).max()
+
+def word(syllables, stretch=1.0):
+    return np.concatenate([syllable(pitch, formant, seconds * stretch) for pitch, formant, seconds in syllables])
+
+def with_noise(parts, level=0.01, seed=0):
+    """Concatenate audio parts (or seconds of silence) and add background noise"""
+    audio = np.concatenate([np.zeros(int(part * SAMPLE_RATE)) if np.isscalar(part) else part for part in parts])
+    return (audio + level * np.random.default_rng(seed).standard_normal(len(audio))).astype(np.float32)
+
+def stream(detector, audio, block=1024):
+    utterances = []
+    for start in range(0, len(audio), block):
+        utterances.extend(detector.push(audio[start:start + block]))
+    return utterances
+
+def test_utterances_are_cut_at_pauses():
+    """Each stretch of speech between pauses becomes one utterance"""
+    speech = word(KEYWORD * 3)
+    audio = with_noise([1.0, speech, 1.5, speech, 0.5, speech, 2.0])
+    detector = EndpointDetector(end_ms=400)
+    utterances = stream(detector, audio)
+    assert len(utterances) == 3
+    for utterance in utterances:
+        # Pre-roll before and a short tail after the speech
+        assert len(speech) < len(utterance) < len(speech) + 0.5 * SAMPLE_RATE
+
+def test_noise_floor_adapts():
+    """Louder background noise raises the floor instead of triggering speech"""
+    quiet = with_noise([3.0], level=0.002, seed=1)
+    loud = with_noise([30.0], level=0.02, seed=2)
+    detector = EndpointDetector()
+    assert stream(detector, quiet) == []
+    # The jump may be taken for speech once, then the floor catches up
+    assert len(stream(detector, loud)) <= 1
+    assert not detector.in_speech
+    assert detector.floor_db > -40
+
+def test_clicks_are_ignored_and_long_speech_is_split():
+    """Too-short bursts are dropped and over-long utterances are cut"""
+    click = word([(300, 1500, 0.15)])
+    detector = EndpointDetector(max_utterance_s=2.0)
+    assert stream(detector, with_noise([1.0, click, 1.0])) == []
+
+    long_speech = word(KEYWORD * 8)
+    utterances = stream(detector, with_noise([1.0, long_speech, 1.0]))
+    assert len(utterances) == 3
+    assert len(utterances[0]) == 2 * SAMPLE_RATE
+
+def test_prefix_dtw_finds_keyword_end():
+    """The alignment may stop before the end of the features"""
+    template = np.random.default_rng(0).standard_normal((10, 8))
+    features = np.concatenate([np.repeat(template, 2, axis=0), -template])
+    cost, end = prefix_dtw(template, features)
+    assert cost < 1e-9
+    assert end == 20
+
+def test_keyword_spotter():
+    """The keyword is recognized at the start of an utterance, other words are not"""
+    spotter = KeywordSpotter([with_noise([0.2, word(KEYWORD, stretch), 0.2], seed=seed)
+                              for seed, stretch in enumerate((0.9, 1.0, 1.1))])
+    spoken = with_noise([0.1, word(KEYWORD, 1.2), word(OTHER)], seed=5)
+    end = spotter.match(spoken)
+    keyword_end = int((0.1 + 0.6 * 1.2) * SAMPLE_RATE)
+    assert end is not None and abs(end - keyword_end) < 0.1 * SAMPLE_RATE
+    assert spotter.match(with_noise([0.1, word(OTHER)], seed=6)) is None
+    assert spotter.match(with_noise([0.1, word(OTHER), word(KEYWORD)], seed=7)) is None
+
+def test_wake_word_gates_dictation():
+    """Utterances are dictated after the wake word until the timeout"""
+    spotter = KeywordSpotter([with_noise([0.2, word(KEYWORD), 0.2], seed=seed) for seed in range(2)])
+    delivered = []
+    dictation = ContinuousDictation(delivered.append, EndpointDetector(end_ms=400), spotter, wake_timeout=3.0)
+    sentence = word(OTHER * 3)
+    audio = with_noise([1.0, sentence, 1.0, word(KEYWORD), 1.0, sentence, 1.0, sentence, 5.0, sentence, 1.0])
+    for start in range(0, len(audio), 1024):
+        dictation.push_block(audio[start:start + 1024])
+    dictation.flush()
+    assert len(delivered) == 2
+    assert dictation.rejected == 2
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.evaluation import align, score, evaluate, load_manifest, format_comparison, main
+
+def edit_distance(reference, hypothesis):
+    """Textbook Levenshtein distance"""
+    previous = list(range(len(hypothesis) + 1))
+    for i, r in enumerate(reference, 1):
+        current = [i]
+        for j, h in enumerate(hypothesis, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (r != h)))
+        previous = current
+    return previous[-1]
+
+def test_alignment_counts():
+    """Substitutions, insertions and deletions are told apart"""
+    reference = "a magyar nyelv szép".split()
+    assert align(reference, "a magyar nyelv szép".split()) == \
+        {"hits": 4, "substitutions": 0, "insertions": 0, "deletions": 0}
+    assert align(reference, "a magyar nyelv nagyon szép".split())["insertions"] == 1
+    assert align(reference, "a nyelv szép".split())["deletions"] == 1
+    assert align(reference, "a magyar nyel szép".split())["substitutions"] == 1
+    assert align(reference, []) == {"hits": 0, "substitutions": 0, "insertions": 0, "deletions": 4}
+
+def test_alignment_matches_textbook_distance():
+    """The vectorized kernel agrees with the plain dynamic program"""
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        reference = list(rng.integers(0, 4, rng.integers(0, 15)))
+        hypothesis = list(rng.integers(0, 4, rng.integers(0, 15)))
+        counts = align(reference, hypothesis)
+        assert counts["substitutions"] + counts["insertions"] + counts["deletions"] == \
+            edit_distance(reference, hypothesis)
+        assert counts["hits"] + counts["substitutions"] + counts["deletions"] == len(reference)
+        assert counts["hits"] + counts["substitutions"] + counts["insertions"] == len(hypothesis)
+
+def test_scoring_ignores_case_and_punctuation():
+    """Normalized scoring only counts the words, exact scoring counts everything"""
+    result = score("Szia, hogy vagy?", "szia hogy vagy")
+    assert result["words"]["hits"] == 3 and result["characters"]["hits"] == len("szia hogy vagy")
+    assert score("Szia, hogy vagy?", "szia hogy vagy", normalize=False)["words"]["substitutions"] == 2
+
+def test_evaluate_manifest(tmp_path):
+    """Files are transcribed, scored and summed up; broken files are reported"""
+    from scipy.io import wavfile
+
+    lines = []
+    for number, seconds in enumerate((1, 2)):
+        wavfile.write(str(tmp_path / f"{number}.wav"), 16000, np.zeros(16000 * seconds, dtype=np.int16))
+        lines.append(json.dumps({"audio": f"{number}.wav", "text": "egy kettő három"}))
+    lines.append(json.dumps({"audio": "missing.wav", "text": "négy"}))
+    (tmp_path / "manifest.jsonl").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    def transcribe(audio):
+        return "egy kettő három" if len(audio) == 16000 else "egy kettő három négy"
+
+    report = evaluate(load_manifest(str(tmp_path / "manifest.jsonl")), transcribe, jobs=2)
+    summary = report["summary"]
+    assert summary["files"] == 3 and summary["failed"] == 1
+    assert summary["words"] == {"count": 6, "hits": 6, "substitutions": 0, "insertions": 1, "deletions": 0}
+    assert abs(summary["wer"] - 1 / 6) < 1e-9
+    assert summary["audio_seconds"] == 3.0
+    assert [result.get("words", {}).get("insertions") for result in report["files"]] == [0, 1, None]
+    assert "16.67" in format_comparison([("run", report)])
+
+def test_compare_reports(tmp_path, capsys):
+    """Saved reports are printed side by side"""
+    report = {"summary": {"wer": 0.1, "cer": 0.05, "real_time_factor": 0.2, "median_latency_seconds": 1.5,
+                          "words": {"substitutions": 3, "insertions": 1, "deletions": 2}},
+              "config": {"model": "model-a", "executor": "process"}}
+    path = tmp_path / "a.json"
+    path.write_text(json.dumps(report), encoding="utf-8")
+    assert main(["--compare", str(path)]) == 0
+    output = capsys.readouterr().out
+    assert "model-a" in output and "10.00" in output and "3/1/2" in output
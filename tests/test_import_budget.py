@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+HEAVY = {"torch", "transformers", "librosa"}
+
+def loaded_modules(code):
+    """Run code in a fresh interpreter and return the top-level modules it loaded"""
+    env = dict(os.environ, PYTHONPATH=ROOT, QT_QPA_PLATFORM="offscreen")
+    result = subprocess.run(
+        [sys.executable, "-c", code + "\nimport sys\nprint(' '.join(sys.modules))"],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+    return {name.split(".")[0] for name in result.stdout.split()}
+
+def test_help_imports_nothing_heavy():
+    """--help only needs the standard library"""
+    modules = loaded_modules(
+        "import src.cli\n"
+        "try:\n"
+        "    src.cli.main(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass"
+    )
+    assert not modules & (HEAVY | {"numpy", "PyQt5", "scipy"})
+
+def test_modules_import_without_model_dependencies():
+    """Importing the application modules does not pull in torch or librosa"""
+    modules = loaded_modules(
+        "import src.cli, src.audio_archive, src.audio_recorder, src.speech_recognition, src.clipboard_manager"
+    )
+    assert not modules & (HEAVY | {"scipy", "sounddevice"})
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+import zlib
+import threading
+import numpy as np
+import pytest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.inference_server import (
+    InferenceServer, ProtocolError, AUDIO_HEADER, encode_audio, decode_audio, is_loopback, main
+)
+from src.inference_executor import RemoteExecutor, ThreadExecutor, ProcessExecutor, parse_nodes
+
+class StubRecognizer:
+    """Stands in for SpeechRecognizer: reports what it received"""
+
+    sampling_rate = 16000
+
+    def __init__(self, name="stub"):
+        self.name = name
+        self.calls = 0
+
+    def transcribe(self, audio):
+        self.calls += 1
+        return f"{self.name} {audio.shape} {audio.max():.3f}"
+
+def start_worker(name):
+    """Start an inference server on a free localhost port"""
+    server = InferenceServer(StubRecognizer(name), "127.0.0.1", 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def test_audio_survives_encoding():
+    """PCM encoding keeps the shape and is accurate to 16 bits"""
+    audio = np.random.default_rng(0).uniform(-1, 1, (1000, 2)).astype(np.float32)
+    decoded, sample_rate = decode_audio(encode_audio(audio, 16000))
+    assert sample_rate == 16000
+    assert decoded.shape == audio.shape
+    assert np.max(np.abs(decoded - audio)) < 1e-4
+
+def test_oversized_audio_is_rejected():
+    """Frames that expand beyond the announced or allowed size are not decompressed"""
+    # 64 MB of zeros compress to 64 kB but claim 100 samples
+    bomb = AUDIO_HEADER.pack(16000, 1, 100) + zlib.compress(bytes(64 << 20), 9)
+    with pytest.raises(ProtocolError):
+        decode_audio(bomb)
+    with pytest.raises(ProtocolError):
+        decode_audio(AUDIO_HEADER.pack(16000, 2, 1 << 30) + zlib.compress(b""))
+    with pytest.raises(ProtocolError):
+        decode_audio(encode_audio(np.zeros(1000, dtype=np.float32))[:-6])
+
+def test_requests_are_balanced_and_fail_over():
+    """Requests alternate between workers, skip a dead one and end up local"""
+    workers = [start_worker("a"), start_worker("b")]
+    local = StubRecognizer("local")
+    executor = RemoteExecutor(
+        [server.address for server in workers],
+        fallback=ThreadExecutor(local), health_interval=0
+    )
+    audio = np.full(1600, 0.5, dtype=np.float32)
+    try:
+        results = [executor.transcribe(audio) for _ in range(4)]
+        assert results[0] == "a (1600,) 0.500"
+        assert [server.recognizer.calls for server in workers] == [2, 2]
+
+        workers[0].shutdown()
+        workers[0].server_close()
+        assert executor.transcribe(audio).startswith("b ")
+        assert not executor.nodes[0].healthy
+
+        workers[1].shutdown()
+        workers[1].server_close()
+        assert executor.transcribe(audio).startswith("local ")
+        assert local.calls == 1
+    finally:
+        executor.close()
+        for server in workers:
+            server.server_close()
+
+def test_health_check_restores_worker():
+    """A worker marked down is used again once it answers a ping"""
+    server = start_worker("a")
+    executor = RemoteExecutor([server.address], health_interval=0)
+    try:
+        executor.nodes[0].healthy = False
+        executor.check_health()
+        assert executor.nodes[0].healthy
+        assert executor.transcribe(np.zeros(160, dtype=np.float32)).startswith("a ")
+    finally:
+        executor.close()
+        server.shutdown()
+        server.server_close()
+
+def test_process_executor():
+    """Worker processes build their own recognizer and transcribe"""
+    executor = ProcessExecutor(StubRecognizer, {"name": "worker"})
+    try:
+        assert executor.transcribe(np.ones(10, dtype=np.float32)) == "worker (10,) 1.000"
+    finally:
+        executor.close()
+
+def test_process_executor_close_cancels_queued_tasks():
+    """Tasks still waiting for a worker are cancelled when the executor closes"""
+    executor = ProcessExecutor(StubRecognizer, {"name": "worker"})
+    queued = [executor._submit(time.sleep, 0.5) for _ in range(3)]
+    executor.close()
+    assert sum(future.cancelled() for future in queued) >= 2
+
+def test_parse_nodes():
+    """Ports default to 8765"""
+    assert parse_nodes("gpu:9000, 10.0.0.5,") == [("gpu", 9000), ("10.0.0.5", 8765)]
+
+def test_worker_listens_locally_by_default():
+    """Other interfaces need --allow-remote"""
+    assert is_loopback("127.0.0.1") and is_loopback("localhost") and is_loopback("::1")
+    assert not is_loopback("0.0.0.0") and not is_loopback("192.168.1.10")
+    with pytest.raises(SystemExit) as error:
+        main(["--host", "0.0.0.0"])
+    assert error.value.code == 2
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.level_meter import LevelMeter
+
+def test_columns_span_block_boundaries():
+    """Samples left over from one block are carried into the next column"""
+    meter = LevelMeter(decimation=4, capacity=16)
+    meter.push(np.array([0.1, -0.5, 0.2, 0.3, 0.9, -0.2], dtype=np.float32))
+    meter.push(np.array([0.0, 0.4], dtype=np.float32))
+
+    mins, maxs, rms = meter.snapshot(8)
+    assert meter.columns_written() == 2
+    np.testing.assert_allclose(mins, [-0.5, -0.2])
+    np.testing.assert_allclose(maxs, [0.3, 0.9])
+    assert rms[1] > rms[0]
+
+def test_snapshot_returns_newest_columns_after_wrap():
+    """The ring keeps the newest columns in order once it wraps around"""
+    meter = LevelMeter(decimation=1, capacity=8)
+    meter.push(np.arange(20, dtype=np.float32).reshape(-1, 1))
+
+    mins, maxs, _ = meter.snapshot(4)
+    np.testing.assert_allclose(maxs, [16, 17, 18, 19])
+    np.testing.assert_allclose(mins, maxs)
+
+def test_stereo_blocks_are_mixed_down():
+    """Multi-channel input is averaged into one envelope"""
+    meter = LevelMeter(decimation=2, capacity=8)
+    meter.push(np.array([[1.0, -1.0], [0.5, 0.5]], dtype=np.float32))
+
+    mins, maxs, _ = meter.snapshot(1)
+    np.testing.assert_allclose(mins, [0.0])
+    np.testing.assert_allclose(maxs, [0.5])
+    rms, peak = meter.level
+    assert peak == 0.5
+
+def test_reset_clears_history():
+    """A reset starts a fresh recording"""
+    meter = LevelMeter(decimation=2, capacity=8)
+    meter.push(np.ones(7, dtype=np.float32))
+    meter.reset()
+    meter.push(np.ones(1, dtype=np.float32))
+
+    mins, _, _ = meter.snapshot(4)
+    assert len(mins) == 0
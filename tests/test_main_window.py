@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+from src.ui.main_window import MainWindow
+
+app = QApplication.instance() or QApplication([])
+
+def test_recording_waits_for_calibration():
+    """Recording and continuous dictation cannot start during noise calibration"""
+    window = MainWindow()
+    started, listening = [], []
+    window.start_recording_signal.connect(lambda: started.append(True))
+    window.continuous_dictation_signal.connect(listening.append)
+
+    window.set_calibrating(True)
+    assert not window.record_btn.isEnabled() and not window.calibrate_action.isEnabled()
+    window.toggle_recording()
+    window.continuous_action.setChecked(True)
+    assert started == [] and listening == []
+    assert not window.is_recording and not window.is_listening
+    assert not window.continuous_action.isChecked()
+
+    window.set_calibrating(False)
+    window.toggle_recording()
+    assert started == [True] and window.is_recording
+    window.stop_recording()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.noise_suppression import SpectralGate
+
+def test_open_gate_reconstructs_input():
+    """With a silent noise profile every bin passes and the audio is unchanged"""
+    audio = np.random.default_rng(0).standard_normal(8000).astype(np.float32) * 0.1
+    gate = SpectralGate()
+    gate.calibrate(np.zeros(2048, dtype=np.float32))
+
+    output = gate.process(audio)
+    assert output.shape == audio.shape
+    np.testing.assert_allclose(output, audio, atol=1e-5)
+
+def test_streaming_matches_whole_recording():
+    """Odd block sizes give the same result as processing in one go"""
+    rng = np.random.default_rng(1)
+    audio = (rng.standard_normal((10000, 2)) * 0.05).astype(np.float32)
+
+    whole = SpectralGate().process(audio)
+
+    gate = SpectralGate()
+    gate.reset_stream()
+    blocks = [gate.process_block(audio[i:i + 317]) for i in range(0, len(audio), 317)]
+    blocks.append(gate.flush())
+    streamed = np.concatenate(blocks)
+
+    assert streamed.shape == audio.shape
+    np.testing.assert_allclose(streamed, whole, atol=1e-6)
+
+def test_noise_is_attenuated_after_profile():
+    """Stationary noise is reduced once the profile has been learned"""
+    rng = np.random.default_rng(2)
+    noise = (rng.standard_normal(32000) * 0.05).astype(np.float32)
+
+    output = SpectralGate(profile_ms=300).process(noise)
+    assert np.std(output[16000:]) < 0.6 * np.std(noise[16000:])
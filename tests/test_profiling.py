@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import pstats
+import threading
+import pytest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.profiling import CycleProfiler, NULL_CYCLE, measure_disabled_overhead
+
+def busy(n=20000):
+    return sum(i * i for i in range(n))
+
+def test_disabled_profiler_is_a_no_op(tmp_path):
+    """Nothing is profiled or saved while profiling is off"""
+    profiler = CycleProfiler(str(tmp_path / "profiles"))
+    cycle = profiler.begin_cycle()
+    assert cycle is NULL_CYCLE and not cycle.active
+    with cycle.stage("transcribe", torch_trace=True):
+        busy()
+    assert cycle.finish() is None
+    assert not (tmp_path / "profiles").exists()
+    # A disabled hook costs well under a microsecond
+    assert 0 <= measure_disabled_overhead() < 1e-5
+
+def test_cycle_bundle(tmp_path):
+    """Stages run on different threads end up in one saved bundle"""
+    saved = []
+    profiler = CycleProfiler(str(tmp_path), enabled=True, on_saved=saved.append)
+    cycle = profiler.begin_cycle()
+    with cycle.stage("stop recording"):
+        busy()
+    cycle.describe(model="tiny", backend="eager", input_samples=16000)
+
+    def transcribe():
+        with cycle.stage("transcribe"):
+            busy()
+    thread = threading.Thread(target=transcribe, name="worker")
+    thread.start()
+    thread.join()
+
+    path = cycle.finish(text_length=5)
+    assert saved == [path]
+    assert cycle.finish() is None
+
+    report = json.loads(open(os.path.join(path, "report.json"), encoding="utf-8").read())
+    assert [stage["stage"] for stage in report["stages"]] == ["stop recording", "transcribe"]
+    assert report["stages"][1]["thread"] == "worker"
+    assert report["cycle"] == {"model": "tiny", "backend": "eager", "input_samples": 16000, "text_length": 5}
+    assert report["environment"]["cpu_count"] == os.cpu_count()
+    assert report["hook_overhead"]["disabled_seconds_per_hook"] >= 0
+
+    stats = pstats.Stats(os.path.join(path, "profile.pstats"))
+    assert any(function[2] == "busy" for function in stats.stats)
+    assert "busy" in open(os.path.join(path, "profile.txt"), encoding="utf-8").read()
+
+def test_torch_trace(tmp_path):
+    """Stages marked for the torch profiler get a Chrome trace"""
+    torch = pytest.importorskip("torch")
+    cycle = CycleProfiler(str(tmp_path), enabled=True).begin_cycle()
+    with cycle.stage("transcribe", torch_trace=True):
+        torch.ones(64, 64) @ torch.ones(64, 64)
+    path = cycle.finish()
+
+    report = json.loads(open(os.path.join(path, "report.json"), encoding="utf-8").read())
+    assert report["torch_traces"] == ["torch_trace_transcribe.json"]
+    assert report["environment"]["torch_threads"] == torch.get_num_threads()
+    trace = json.loads(open(os.path.join(path, "torch_trace_transcribe.json"), encoding="utf-8").read())
+    assert any("mm" in event.get("name", "") for event in trace["traceEvents"])
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.resource_monitor import MemoryPressureMonitor, read_meminfo, read_pressure
+
+MEMINFO = """MemTotal:       16000000 kB
+MemFree:          500000 kB
+MemAvailable:    {available} kB
+HugePages_Total:       0
+"""
+
+PSI = """some avg10={some:.2f} avg60=0.50 avg300=0.10 total=123456
+full avg10=0.00 avg60=0.00 avg300=0.00 total=1000
+"""
+
+def write_files(tmp_path, available=8000000, some=0.0):
+    """Write fake meminfo and PSI files and return a monitor reading them"""
+    meminfo = tmp_path / "meminfo"
+    meminfo.write_text(MEMINFO.format(available=available))
+    psi = tmp_path / "memory"
+    psi.write_text(PSI.format(some=some))
+    return MemoryPressureMonitor(meminfo_path=str(meminfo), psi_path=str(psi))
+
+def test_meminfo_and_psi_are_parsed(tmp_path):
+    """kB counters are converted to bytes and PSI lines split into fields"""
+    monitor = write_files(tmp_path, available=1000, some=2.5)
+    meminfo = read_meminfo(monitor.meminfo_path)
+    assert meminfo["MemAvailable"] == 1000 * 1024
+    assert meminfo["HugePages_Total"] == 0
+    pressure = read_pressure(monitor.psi_path)
+    assert pressure["some"]["avg10"] == 2.5
+    assert pressure["full"]["total"] == 1000
+
+def test_pressure_detection(tmp_path):
+    """Low available memory or memory stalls count as pressure"""
+    assert write_files(tmp_path).check() is None
+    assert "available" in write_files(tmp_path, available=800000).check()
+    assert "PSI" in write_files(tmp_path, some=25.0).check()
+
+def test_missing_files_mean_no_pressure(tmp_path):
+    """Systems without /proc never report pressure"""
+    monitor = MemoryPressureMonitor(
+        meminfo_path=str(tmp_path / "none"), psi_path=str(tmp_path / "none")
+    )
+    assert read_pressure(monitor.psi_path) is None
+    assert monitor.check() is None
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import time
+import threading
+from types import SimpleNamespace
+import numpy as np
+import pytest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+
+from src import speech_recognition
+from src.speech_recognition import SpeechRecognizer
+
+SAMPLE_RATE = 16000
+VOCAB = ["<pad>", "|", "<unk>", "a", "b", "c", "d", "e"]
+FRAMES = 20
+
+class StubModel:
+    """Returns fixed CTC ids per channel instead of running a network"""
+
+    def __init__(self, channel_ids):
+        self.config = SimpleNamespace(conv_stride=[320], feat_extract_norm="layer")
+        logits = torch.full((len(channel_ids), FRAMES, len(VOCAB)), -10.0)
+        for channel, ids in enumerate(channel_ids):
+            for frame, token in enumerate(ids):
+                logits[channel, frame, token] = 10.0
+        self.logits = logits
+        self.batches = []
+
+    def __call__(self, input_values, attention_mask=None):
+        self.batches.append(input_values.shape[0])
+        return SimpleNamespace(logits=self.logits[:input_values.shape[0]])
+
+def frames(words):
+    """CTC ids with each word (a letter) at the given frame, silence elsewhere"""
+    ids = [0] * FRAMES
+    for frame, letter in words:
+        ids[frame] = VOCAB.index(letter)
+        ids[frame + 1] = VOCAB.index("|")
+    return ids
+
+def stub_recognizer(tmp_path, channel_ids, channel_labels=None):
+    """A SpeechRecognizer with a real CTC tokenizer and a stub model"""
+    vocab_file = tmp_path / "vocab.json"
+    vocab_file.write_text(json.dumps({token: index for index, token in enumerate(VOCAB)}), encoding="utf-8")
+    tokenizer = transformers.Wav2Vec2CTCTokenizer(
+        str(vocab_file), pad_token="<pad>", unk_token="<unk>", word_delimiter_token="|"
+    )
+    feature_extractor = transformers.Wav2Vec2FeatureExtractor(sampling_rate=SAMPLE_RATE, return_attention_mask=True)
+
+    recognizer = SpeechRecognizer.__new__(SpeechRecognizer)
+    recognizer.sampling_rate = SAMPLE_RATE
+    recognizer.model_name = "stub"
+    recognizer.channel_labels = channel_labels or []
+    recognizer.device = "cpu"
+    recognizer.processor = transformers.Wav2Vec2Processor(feature_extractor=feature_extractor, tokenizer=tokenizer)
+    recognizer.model = StubModel(channel_ids)
+    recognizer.engine = None
+    recognizer._lock = threading.RLock()
+    recognizer.last_used = 0.0
+    return recognizer
+
+def stereo(channels=2):
+    return np.random.default_rng(0).uniform(-0.5, 0.5, (FRAMES * 320, channels)).astype(np.float32)
+
+def test_channels_are_merged_into_turns(tmp_path):
+    """Words of all channels are ordered by time and grouped into labeled turns"""
+    recognizer = stub_recognizer(tmp_path, [
+        frames([(0, "a"), (2, "e"), (10, "b")]),
+        frames([(5, "c"), (15, "d")]),
+    ], channel_labels=["Anna", "Béla"])
+    assert recognizer.transcribe(stereo()) == (
+        "Anna (ch 1): a e\n"
+        "Béla (ch 2): c\n"
+        "Anna (ch 1): b\n"
+        "Béla (ch 2): d"
+    )
+    # All channels went through the model in one batch
+    assert recognizer.model.batches == [2]
+
+def test_default_labels_and_silent_channels(tmp_path):
+    """Channels without a name get a numbered label; silent channels add no turn"""
+    recognizer = stub_recognizer(tmp_path, [
+        frames([(3, "a")]),
+        frames([]),
+        frames([(1, "b"), (8, "c")]),
+    ], channel_labels=["Anna"])
+    assert recognizer.transcribe(stereo(3)) == "Speaker 3 (ch 3): b\nAnna (ch 1): a\nSpeaker 3 (ch 3): c"
+
+def test_single_channel_column_is_mono(tmp_path):
+    """A (samples, 1) array is transcribed as mono, without speaker labels"""
+    recognizer = stub_recognizer(tmp_path, [frames([(0, "a"), (4, "b")])])
+    assert recognizer.transcribe(stereo(1)) == "a b"
+
+class CountingRecognizer(SpeechRecognizer):
+    """SpeechRecognizer whose load_model() only counts, optionally waiting for a signal"""
+
+    def __init__(self, idle_timeout=None, memory_monitor=None, gate=None, clock=time.monotonic):
+        self.model_name = "stub"
+        self.model = object()
+        self.engine = None
+        self.compile_backend = None
+        self.idle_timeout = idle_timeout
+        self.memory_monitor = memory_monitor
+        self._lock = threading.RLock()
+        self._prefetch_thread = None
+        self.clock = clock
+        self.last_used = self.loaded_at = clock()
+        self.loads = 0
+        self.gate = gate
+
+    def load_model(self, model_name):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.loads += 1
+        self.model = object()
+        self.last_used = self.loaded_at = self.clock()
+
+class StubMonitor:
+    def __init__(self):
+        self.reason = None
+
+    def check(self):
+        return self.reason
+
+def test_unload_after_idle_timeout():
+    """The model is kept while recently used and unloaded once idle"""
+    recognizer = CountingRecognizer(idle_timeout=60)
+    assert recognizer.release_if_idle() is None and recognizer.is_loaded()
+    recognizer.last_used -= 61
+    assert recognizer.release_if_idle() == "idle for 1 min"
+    assert not recognizer.is_loaded()
+    assert recognizer.release_if_idle() is None
+
+def test_unload_under_memory_pressure():
+    """The memory monitor's verdict unloads a model that is not idle"""
+    monitor = StubMonitor()
+    recognizer = CountingRecognizer(memory_monitor=monitor)
+    recognizer.last_used -= SpeechRecognizer.PRESSURE_MIN_IDLE + 1
+    recognizer.loaded_at -= SpeechRecognizer.PRESSURE_RELOAD_COOLDOWN + 1
+    assert recognizer.release_if_idle() is None
+    monitor.reason = "low memory"
+    assert recognizer.release_if_idle() == "low memory"
+    assert not recognizer.is_loaded()
+
+def test_constant_pressure_does_not_thrash(monkeypatch):
+    """Pressure that never ends unloads an unused model once, not after every reload"""
+    now = [1000.0]
+    clock = lambda: now[0]
+    monkeypatch.setattr(speech_recognition, "time", SimpleNamespace(monotonic=clock, perf_counter=time.perf_counter))
+    monitor = StubMonitor()
+    monitor.reason = "low memory"
+    recognizer = CountingRecognizer(memory_monitor=monitor, clock=clock)
+    unloads = []
+
+    def checks(seconds, dictate_every=None):
+        """Run the 30 s idle check, dictating at the given interval"""
+        for tick in range(1, seconds // 30 + 1):
+            now[0] += 30
+            if dictate_every and tick * 30 % dictate_every == 0:
+                recognizer.prefetch()
+                if recognizer._prefetch_thread is not None:
+                    recognizer._prefetch_thread.join(5)
+                recognizer.last_used = clock()
+            if recognizer.release_if_idle():
+                unloads.append(now[0])
+
+    # Dictating every minute keeps the model loaded
+    checks(1800, dictate_every=60)
+    assert unloads == [] and recognizer.is_loaded()
+    # Once unused, it is unloaded after the minimum idle time
+    checks(300)
+    assert len(unloads) == 1 and not recognizer.is_loaded()
+
+    # The next recording reloads it; the reload is not undone at once
+    checks(30, dictate_every=30)
+    assert recognizer.loads == 1
+    checks(SpeechRecognizer.PRESSURE_RELOAD_COOLDOWN - 60)
+    assert len(unloads) == 1 and recognizer.is_loaded()
+    checks(120)
+    assert len(unloads) == 2 and recognizer.loads == 1
+
+def test_no_unload_while_busy():
+    """A transcription holding the lock keeps the model loaded, without waiting"""
+    monitor = StubMonitor()
+    monitor.reason = "low memory"
+    recognizer = CountingRecognizer(idle_timeout=1, memory_monitor=monitor)
+    recognizer.last_used -= 10
+    holding, release = threading.Event(), threading.Event()
+
+    def transcribe():
+        with recognizer._lock:
+            holding.set()
+            release.wait(5)
+    thread = threading.Thread(target=transcribe)
+    thread.start()
+    holding.wait(5)
+    started = time.monotonic()
+    assert recognizer.release_if_idle() is None
+    assert time.monotonic() - started < 0.5
+    assert recognizer.is_loaded()
+    release.set()
+    thread.join()
+    assert recognizer.release_if_idle() is not None
+
+def test_prefetch_reloads_once():
+    """Repeated prefetches and a transcription share one reload"""
+    gate = threading.Event()
+    recognizer = CountingRecognizer(gate=gate)
+    recognizer.unload_model()
+    for _ in range(5):
+        recognizer.prefetch()
+    assert recognizer.loads == 0
+    gate.set()
+    recognizer.ensure_loaded()
+    recognizer._prefetch_thread.join(5)
+    assert recognizer.loads == 1 and recognizer.is_loaded()
+    # A loaded model is not reloaded
+    recognizer.prefetch()
+    assert recognizer.loads == 1
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.text_normalization import HungarianNumberNormalizer, TextNormalizer, number_value, _morphemes
+
+def value(text):
+    """Value of a spelled-out number, joining the morphemes of all words"""
+    morphemes = ()
+    for word in text.split():
+        morphemes += _morphemes(word)[0]
+    return number_value(morphemes)
+
+def test_number_words():
+    """Compound number words evaluate to their value"""
+    assert value("huszonöt") == 25
+    assert value("kétezer-huszonnégy".replace("-", "")) == 2024
+    assert value("ezerkilencszáznyolcvannégy") == 1984
+    assert value("egymillió kétszázezer háromszázegy") == 1200301
+    assert value("öt öt") is None
+    assert value("ezer millió") is None
+
+def test_cardinals_and_suffixes():
+    """Numbers from ten up are written with digits, suffixes after a hyphen"""
+    normalizer = HungarianNumberNormalizer()
+    assert normalizer.normalize("tizenkét ember") == "12 ember"
+    assert normalizer.normalize("százezer forintot") == "100 000 Ft-ot"
+    assert normalizer.normalize("ezerszer tízzel hússzal") == "1000-szer 10-zel 20-szal"
+    assert normalizer.normalize("egy alma és hat körte") == "egy alma és hat körte"
+
+def test_dates_ordinals_and_decimals():
+    """Dates, ordinals, decimals and units"""
+    normalizer = HungarianNumberNormalizer()
+    assert normalizer.normalize("kétezer huszonnégy március tizenötödikén") == "2024. március 15-én"
+    assert normalizer.normalize("május elsején") == "május 1-jén"
+    assert normalizer.normalize("a tizenegyedik és a harmadik") == "a 11. és a harmadik"
+    assert normalizer.normalize("három egész öt tized százalékkal") == "3,5%-kal"
+    assert normalizer.normalize("nulla egész huszonöt század") == "0,25"
+    assert normalizer.normalize("öt kilométer, hatvan kilométer per óra") == "5 km, 60 km/h"
+
+def test_transcript_is_cased_per_turn():
+    """Without a punctuation model each line is normalized and capitalized"""
+    normalizer = TextNormalizer()
+    text = "Anna (ch 1): huszonöt forint\nSpeaker 2 (ch 2): rendben"
+    assert normalizer.process(text) == "Anna (ch 1): 25 Ft\nSpeaker 2 (ch 2): Rendben"
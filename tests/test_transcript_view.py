@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QTextCursor
+
+from src.ui.transcript_view import TranscriptView
+
+app = QApplication.instance() or QApplication([])
+
+def insert_at(view, position, text):
+    """Type text into the document like the user would"""
+    cursor = QTextCursor(view.document())
+    if position is None:
+        cursor.movePosition(QTextCursor.End)
+    else:
+        cursor.setPosition(position)
+    cursor.insertText(text)
+
+def test_segments_are_appended():
+    """Finished transcriptions are added after the earlier ones"""
+    view = TranscriptView()
+    view.append_text("Első mondat.")
+    view.append_text("Második mondat.")
+    view.append_text("folytatás", separator=" ")
+    view.flush()
+    assert view.toPlainText() == "Első mondat.\nMásodik mondat. folytatás"
+
+def test_live_segment_is_patched():
+    """A live segment is rewritten in place until it is committed"""
+    view = TranscriptView()
+    view.append_text("Kész.")
+    view.set_live_text("Ez még")
+    view.flush()
+    view.set_live_text("Ez még változik,\nkét sorban")
+    view.flush()
+    assert view.toPlainText() == "Kész.\nEz még változik,\nkét sorban"
+    view.set_live_text("Ez már végleges.")
+    view.commit()
+    view.set_live_text("Új")
+    view.flush()
+    assert view.toPlainText() == "Kész.\nEz már végleges.\nÚj"
+
+def test_user_edits_are_kept():
+    """Edits above the live segment survive; an edited live segment is committed"""
+    view = TranscriptView()
+    view.append_text("Első mondat.")
+    view.set_live_text("Második")
+    view.flush()
+    insert_at(view, 0, "Javított ")
+    view.set_live_text("Második mondat.")
+    view.flush()
+    assert view.toPlainText() == "Javított Első mondat.\nMásodik mondat."
+
+    insert_at(view, None, "!")
+    view.set_live_text("Harmadik")
+    view.flush()
+    assert view.toPlainText() == "Javított Első mondat.\nMásodik mondat.!\nHarmadik"
+
+def test_updates_are_batched_per_frame():
+    """Updates wait for the frame timer and superseded live text is dropped"""
+    view = TranscriptView()
+    for length in range(1, 20):
+        view.set_live_text("szó " * length)
+    view.append_text("A végleges szöveg.")
+    assert view.toPlainText() == ""
+
+    deadline = time.monotonic() + 2
+    while view.toPlainText() == "" and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+    assert view.toPlainText() == "A végleges szöveg."
+    # The final text replaced the partials before they were drawn
+    assert view.updates_applied == 2
+
+def test_clear():
+    """Clearing drops the text and any queued update"""
+    view = TranscriptView()
+    view.append_text("Első")
+    view.flush()
+    view.set_live_text("Második")
+    view.clear_transcript()
+    view.flush()
+    assert view.toPlainText() == ""
+
+def test_last_segment_follows_edits():
+    """The newest segment is found after edits above it and includes edits in it"""
+    view = TranscriptView()
+    assert view.last_segment() == ""
+    view.append_text("Első mondat.")
+    view.append_text("Második mondat.")
+    assert view.last_segment() == "Második mondat."
+    insert_at(view, 0, "Egy új sor.\n")
+    insert_at(view, None, " Javítva.")
+    assert view.last_segment() == "Második mondat. Javítva."
+    view.set_live_text("Harmadik")
+    assert view.last_segment() == "Harmadik"
+    view.clear_transcript()
+    assert view.last_segment() == ""
+
+def test_selection_is_plain_text():
+    """Selected text spanning paragraphs uses newlines"""
+    view = TranscriptView()
+    view.append_text("Első.")
+    view.append_text("Második.")
+    view.flush()
+    assert view.selected_text() == ""
+    view.selectAll()
+    assert view.selected_text() == "Első.\nMásodik."
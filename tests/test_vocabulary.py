@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.vocabulary import PhraseMatcher, Vocabulary
+
+def test_leftmost_longest_matches():
+    """Overlapping phrases resolve to the leftmost, then the longest match"""
+    matcher = PhraseMatcher()
+    for phrase in ["a b c d", "b c", "c", "b c d e"]:
+        matcher.add(phrase.split(), phrase)
+    assert matcher.find("a b c d e".split()) == [(0, 4, "a b c d")]
+    assert matcher.find("x b c d e c".split()) == [(1, 5, "b c d e"), (5, 6, "c")]
+    assert matcher.find("a b c x".split()) == [(1, 3, "b c")]
+
+def test_removed_phrases_stop_matching():
+    """Removing a phrase keeps shorter phrases on its path working"""
+    matcher = PhraseMatcher()
+    matcher.add(["új", "sor"], "\n")
+    matcher.add(["új"], "NEW")
+    matcher.remove(["új", "sor"])
+    assert matcher.find(["új", "sor"]) == [(0, 1, "NEW")]
+    assert len(matcher) == 1
+
+def test_commands_and_entries(tmp_path):
+    """Commands become punctuation and line breaks, entries are replaced"""
+    path = tmp_path / "vocabulary.txt"
+    path.write_text("# products\nszpíd tu klipbord = Speech2Clipboard\nöö =\n", encoding="utf-8")
+    vocabulary = Vocabulary(str(path))
+    text = "nyisd meg a öö szpíd tu klipbord vessző kérlek pont új sor köszi"
+    assert vocabulary.process(text) == "nyisd meg a Speech2Clipboard, kérlek.\nköszi"
+
+def test_file_changes_are_applied(tmp_path):
+    """Edits of the dictionary file are picked up without a restart"""
+    path = tmp_path / "vocabulary.txt"
+    path.write_text("jé es bé = JSB\n", encoding="utf-8")
+    vocabulary = Vocabulary(str(path), commands=False)
+    assert vocabulary.process("a jé es bé") == "a JSB"
+
+    path.write_text("jé es = JS\n", encoding="utf-8")
+    os.utime(path, ns=(0, 10 ** 18))
+    assert vocabulary.reload_if_changed(force=True)
+    assert vocabulary.process("a jé es bé") == "a JS bé"
+    assert len(vocabulary.matcher) == 1